@@ -3,13 +3,25 @@ AutoRESTify
 
 Dynamic API generator from JSON models with automatic schema inference.
 
-Public package interface.
+Public package interface. Submodules are imported on first attribute
+access so `import autorestify` (and the CLI) stay fast.
 """
 
-from .api.app_factory import create_app
+from typing import TYPE_CHECKING
+
+from ._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .api.app_factory import create_app
+
+_EXPORTS = {
+    "create_app": ".api.app_factory",
+}
 
 __all__ = [
     "create_app",
 ]
 
 __version__ = "1.0.2"
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
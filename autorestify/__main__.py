@@ -0,0 +1,9 @@
+"""
+Allow `python -m autorestify serve ...`.
+"""
+
+import sys
+
+from autorestify.cli import main
+
+sys.exit(main())
@@ -0,0 +1,38 @@
+"""
+Lazy package exports for AutoRESTify.
+
+Packages list their public names and the submodules defining them; the
+submodule is imported on first attribute access, so importing a package
+does not pull in FastAPI or SQLAlchemy.
+"""
+
+import sys
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str,
+    exports: Dict[str, str],
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build a package's module-level `__getattr__` and `__dir__`.
+
+    Args:
+        package: The package's `__name__`
+        exports: Public name → relative module defining it
+    """
+
+    module = sys.modules[package]
+
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(exports[name], package), name)
+        setattr(module, name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(module)) | set(exports))
+
+    return __getattr__, __dir__
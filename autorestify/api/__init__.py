@@ -6,10 +6,22 @@ Contains:
 - Router factory
 """
 
-from .app_factory import create_app
-from .router_factory import create_router
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .app_factory import create_app
+    from .router_factory import create_router
+
+_EXPORTS = {
+    "create_app": ".app_factory",
+    "create_router": ".router_factory",
+}
 
 __all__ = [
     "create_app",
     "create_router",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
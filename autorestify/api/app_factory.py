@@ -5,15 +5,65 @@ This module is responsible for creating and configuring
 the FastAPI application instance.
 """
 
+from typing import Dict
+
 from fastapi import FastAPI
 
+from autorestify.api.middleware import (
+    MetricsMiddleware,
+    ProfilerMiddleware,
+    SlowRequestMiddleware,
+)
+from autorestify.api.openapi import install_collection_openapi
 from autorestify.api.router_factory import create_router
+from autorestify.core.admission import AdmissionController
+from autorestify.core.metrics import MetricsRegistry
+from autorestify.core.profiling import ProfileStore
+from autorestify.core.security import SecurityManager
+from autorestify.storage.base import Database
+from autorestify.storage.diagnostics import SlowQueryLog
+from autorestify.storage.idempotency import IdempotencyStore
+from autorestify.storage.jobs import JobManager
+from autorestify.storage.repository import Repository
 
 
-def create_app() -> FastAPI:
+def create_app(
+    security: SecurityManager | None = None,
+    database: Database | None = None,
+    metrics: MetricsRegistry | None = None,
+    slow_request_threshold: float | None = None,
+    slow_query_threshold: float | None = None,
+    enable_profiling: bool = False,
+    admission: AdmissionController | None = None,
+    rich_types: bool = False,
+    request_timeout: float | None = None,
+    route_timeouts: Dict[str, float] | None = None,
+    idempotency_ttl: float = 86400.0,
+    expiry_interval: float | None = 60.0,
+    vacuum_interval: float | None = None,
+    upload_workers: int = 2,
+) -> FastAPI:
     """
     Create and configure the FastAPI application.
 
+    Args:
+        security: Security manager shared by all routes
+        database: Database used for dynamic collections
+        metrics: Registry exposed on /_metrics
+        slow_request_threshold: Log requests slower than this (seconds)
+        slow_query_threshold: Log statements slower than this (seconds)
+        enable_profiling: Honor the X-AutoRESTify-Profile header for admins
+        admission: Rate limits and concurrency caps for the router
+        rich_types: Infer datetime, date, uuid and bigint columns on upload
+        request_timeout: Default deadline (seconds) for read routes
+        route_timeouts: Deadlines per route template, e.g. {"/{collection}": 5}
+        idempotency_ttl: Seconds responses to Idempotency-Key requests are replayed
+        expiry_interval: Seconds between deletions of rows past a collection
+            ttl (None disables the background task)
+        vacuum_interval: Seconds between SQLite vacuums after expiry
+        upload_workers: Background upload jobs (`/upload?async=true`) run
+            at the same time
+
     Returns:
         FastAPI: Configured application instance.
     """
@@ -24,8 +74,41 @@ def create_app() -> FastAPI:
         version="1.0.2",
     )
 
+    security = security or SecurityManager()
+    database = database or Database()
+    repository = Repository(database)
+    metrics = metrics or MetricsRegistry()
+    profiles = ProfileStore() if enable_profiling else None
+
+    # Diagnostics
+    if slow_request_threshold is not None or slow_query_threshold is not None:
+        SlowQueryLog(database.engine, threshold=slow_query_threshold)
+
+    if slow_request_threshold is not None:
+        app.add_middleware(SlowRequestMiddleware, threshold=slow_request_threshold)
+
+    if profiles is not None:
+        app.add_middleware(ProfilerMiddleware, security=security, store=profiles)
+
+    app.add_middleware(MetricsMiddleware, registry=metrics)
+
     # Include dynamic router
-    router = create_router()
+    router = create_router(
+        security=security,
+        repository=repository,
+        metrics=metrics,
+        profiles=profiles,
+        admission=admission,
+        rich_types=rich_types,
+        request_timeout=request_timeout,
+        route_timeouts=route_timeouts,
+        idempotency=IdempotencyStore(database, ttl=idempotency_ttl),
+        expiry_interval=expiry_interval,
+        vacuum_interval=vacuum_interval,
+        jobs=JobManager(database, workers=upload_workers),
+    )
     app.include_router(router)
+    install_collection_openapi(app, repository)
+    app.state.repository = repository
 
     return app
@@ -0,0 +1,217 @@
+"""
+ASGI middleware for AutoRESTify.
+
+Contains:
+- MetricsMiddleware: per-route latency histograms and status counts
+- SlowRequestMiddleware: logs requests slower than a threshold
+- ProfilerMiddleware: admin-only per-request cProfile switch
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from starlette.requests import Request
+
+from autorestify.core.metrics import MetricsRegistry
+from autorestify.core.profiling import ProfileStore, RequestTrace, current_trace
+from autorestify.core.security import SecurityManager
+
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+logger = logging.getLogger("autorestify.slow")
+
+PROFILE_HEADER = "x-autorestify-profile"
+PROFILE_ID_HEADER = "x-autorestify-profile-id"
+
+
+def route_label(scope: Scope) -> str:
+    """
+    Return the matched route template, avoiding per-path label cardinality.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path else "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Record request latency and response status per route.
+    """
+
+    def __init__(self, app: Any, registry: MetricsRegistry) -> None:
+        self.app = app
+        self.request_seconds = registry.histogram(
+            "autorestify_http_request_duration_seconds",
+            "HTTP request latency by route.",
+            ("method", "route"),
+        )
+        self.requests_total = registry.counter(
+            "autorestify_http_requests_total",
+            "HTTP requests by route and status code.",
+            ("method", "route", "status"),
+        )
+        self.in_flight = registry.gauge(
+            "autorestify_http_requests_in_flight",
+            "HTTP requests currently being served.",
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.in_flight.dec()
+            method = scope.get("method", "")
+            route = route_label(scope)
+            self.request_seconds.observe(time.perf_counter() - started, method, route)
+            self.requests_total.inc(method, route, str(status))
+
+
+class SlowRequestMiddleware:
+    """
+    Log requests slower than `threshold` seconds with their DB time split.
+    """
+
+    def __init__(self, app: Any, threshold: float) -> None:
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        trace = RequestTrace()
+        token = current_trace.set(trace)
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_trace.reset(token)
+            elapsed = time.perf_counter() - started
+
+            if elapsed >= self.threshold:
+                logger.warning(
+                    "Slow request (%.1f ms): %s %s -> %s | route=%s "
+                    "db=%.1f ms in %d queries | other=%.1f ms | slow_queries=%d",
+                    elapsed * 1000,
+                    scope.get("method", ""),
+                    scope.get("path", ""),
+                    status,
+                    route_label(scope),
+                    trace.db_seconds * 1000,
+                    trace.queries,
+                    (elapsed - trace.db_seconds) * 1000,
+                    len(trace.slow_queries),
+                )
+
+
+class ProfilerMiddleware:
+    """
+    Run requests carrying the profile header under cProfile.
+
+    Only principals passing `SecurityManager.authorize_admin` are profiled;
+    other requests run normally. The report is kept in a ProfileStore and
+    its id returned in the `X-AutoRESTify-Profile-Id` response header.
+    cProfile observes the whole event-loop thread, so concurrent requests
+    may appear in the report.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        security: SecurityManager,
+        store: ProfileStore,
+        limit: int = 60,
+    ) -> None:
+        self.app = app
+        self.security = security
+        self.store = store
+        self.limit = limit
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not await self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = self.store.reserve()
+        status = 500
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_ID_HEADER.encode(), profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is active on this thread
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - started
+
+            buffer = io.StringIO()
+            stats = pstats.Stats(profiler, stream=buffer)
+            stats.sort_stats("cumulative").print_stats(self.limit)
+
+            self.store.put(
+                profile_id,
+                buffer.getvalue(),
+                method=scope.get("method", ""),
+                path=scope.get("path", ""),
+                status=status,
+                duration_ms=round(elapsed * 1000, 3),
+            )
+
+    async def _wants_profile(self, scope: Scope) -> bool:
+        request = Request(scope)
+
+        if request.headers.get(PROFILE_HEADER, "").lower() not in ("1", "true"):
+            return False
+
+        try:
+            user = await self.security.authenticate(request)
+            self.security.authorize_admin(user)
+        except PermissionError:
+            return False
+
+        return True
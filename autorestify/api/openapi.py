@@ -0,0 +1,138 @@
+"""
+OpenAPI integration for AutoRESTify.
+
+Publishes the generated per-collection schemas and typed paths
+alongside the generic `/{collection}` routes.
+"""
+
+from typing import Any, Dict
+
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+
+from autorestify.storage.repository import Repository
+
+
+REF_TEMPLATE = "#/components/schemas/{model}"
+
+
+def _component(schemas: Dict[str, Any], adapter, mode: str) -> Dict[str, str]:
+    """
+    Register an adapter's JSON schema as a component and return its $ref.
+    """
+
+    schema = adapter.json_schema(ref_template=REF_TEMPLATE, mode=mode)
+    schemas.update(schema.pop("$defs", {}))
+
+    name = schema["title"]
+    schemas[name] = schema
+    return {"$ref": REF_TEMPLATE.format(model=name)}
+
+
+def _json(schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {"content": {"application/json": {"schema": schema}}}
+
+
+def add_collection_schemas(openapi: Dict[str, Any], repository: Repository) -> None:
+    """
+    Add component schemas and concrete paths for every registered collection.
+    """
+
+    schemas = openapi.setdefault("components", {}).setdefault("schemas", {})
+    paths = openapi.setdefault("paths", {})
+
+    item_id = {
+        "name": "item_id",
+        "in": "path",
+        "required": True,
+        "schema": {"type": "integer"},
+    }
+    created = _json({"type": "object", "properties": {"id": {"type": "integer"}}})
+
+    for name in repository.collections():
+        types = repository.get_types(name)
+        input_ref = _component(schemas, types.input, "validation")
+        record_ref = _component(schemas, types.record, "serialization")
+        tags = [name]
+
+        paths[f"/{name}"] = {
+            "get": {
+                "tags": tags,
+                "operationId": f"list_{name}",
+                "summary": f"List {name}",
+                "parameters": [
+                    {
+                        "name": "limit",
+                        "in": "query",
+                        "schema": {"type": "integer", "default": 100},
+                    }
+                ],
+                "responses": {
+                    "200": {
+                        "description": "Records",
+                        **_json({"type": "array", "items": record_ref}),
+                    }
+                },
+            },
+            "post": {
+                "tags": tags,
+                "operationId": f"create_{name}",
+                "summary": f"Create {name} item",
+                "requestBody": {"required": True, **_json(input_ref)},
+                "responses": {"200": {"description": "Created", **created}},
+            },
+        }
+
+        paths[f"/{name}/{{item_id}}"] = {
+            "get": {
+                "tags": tags,
+                "operationId": f"get_{name}",
+                "summary": f"Get {name} item",
+                "parameters": [item_id],
+                "responses": {"200": {"description": "Record", **_json(record_ref)}},
+            },
+            "put": {
+                "tags": tags,
+                "operationId": f"update_{name}",
+                "summary": f"Update {name} item",
+                "parameters": [item_id],
+                "requestBody": {"required": True, **_json(input_ref)},
+                "responses": {"200": {"description": "Updated"}},
+            },
+            "delete": {
+                "tags": tags,
+                "operationId": f"delete_{name}",
+                "summary": f"Delete {name} item",
+                "parameters": [item_id],
+                "responses": {"200": {"description": "Deleted"}},
+            },
+        }
+
+
+def install_collection_openapi(app: FastAPI, repository: Repository) -> None:
+    """
+    Regenerate the OpenAPI document whenever collections change.
+    """
+
+    cached_version = None
+
+    def openapi() -> Dict[str, Any]:
+        nonlocal cached_version
+
+        version = repository.model_factory.version
+        if app.openapi_schema is not None and cached_version == version:
+            return app.openapi_schema
+
+        schema = get_openapi(
+            title=app.title,
+            version=app.version,
+            description=app.description,
+            routes=app.routes,
+        )
+        add_collection_schemas(schema, repository)
+
+        app.openapi_schema = schema
+        cached_version = version
+        return schema
+
+    app.openapi = openapi
@@ -4,27 +4,284 @@ Router Factory for AutoRESTify.
 Uses generic collection-based routes implemented via FastAPI.
 """
 
-from typing import Any, Dict
-
-from fastapi import APIRouter, HTTPException, Body, Request
-
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+
+from fastapi import APIRouter, HTTPException, Body, Header, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from pydantic import ValidationError
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+
+from autorestify.api.middleware import route_label
+from autorestify.core.admission import AdmissionController, AdmissionRejected, Ticket
+from autorestify.core.deadlines import (
+    Deadline,
+    DeadlineExceeded,
+    call_with_deadline,
+    check_deadline,
+)
+from autorestify.core.metrics import MetricsRegistry
+from autorestify.core.profiling import ProfileStore
 from autorestify.core.schema_inference import SchemaInferer
 from autorestify.core.security import SecurityManager
 from autorestify.storage.base import Database
+from autorestify.storage.cancellation import install_deadlines
+from autorestify.storage.expiry import ExpiryScheduler
+from autorestify.storage.idempotency import IdempotencyConflict, IdempotencyStore
+from autorestify.storage.instrumentation import instrument_engine
+from autorestify.storage.jobs import Job, JobManager, JobQueueFull
 from autorestify.storage.repository import Repository
+from autorestify.storage.transfer import (
+    CONTENT_TYPES,
+    META_COLUMNS,
+    PARSERS,
+    coerce_csv_record,
+    encode_csv,
+    encode_ndjson,
+    gzip_stream,
+)
+
+MAX_REPORTED_ERRORS = 100
+CHANGES_HEARTBEAT_SECONDS = 15.0
+TIMEOUT_HEADER = "x-request-timeout"
+IDEMPOTENCY_HEADER = "idempotency-key"
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+MAX_BATCH_OPERATIONS = 50
+DEFAULT_LIST_LIMIT = 100
+UPLOAD_JOB_BATCH = 1000
+JOB_RETRY_AFTER_SECONDS = 5
 
 
 def create_router(
     security: SecurityManager | None = None,
     database: Database | None = None,
+    metrics: MetricsRegistry | None = None,
+    profiles: ProfileStore | None = None,
+    admission: AdmissionController | None = None,
+    repository: Repository | None = None,
+    rich_types: bool = False,
+    request_timeout: float | None = None,
+    route_timeouts: Dict[str, float] | None = None,
+    idempotency: IdempotencyStore | None = None,
+    expiry_interval: float | None = 60.0,
+    vacuum_interval: float | None = None,
+    jobs: JobManager | None = None,
 ) -> APIRouter:
 
-    router = APIRouter()
+    if repository is not None:
+        database = repository.database
 
     database = database or Database()
-    repository = Repository(database)
-    inferer = SchemaInferer()
+    repository = repository or Repository(database)
+    jobs = jobs or JobManager(database)
+
+    expiry = None
+    if expiry_interval is not None:
+        expiry = ExpiryScheduler(
+            repository, interval=expiry_interval, vacuum_interval=vacuum_interval
+        )
+
+    @asynccontextmanager
+    async def lifespan(app: Any) -> AsyncIterator[None]:
+        if expiry is not None:
+            expiry.start()
+        try:
+            yield
+        finally:
+            await jobs.stop()
+            if expiry is not None:
+                await expiry.stop()
+
+    router = APIRouter(lifespan=lifespan)
+
+    inferer = SchemaInferer(rich_types=rich_types)
     security_manager = security or SecurityManager()
+    metrics = metrics or MetricsRegistry()
+    admission = admission or AdmissionController()
+    idempotency = idempotency or IdempotencyStore(database)
+
+    route_timeouts = route_timeouts or {}
+
+    instrument_engine(database.engine, metrics)
+    install_deadlines(database.engine)
+    admission.register_metrics(metrics)
+    jobs.register_metrics(metrics)
+    if expiry is not None:
+        expiry.register_metrics(metrics)
+
+    inference_seconds = metrics.histogram(
+        "autorestify_schema_inference_duration_seconds",
+        "Time spent inferring collection schemas.",
+    )
+    inference_documents = metrics.counter(
+        "autorestify_schema_inference_documents_total",
+        "Documents processed by schema inference.",
+    )
+    abandoned_requests = metrics.counter(
+        "autorestify_requests_abandoned_total",
+        "Requests whose database work was aborted.",
+        ("route", "reason"),
+    )
+
+    async def admit(user: Any, kind: str | None = None) -> Ticket:
+        """
+        Apply rate limits and concurrency caps for the authenticated user.
+        """
+        try:
+            return await admission.acquire(security_manager.principal_id(user), kind)
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)},
+            )
+
+    def deadline_for(request: Request) -> Deadline:
+        """
+        Route deadline, optionally shortened by the X-Request-Timeout header.
+        """
+        timeout = route_timeouts.get(route_label(request.scope), request_timeout)
+        try:
+            requested = float(request.headers.get(TIMEOUT_HEADER, 0))
+        except ValueError:
+            requested = 0
+        if requested > 0:
+            timeout = min(timeout, requested) if timeout else requested
+        return Deadline(timeout)
+
+    async def watch_disconnect(request: Request, deadline: Deadline) -> None:
+        while True:
+            message = await request.receive()
+            if message["type"] == "http.disconnect":
+                deadline.cancel("disconnected")
+                return
+
+    async def guarded(request: Request, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run database work in the threadpool under the request deadline.
+
+        The loop stays free to notice the client disconnecting, which
+        interrupts the running statement instead of finishing work nobody
+        will read.
+        """
+        deadline = deadline_for(request)
+        watcher = asyncio.ensure_future(watch_disconnect(request, deadline))
+        try:
+            return await run_in_threadpool(call_with_deadline, deadline, func, *args)
+        except DeadlineExceeded as e:
+            abandoned_requests.inc(route_label(request.scope), e.reason)
+            if e.reason == "timeout":
+                raise HTTPException(status_code=504, detail="Deadline exceeded")
+            raise HTTPException(status_code=499, detail="Client disconnected")
+        except asyncio.CancelledError:
+            deadline.cancel("disconnected")
+            raise
+        finally:
+            watcher.cancel()
+
+    async def idempotent(
+        request: Request,
+        user: Any,
+        run: Callable[[], Awaitable[Dict[str, Any]]],
+        status_code: int = 200,
+    ) -> Any:
+        """
+        Run a write once per Idempotency-Key header.
+
+        A retry with the same key and body replays the stored response;
+        failed requests release the key so they can be retried.
+        """
+
+        def respond(result: Dict[str, Any]) -> Any:
+            if status_code == 200:
+                return result
+            return JSONResponse(result, status_code=status_code)
+
+        client_key = request.headers.get(IDEMPOTENCY_HEADER)
+        if client_key is None:
+            return respond(await run())
+
+        if not client_key or len(client_key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            raise HTTPException(status_code=400, detail="Invalid Idempotency-Key")
+
+        key = idempotency.scope(
+            security_manager.principal_id(user),
+            request.method,
+            request.url.path,
+            client_key,
+        )
+
+        try:
+            stored = idempotency.begin(
+                key, idempotency.fingerprint(await request.body())
+            )
+        except IdempotencyConflict as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+
+        if stored is not None:
+            return Response(
+                stored.body,
+                status_code=stored.status_code,
+                media_type="application/json",
+                headers={"Idempotent-Replayed": "true"},
+            )
+
+        try:
+            result = await run()
+        except BaseException:
+            idempotency.release(key)
+            raise
+
+        body = json.dumps(jsonable_encoder(result)).encode()
+        idempotency.complete(key, status_code, body)
+        return respond(result)
+
+    def infer(documents: List[Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        schema = inferer.infer(documents)
+        inference_seconds.observe(time.perf_counter() - started)
+        inference_documents.inc(amount=len(documents))
+        return schema
+
+    def validate(
+        collection: str,
+        payload: Any,
+        loc: Tuple[Any, ...] = ("body",),
+    ) -> Dict[str, Any]:
+        """
+        Validate a document against the collection's generated model.
+        """
+        types = repository.get_types(collection)
+        if types is None:
+            return payload
+        try:
+            return types.input.validate_python(payload)
+        except ValidationError as e:
+            errors = e.errors(include_url=False, include_context=False)
+            raise RequestValidationError(
+                [{**err, "loc": loc + tuple(err["loc"])} for err in errors]
+            )
+
+    def serialize(collection: str, value: Any, many: bool = False) -> Any:
+        """
+        Encode records with the collection's generated serializer.
+        """
+        types = repository.get_types(collection)
+        if types is None:
+            return value
+        adapter = types.records if many else types.record
+        return Response(adapter.dump_json(value), media_type="application/json")
 
     # ----------------------------------
     # Health
@@ -34,6 +291,54 @@ def create_router(
     async def health():
         return {"status": "AutoRESTify running"}
 
+    # ----------------------------------
+    # Metrics
+    # ----------------------------------
+
+    @router.get("/_metrics", response_class=PlainTextResponse)
+    async def metrics_endpoint(request: Request):
+        try:
+            user = await security_manager.authenticate(request)
+            security_manager.authorize_read(user, "system")
+        except PermissionError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+
+        return PlainTextResponse(
+            metrics.render(),
+            media_type="text/plain; version=0.0.4",
+        )
+
+    # ----------------------------------
+    # Profiles (admin only)
+    # ----------------------------------
+
+    if profiles is not None:
+
+        @router.get("/_profiles")
+        async def list_profiles(request: Request):
+            try:
+                user = await security_manager.authenticate(request)
+                security_manager.authorize_admin(user)
+            except PermissionError as e:
+                raise HTTPException(status_code=403, detail=str(e))
+
+            return profiles.list()
+
+        @router.get("/_profiles/{profile_id}", response_class=PlainTextResponse)
+        async def get_profile(request: Request, profile_id: str):
+            try:
+                user = await security_manager.authenticate(request)
+                security_manager.authorize_admin(user)
+            except PermissionError as e:
+                raise HTTPException(status_code=403, detail=str(e))
+
+            profile = profiles.get(profile_id)
+
+            if not profile:
+                raise HTTPException(status_code=404, detail="Profile not found")
+
+            return PlainTextResponse(profile["report"])
+
     # ----------------------------------
     # Upload (register collection)
     # ----------------------------------
@@ -42,6 +347,7 @@ def create_router(
     async def upload(
         request: Request,
         payload: Dict[str, Any] = Body(...),
+        run_async: bool = Query(False, alias="async"),
     ):
         try:
             user = await security_manager.authenticate(request)
@@ -58,18 +364,428 @@ def create_router(
         if not isinstance(documents, list):
             raise HTTPException(status_code=400, detail="'documents' must be a list")
 
-        schema = inferer.infer(documents)
+        options = {
+            key: payload[key]
+            for key in ("search", "dedupe", "ttl", "partition", "storage")
+            if key in payload
+        }
+
+        def store() -> Dict[str, Any]:
+            schema = infer(documents)
+
+            try:
+                repository.create_tables_from_schema(collection, schema, options)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+            validated = [
+                validate(collection, doc, ("body", "documents", index))
+                for index, doc in enumerate(documents)
+            ]
+
+            return {
+                "message": "Collection registered",
+                "collection": collection,
+                "schema": schema,
+                "inserted": repository.insert_many(collection, validated),
+            }
+
+        async def register() -> Dict[str, Any]:
+            # Inference, DDL and inserts run on the threadpool, so uploads
+            # to different collections proceed in parallel
+            with await admit(user, "upload"):
+                return await run_in_threadpool(store)
+
+        def ingest(job: Job) -> Dict[str, Any]:
+            schema = infer(documents)
+            repository.create_tables_from_schema(collection, schema, options)
+            adapter = repository.get_types(collection).input
+
+            for start in range(0, len(documents), UPLOAD_JOB_BATCH):
+                batch = []
+                chunk = documents[start : start + UPLOAD_JOB_BATCH]
+                for index, doc in enumerate(chunk, start):
+                    try:
+                        batch.append(adapter.validate_python(doc))
+                    except ValidationError as e:
+                        job.record_error(
+                            index, e.errors(include_url=False, include_context=False)
+                        )
+                job.inserted += repository.insert_many(collection, batch)
+                job.processed = start + len(chunk)
+                jobs.progress(job)
+
+            return {"collection": collection, "schema": schema}
+
+        async def enqueue() -> Dict[str, Any]:
+            await admit(user)
+            try:
+                job = await run_in_threadpool(
+                    jobs.submit,
+                    "upload",
+                    security_manager.principal_id(user),
+                    ingest,
+                    collection=collection,
+                    total=len(documents),
+                )
+            except JobQueueFull as e:
+                raise HTTPException(
+                    status_code=503,
+                    detail=str(e),
+                    headers={"Retry-After": str(JOB_RETRY_AFTER_SECONDS)},
+                )
+            return {"job": job.id, "state": job.state, "status": f"/_jobs/{job.id}"}
+
+        if run_async:
+            return await idempotent(request, user, enqueue, status_code=202)
+
+        return await idempotent(request, user, register)
+
+    # ----------------------------------
+    # Background Jobs
+    # ----------------------------------
+
+    @router.get("/_jobs/{job_id}")
+    async def get_job(
+        request: Request,
+        job_id: str,
+    ):
+        try:
+            user = await security_manager.authenticate(request)
+        except PermissionError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+
+        job = await run_in_threadpool(jobs.get, job_id)
+
+        # Other principals' jobs are reported as missing, unless admin
+        if job is not None and job.owner != jobs.owner_of(
+            security_manager.principal_id(user)
+        ):
+            try:
+                security_manager.authorize_admin(user)
+            except PermissionError:
+                job = None
+
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        return job.to_dict()
+
+    # ----------------------------------
+    # Batch Reads
+    # ----------------------------------
+
+    @router.post("/_batch")
+    async def batch(
+        request: Request,
+        payload: Dict[str, Any] = Body(...),
+    ):
+        try:
+            user = await security_manager.authenticate(request)
+        except PermissionError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+
+        operations = payload.get("operations")
+
+        if not isinstance(operations, list) or not operations:
+            raise HTTPException(
+                status_code=400, detail="'operations' must be a non-empty list"
+            )
+
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {MAX_BATCH_OPERATIONS} operations per batch",
+            )
+
+        def failure(status_code: int, detail: str) -> bytes:
+            return json.dumps(
+                {"status": status_code, "detail": detail}, separators=(",", ":")
+            ).encode()
+
+        # Each operation gets its own status: one denied or missing read
+        # does not fail the others
+        results: List[bytes | None] = [None] * len(operations)
+        reads = []
+
+        for index, op in enumerate(operations):
+            collection = op.get("collection") if isinstance(op, dict) else None
+            if not isinstance(collection, str) or not collection:
+                results[index] = failure(400, "Missing 'collection'")
+                continue
+
+            item_id = op.get("id")
+            limit = op.get("limit", DEFAULT_LIST_LIMIT)
+            if item_id is not None and (
+                not isinstance(item_id, int) or isinstance(item_id, bool)
+            ):
+                results[index] = failure(400, "'id' must be an integer")
+                continue
+            if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+                results[index] = failure(400, "'limit' must be a positive integer")
+                continue
+
+            try:
+                security_manager.authorize_read(user, collection)
+            except PermissionError as e:
+                results[index] = failure(403, str(e))
+                continue
+
+            if not repository.table_exists(collection):
+                results[index] = failure(404, "Collection not found")
+                continue
+
+            reads.append((index, collection, item_id, limit))
+
+        def fetch() -> bytes:
+            with repository.snapshot() as session:
+                for index, collection, item_id, limit in reads:
+                    types = repository.get_types(collection)
+                    if item_id is None:
+                        rows = repository.list(collection, limit, session)
+                        body = types.records.dump_json(rows)
+                    else:
+                        item = repository.get(collection, item_id, session)
+                        if not item:
+                            results[index] = failure(404, "Item not found")
+                            continue
+                        body = types.record.dump_json(item)
+                    results[index] = b'{"status":200,"body":' + body + b"}"
+                    check_deadline()
+
+            return b'{"results":[' + b",".join(results) + b"]}"
+
+        total = sum(limit for _, _, item_id, limit in reads if item_id is None)
+
+        with await admit(user, admission.list_kind(total)):
+            body = await guarded(request, fetch)
+
+        return Response(body, media_type="application/json")
+
+    # ----------------------------------
+    # Bulk Transfer (CSV / NDJSON)
+    # ----------------------------------
+
+    @router.get("/{collection}/_export")
+    async def export_items(
+        request: Request,
+        collection: str,
+        fmt: str = Query("ndjson", alias="format"),
+        gzip: bool = False,
+        batch_size: int = Query(1000, ge=1, le=50000),
+    ):
+        try:
+            user = await security_manager.authenticate(request)
+            security_manager.authorize_read(user, collection)
+        except PermissionError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+
+        if fmt not in CONTENT_TYPES:
+            raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+
+        if not repository.table_exists(collection):
+            raise HTTPException(status_code=404, detail="Collection not found")
+
+        ticket = await admit(user, "bulk")
 
-        repository.create_tables_from_schema(collection, schema)
+        batches = repository.iter_batches(collection, batch_size)
 
-        for doc in documents:
-            repository.insert(collection, doc)
+        if fmt == "csv":
+            columns = ["id", "created_at", *repository.get_schema(collection)]
+            chunks = encode_csv(batches, columns)
+        else:
+            chunks = encode_ndjson(batches, repository.get_types(collection).record)
 
-        return {
-            "message": "Collection registered",
-            "collection": collection,
-            "schema": schema,
+        headers = {
+            "Content-Disposition": f'attachment; filename="{collection}.{fmt}"',
         }
+        if gzip:
+            chunks = gzip_stream(chunks)
+            headers["Content-Encoding"] = "gzip"
+
+        def stream():
+            try:
+                yield from chunks
+            finally:
+                ticket.release()
+
+        # The background task also releases the ticket when the client
+        # leaves before the body is iterated (release is idempotent)
+        return StreamingResponse(
+            stream(),
+            media_type=CONTENT_TYPES[fmt],
+            headers=headers,
+            background=BackgroundTask(ticket.release),
+        )
+
+    @router.post("/{collection}/_import")
+    async def import_items(
+        request: Request,
+        collection: str,
+        fmt: str = Query("ndjson", alias="format"),
+        batch_size: int = Query(1000, ge=1, le=50000),
+    ):
+        try:
+            user = await security_manager.authenticate(request)
+            security_manager.authorize_write(user, collection)
+        except PermissionError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+
+        if fmt not in PARSERS:
+            raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+
+        if not repository.table_exists(collection):
+            raise HTTPException(status_code=404, detail="Collection not found")
+
+        schema = repository.get_schema(collection)
+        adapter = repository.get_types(collection).input
+        parser = PARSERS[fmt]()
+
+        inserted = 0
+        failed = 0
+        errors = []
+        batch = []
+        index = 0
+
+        def accept(records) -> None:
+            nonlocal index, failed
+
+            for record in records:
+                index += 1
+                try:
+                    if fmt == "csv":
+                        record = coerce_csv_record(record, schema)
+                    elif isinstance(record, dict):
+                        record = {
+                            k: v for k, v in record.items() if k not in META_COLUMNS
+                        }
+                    batch.append(adapter.validate_python(record))
+                except (ValidationError, ValueError) as e:
+                    failed += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        detail = (
+                            e.errors(include_url=False, include_context=False)
+                            if isinstance(e, ValidationError)
+                            else str(e)
+                        )
+                        errors.append({"record": index, "error": detail})
+
+        def flush() -> None:
+            nonlocal inserted
+            inserted += repository.insert_many(collection, batch)
+            batch.clear()
+
+        def load(chunk: bytes) -> None:
+            accept(parser.feed(chunk))
+            if len(batch) >= batch_size:
+                flush()
+
+        def finish() -> None:
+            accept(parser.close())
+            flush()
+
+        # Parsing, validation and inserts run on the threadpool, as uploads
+        # do; only reading the body stays on the event loop
+        with await admit(user, "bulk"):
+            async for chunk in request.stream():
+                await run_in_threadpool(load, chunk)
+            await run_in_threadpool(finish)
+
+        failed += parser.failed
+        errors.extend(parser.errors[: max(0, MAX_REPORTED_ERRORS - len(errors))])
+
+        return {"inserted": inserted, "failed": failed, "errors": errors}
+
+    # ----------------------------------
+    # Full-Text Search
+    # ----------------------------------
+
+    @router.get("/{collection}/_search")
+    async def search_items(
+        request: Request,
+        collection: str,
+        q: str = Query(..., min_length=1),
+        fields: str | None = None,
+        limit: int = Query(20, ge=1, le=1000),
+        offset: int = Query(0, ge=0),
+    ):
+        try:
+            user = await security_manager.authenticate(request)
+            security_manager.authorize_read(user, collection)
+        except PermissionError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+
+        if repository.get_schema(collection) is None:
+            raise HTTPException(status_code=404, detail="Collection not found")
+
+        await admit(user)
+
+        selected = None
+        if fields:
+            selected = [f.strip() for f in fields.split(",") if f.strip()]
+
+        try:
+            items = await guarded(
+                request, repository.search, collection, q, selected, limit, offset
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return {"q": q, "limit": limit, "offset": offset, "items": items}
+
+    # ----------------------------------
+    # Change Feed (Server-Sent Events)
+    # ----------------------------------
+
+    @router.get("/{collection}/_changes")
+    async def stream_changes(
+        request: Request,
+        collection: str,
+        since: int | None = Query(None, ge=0),
+        last_event_id: str | None = Header(None),
+    ):
+        try:
+            user = await security_manager.authenticate(request)
+            security_manager.authorize_read(user, collection)
+        except PermissionError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+
+        if repository.get_schema(collection) is None:
+            raise HTTPException(status_code=404, detail="Collection not found")
+
+        await admit(user)
+
+        feed = repository.changes
+        name = collection.lower()
+
+        if last_event_id is not None:
+            try:
+                since = int(last_event_id)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+
+        async def events():
+            seq = feed.latest(name) if since is None else since
+            yield "retry: 3000\n\n"
+
+            while True:
+                changes = feed.since(name, seq)
+
+                if changes is None:
+                    # Resume point lost: the client must re-read the collection
+                    seq = feed.latest(name)
+                    yield f'id: {seq}\nevent: reset\ndata: {{"seq": {seq}}}\n\n'
+                elif changes:
+                    seq = changes[-1].seq
+                    yield "".join(change.to_sse() for change in changes)
+                elif not await feed.wait(name, seq, CHANGES_HEARTBEAT_SECONDS):
+                    yield ": keep-alive\n\n"
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
     # ----------------------------------
     # Generic CRUD
@@ -79,7 +795,7 @@ def create_router(
     async def list_items(
         request: Request,
         collection: str,
-        limit: int = 100,
+        limit: int = Query(DEFAULT_LIST_LIMIT, ge=1),
     ):
         try:
             user = await security_manager.authenticate(request)
@@ -90,7 +806,17 @@ def create_router(
         if not repository.table_exists(collection):
             raise HTTPException(status_code=404, detail="Collection not found")
 
-        return repository.list(collection, limit)
+        types = repository.get_types(collection)
+
+        def fetch() -> bytes:
+            rows = repository.list(collection, limit)
+            check_deadline()
+            return types.records.dump_json(rows)
+
+        with await admit(user, admission.list_kind(limit)):
+            body = await guarded(request, fetch)
+
+        return Response(body, media_type="application/json")
 
     @router.get("/{collection}/{item_id}")
     async def get_item(
@@ -104,12 +830,14 @@ def create_router(
         except PermissionError as e:
             raise HTTPException(status_code=403, detail=str(e))
 
-        item = repository.get(collection, item_id)
+        await admit(user)
+
+        item = await guarded(request, repository.get, collection, item_id)
 
         if not item:
             raise HTTPException(status_code=404, detail="Item not found")
 
-        return item
+        return serialize(collection, item)
 
     @router.post("/{collection}")
     async def create_item(
@@ -123,12 +851,15 @@ def create_router(
         except PermissionError as e:
             raise HTTPException(status_code=403, detail=str(e))
 
+        await admit(user)
+
         if not repository.table_exists(collection):
             raise HTTPException(status_code=404, detail="Collection not found")
 
-        item_id = repository.insert(collection, payload)
+        async def create() -> Dict[str, Any]:
+            return {"id": repository.insert(collection, validate(collection, payload))}
 
-        return {"id": item_id}
+        return await idempotent(request, user, create)
 
     @router.put("/{collection}/{item_id}")
     async def update_item(
@@ -143,7 +874,9 @@ def create_router(
         except PermissionError as e:
             raise HTTPException(status_code=403, detail=str(e))
 
-        ok = repository.update(collection, item_id, payload)
+        await admit(user)
+
+        ok = repository.update(collection, item_id, validate(collection, payload))
 
         if not ok:
             raise HTTPException(status_code=404, detail="Item not found")
@@ -162,6 +895,8 @@ def create_router(
         except PermissionError as e:
             raise HTTPException(status_code=403, detail=str(e))
 
+        await admit(user)
+
         ok = repository.delete(collection, item_id)
 
         if not ok:
@@ -0,0 +1,233 @@
+"""
+Command-line interface for AutoRESTify.
+
+    autorestify serve --workers 4 --database-url postgresql://...
+
+Workers are separate processes started by uvicorn from an import string,
+so configuration travels through AUTORESTIFY_* environment variables that
+`app_from_env` reads in each worker:
+
+    AUTORESTIFY_DATABASE_URL          Database URL
+    AUTORESTIFY_SLOW_REQUEST_SECONDS  Slow request log threshold
+    AUTORESTIFY_SLOW_QUERY_SECONDS    Slow query log threshold
+    AUTORESTIFY_PROFILING             Enable the admin profiler (1/true)
+    AUTORESTIFY_RICH_TYPES            Infer datetime/date/uuid/bigint (1/true)
+    AUTORESTIFY_REQUEST_TIMEOUT       Deadline for read routes (seconds)
+    AUTORESTIFY_IDEMPOTENCY_TTL       Seconds Idempotency-Key responses are kept
+    AUTORESTIFY_EXPIRY_INTERVAL       Seconds between TTL expiry sweeps (0 disables)
+    AUTORESTIFY_VACUUM_INTERVAL       Seconds between SQLite vacuums
+    AUTORESTIFY_UPLOAD_WORKERS        Background upload jobs run at once
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("autorestify.cli")
+
+APP_FACTORY = "autorestify.cli:app_from_env"
+DEFAULT_DATABASE_URL = "sqlite:///./autorestify.db"
+
+_STARTED = time.perf_counter()
+
+
+# =========================================================
+# Configuration
+# =========================================================
+
+def _env_float(name: str, default: Optional[float] = None) -> Optional[float]:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").lower() in ("1", "true")
+
+
+def settings_from_env() -> Dict[str, Any]:
+    """
+    Read `create_app` arguments from AUTORESTIFY_* environment variables.
+    """
+
+    return {
+        "database_url": os.environ.get(
+            "AUTORESTIFY_DATABASE_URL", DEFAULT_DATABASE_URL
+        ),
+        "slow_request_threshold": _env_float("AUTORESTIFY_SLOW_REQUEST_SECONDS"),
+        "slow_query_threshold": _env_float("AUTORESTIFY_SLOW_QUERY_SECONDS"),
+        "enable_profiling": _env_flag("AUTORESTIFY_PROFILING"),
+        "rich_types": _env_flag("AUTORESTIFY_RICH_TYPES"),
+        "request_timeout": _env_float("AUTORESTIFY_REQUEST_TIMEOUT"),
+        "idempotency_ttl": _env_float("AUTORESTIFY_IDEMPOTENCY_TTL", 86400.0),
+        # An interval of 0 stops the expiry task rather than spinning it
+        "expiry_interval": _env_float("AUTORESTIFY_EXPIRY_INTERVAL", 60.0) or None,
+        "vacuum_interval": _env_float("AUTORESTIFY_VACUUM_INTERVAL"),
+        "upload_workers": int(_env_float("AUTORESTIFY_UPLOAD_WORKERS") or 2),
+    }
+
+
+def app_from_env() -> Any:
+    """
+    Application factory used by server workers.
+
+    Loads the collection catalog eagerly so the first requests do not pay
+    for model generation.
+    """
+
+    started = time.perf_counter()
+
+    from autorestify.api.app_factory import create_app
+    from autorestify.storage.base import Database
+
+    settings = settings_from_env()
+    database = Database(database_url=settings.pop("database_url"))
+    app = create_app(database=database, **settings)
+    collections = app.state.repository.load_catalog()
+
+    logging.getLogger("uvicorn.error").info(
+        "Worker %d ready in %.1f ms (%d collections)",
+        os.getpid(),
+        (time.perf_counter() - started) * 1000,
+        len(collections),
+    )
+    return app
+
+
+def preload_catalog(database_url: str) -> List[str]:
+    """
+    Validate every catalogued collection before starting workers.
+
+    Building the models once in the parent surfaces broken catalog entries
+    or an unreachable database as a startup error instead of failing
+    workers, and warms the bytecode caches the workers import from.
+    """
+
+    from autorestify.storage.base import Database
+    from autorestify.storage.repository import Repository
+
+    database = Database(database_url=database_url)
+    try:
+        return Repository(database).load_catalog()
+    finally:
+        database.engine.dispose()
+
+
+# =========================================================
+# Commands
+# =========================================================
+
+def _accelerators() -> str:
+    found = [m for m in ("uvloop", "httptools") if importlib.util.find_spec(m)]
+    return ", ".join(found) if found else "none (pip install 'autorestify[server]')"
+
+
+def serve(args: argparse.Namespace) -> int:
+    """
+    Run the API with uvicorn.
+    """
+
+    try:
+        import uvicorn
+    except ImportError:
+        logger.error("uvicorn is required: pip install 'autorestify[server]'")
+        return 1
+
+    if args.database_url:
+        os.environ["AUTORESTIFY_DATABASE_URL"] = args.database_url
+    database_url = settings_from_env()["database_url"]
+
+    if args.preload:
+        started = time.perf_counter()
+        collections = preload_catalog(database_url)
+        logger.info(
+            "Catalog validated in %.1f ms (%d collections)",
+            (time.perf_counter() - started) * 1000,
+            len(collections),
+        )
+
+    logger.info(
+        "Starting %d worker(s) on %s:%d | accelerators: %s | CLI startup %.1f ms",
+        args.workers,
+        args.host,
+        args.port,
+        _accelerators(),
+        (time.perf_counter() - _STARTED) * 1000,
+    )
+
+    uvicorn.run(
+        APP_FACTORY,
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=None if args.reload else args.workers,
+        reload=args.reload,
+        loop=args.loop,
+        http=args.http,
+        log_level=args.log_level,
+        proxy_headers=True,
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="autorestify")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("serve", help="Run the API server")
+    run.add_argument("--host", default="127.0.0.1")
+    run.add_argument("--port", type=int, default=8000)
+    run.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("AUTORESTIFY_WORKERS", 1)),
+        help="Number of worker processes",
+    )
+    run.add_argument(
+        "--database-url",
+        default=None,
+        help="Overrides AUTORESTIFY_DATABASE_URL",
+    )
+    run.add_argument(
+        "--loop",
+        default="auto",
+        choices=["auto", "asyncio", "uvloop"],
+        help="Event loop (auto uses uvloop when installed)",
+    )
+    run.add_argument(
+        "--http",
+        default="auto",
+        choices=["auto", "h11", "httptools"],
+        help="HTTP parser (auto uses httptools when installed)",
+    )
+    run.add_argument(
+        "--no-preload",
+        dest="preload",
+        action="store_false",
+        help="Skip catalog validation in the parent process",
+    )
+    run.add_argument(
+        "--reload",
+        action="store_true",
+        help="Auto-reload on code changes (development only, single worker)",
+    )
+    run.add_argument("--log-level", default="info")
+    run.set_defaults(handler=serve)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=getattr(logging, str(args.log_level).upper(), logging.INFO),
+        format="%(levelname)s:     %(message)s",
+    )
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,14 +5,31 @@ Contains:
 - Engine
 - Schema inference
 - Security components
+- Metrics
 """
 
-from .engine import Engine
-from .schema_inference import SchemaInferer
-from .security import AuthProvider
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .engine import Engine
+    from .metrics import MetricsRegistry
+    from .schema_inference import SchemaInferer
+    from .security import AuthProvider
+
+_EXPORTS = {
+    "Engine": ".engine",
+    "MetricsRegistry": ".metrics",
+    "SchemaInferer": ".schema_inference",
+    "AuthProvider": ".security",
+}
 
 __all__ = [
     "Engine",
+    "MetricsRegistry",
     "SchemaInferer",
     "AuthProvider",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,292 @@
+"""
+Admission control for AutoRESTify.
+
+Protects the shared database from overload:
+- Token-bucket rate limits per principal
+- Concurrency caps per request class (upload, bulk, large lists)
+- Short bounded queueing, then load shedding with Retry-After
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from .metrics import MetricsRegistry
+
+
+class AdmissionRejected(Exception):
+    """
+    Request refused by admission control.
+    """
+
+    def __init__(self, status_code: int, detail: str, retry_after: float) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+# =========================================================
+# Primitives
+# =========================================================
+
+class TokenBucket:
+    """
+    Classic token bucket refilled at `rate` tokens per second.
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def reserve(self, max_wait: float) -> float:
+        """
+        Take a token, returning how long the caller must wait for it.
+
+        Returns -1 (and takes nothing) if the wait would exceed max_wait.
+        """
+
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+
+        wait = (1 - self.tokens) / self.rate
+        if wait > max_wait:
+            return -1.0
+
+        self.tokens -= 1
+        return wait
+
+    def retry_after(self) -> float:
+        return (1 - self.tokens) / self.rate
+
+
+class _Waiter:
+    __slots__ = ("loop", "future", "granted")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.future = loop.create_future()
+        self.granted = False
+
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class ConcurrencyLimit:
+    """
+    FIFO concurrency cap usable from any event loop or thread.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.active = 0
+        self._waiters: Deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float) -> bool:
+        with self._lock:
+            if self.active < self.limit and not self._waiters:
+                self.active += 1
+                return True
+            if timeout <= 0:
+                return False
+            waiter = _Waiter(asyncio.get_running_loop())
+            self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(waiter.future, timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    return False
+            # The slot was handed over just as we timed out
+        except asyncio.CancelledError:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    raise
+            self.release()
+            raise
+
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                try:
+                    waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+                except RuntimeError:  # loop closed, try the next waiter
+                    continue
+                waiter.granted = True
+                return
+            self.active -= 1
+
+
+class Ticket:
+    """
+    Admission granted to one request; release it when the work is done.
+    """
+
+    __slots__ = ("_limit",)
+
+    def __init__(self, limit: Optional[ConcurrencyLimit] = None) -> None:
+        self._limit = limit
+
+    def release(self) -> None:
+        if self._limit is not None:
+            self._limit.release()
+            self._limit = None
+
+    def __enter__(self) -> "Ticket":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
+
+
+# =========================================================
+# Controller
+# =========================================================
+
+class AdmissionController:
+    """
+    Per-principal rate limiting and per-class concurrency caps.
+
+    Args:
+        rate: Sustained requests per second per principal (None = unlimited)
+        burst: Bucket size per principal (defaults to rate)
+        concurrency: Max in-flight requests per class, e.g.
+            {"upload": 2, "bulk": 2, "list_large": 4}
+        queue_timeout: Max seconds a request may wait before being shed
+        large_list_threshold: `limit` above which a list is "list_large"
+        max_principals: Number of per-principal buckets kept (LRU)
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+        queue_timeout: float = 0.5,
+        large_list_threshold: int = 1000,
+        max_principals: int = 10000,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst if burst is not None else (rate or 0)
+        self.queue_timeout = queue_timeout
+        self.large_list_threshold = large_list_threshold
+        self.max_principals = max_principals
+
+        self.limits: Dict[str, ConcurrencyLimit] = {
+            kind: ConcurrencyLimit(limit) for kind, limit in (concurrency or {}).items()
+        }
+
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._rejected = None
+
+    # ----------------------------------
+    # Public API
+    # ----------------------------------
+
+    def list_kind(self, limit: int) -> Optional[str]:
+        return "list_large" if limit > self.large_list_threshold else None
+
+    async def acquire(self, principal: str, kind: Optional[str] = None) -> Ticket:
+        """
+        Admit a request or raise AdmissionRejected.
+        """
+
+        if self.rate:
+            wait, retry_after = self._reserve_token(principal)
+            if wait < 0:
+                self._count_rejection(kind, "rate_limited")
+                raise AdmissionRejected(429, "Rate limit exceeded", retry_after)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+        limit = self.limits.get(kind) if kind else None
+        if limit is None:
+            return Ticket()
+
+        if not await limit.acquire(self.queue_timeout):
+            self._count_rejection(kind, "overloaded")
+            raise AdmissionRejected(
+                503,
+                f"Too many concurrent '{kind}' requests",
+                max(self.queue_timeout, 1.0),
+            )
+
+        return Ticket(limit)
+
+    def register_metrics(self, registry: MetricsRegistry) -> None:
+        """
+        Expose limiter state on a metrics registry.
+        """
+
+        registry.gauge(
+            "autorestify_admission_in_flight",
+            "Admitted requests per concurrency class.",
+            ("class",),
+            callback=lambda: [((k,), float(v.active)) for k, v in self.limits.items()],
+        )
+        registry.gauge(
+            "autorestify_admission_queued",
+            "Requests waiting for a concurrency slot.",
+            ("class",),
+            callback=lambda: [((k,), float(v.queued)) for k, v in self.limits.items()],
+        )
+        registry.gauge(
+            "autorestify_admission_limit",
+            "Configured concurrency cap per class.",
+            ("class",),
+            callback=lambda: [((k,), float(v.limit)) for k, v in self.limits.items()],
+        )
+        registry.gauge(
+            "autorestify_ratelimit_principals",
+            "Principals with an active token bucket.",
+            callback=lambda: [((), float(len(self._buckets)))],
+        )
+        self._rejected = registry.counter(
+            "autorestify_admission_rejected_total",
+            "Requests shed by admission control.",
+            ("class", "reason"),
+        )
+
+    # ----------------------------------
+    # Internal Utilities
+    # ----------------------------------
+
+    def _reserve_token(self, principal: str) -> Tuple[float, float]:
+        with self._lock:
+            bucket = self._buckets.get(principal)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, max(self.burst, 1))
+                self._buckets[principal] = bucket
+                while len(self._buckets) > self.max_principals:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(principal)
+            wait = bucket.reserve(self.queue_timeout)
+            return wait, bucket.retry_after()
+
+    def _count_rejection(self, kind: Optional[str], reason: str) -> None:
+        if self._rejected is not None:
+            self._rejected.inc(kind or "default", reason)
@@ -0,0 +1,167 @@
+"""
+Change feed for AutoRESTify.
+
+Contains:
+- Change: one insert/update/delete, numbered per collection
+- ChangeFeed: in-process ring buffer per collection with loop-safe fan-out
+
+Subscribers on the same event loop share a single wake-up future per
+collection, so a write costs one `call_soon_threadsafe` per loop no matter
+how many clients are listening; each subscriber then reads the buffer from
+its own last-seen sequence number.
+"""
+
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class Change:
+    """
+    A committed write to a collection.
+    """
+
+    seq: int
+    collection: str
+    op: str
+    id: Any
+    data: Optional[Dict[str, Any]] = None
+    timestamp: float = 0.0
+
+    def to_sse(self) -> str:
+        """
+        Encode as a Server-Sent Event; the sequence number is the event id.
+        """
+
+        payload = json.dumps(
+            {
+                "seq": self.seq,
+                "op": self.op,
+                "id": self.id,
+                "data": self.data,
+                "timestamp": self.timestamp,
+            },
+            default=str,
+        )
+        return f"id: {self.seq}\nevent: {self.op}\ndata: {payload}\n\n"
+
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class ChangeFeed:
+    """
+    Bounded, sequence-numbered change log per collection.
+
+    Sequence numbers start at 1 for each collection and are local to the
+    process: a restart (or another worker) starts a new sequence, which
+    `since` reports as a gap.
+    """
+
+    def __init__(self, capacity: int = 1000) -> None:
+        self.capacity = capacity
+        self._logs: Dict[str, Deque[Change]] = {}
+        self._seq: Dict[str, int] = {}
+        self._waiters: Dict[str, Dict[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._lock = threading.Lock()
+
+    # ----------------------------------
+    # Producers
+    # ----------------------------------
+
+    def publish(
+        self,
+        collection: str,
+        op: str,
+        item_id: Any,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> Change:
+        """
+        Append a change and wake every subscriber of the collection.
+
+        Safe to call from any thread.
+        """
+
+        with self._lock:
+            seq = self._seq.get(collection, 0) + 1
+            self._seq[collection] = seq
+
+            change = Change(seq, collection, op, item_id, data, time.time())
+
+            log = self._logs.get(collection)
+            if log is None:
+                log = self._logs[collection] = deque(maxlen=self.capacity)
+            log.append(change)
+
+            waiters = self._waiters.pop(collection, {})
+
+        for loop, future in waiters.items():
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:  # loop closed
+                continue
+
+        return change
+
+    # ----------------------------------
+    # Consumers
+    # ----------------------------------
+
+    def latest(self, collection: str) -> int:
+        """
+        Sequence number of the newest change (0 if none).
+        """
+        with self._lock:
+            return self._seq.get(collection, 0)
+
+    def since(self, collection: str, seq: int) -> Optional[List[Change]]:
+        """
+        Changes after `seq`, oldest first.
+
+        Returns None when `seq` cannot be resumed from: it was evicted from
+        the buffer or belongs to another sequence (e.g. before a restart).
+        """
+
+        with self._lock:
+            latest = self._seq.get(collection, 0)
+            if seq == latest:
+                return []
+            if seq > latest or seq < 0:
+                return None
+
+            log = self._logs[collection]
+            first = log[0].seq
+            if seq < first - 1:
+                return None
+
+            return list(itertools.islice(log, seq - first + 1, None))
+
+    async def wait(self, collection: str, seq: int, timeout: float) -> bool:
+        """
+        Wait until a change newer than `seq` exists, or `timeout` elapses.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            if self._seq.get(collection, 0) != seq:
+                return True
+
+            waiters = self._waiters.setdefault(collection, {})
+            future = waiters.get(loop)
+            if future is None:
+                future = waiters[loop] = loop.create_future()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
@@ -0,0 +1,115 @@
+"""
+Request deadlines for AutoRESTify.
+
+Contains:
+- Deadline: time budget of one request, cancellable on client disconnect
+- DeadlineExceeded: raised when work is abandoned
+- current_deadline: context variable read by the database hooks
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+
+class DeadlineExceeded(Exception):
+    """
+    Work abandoned because the deadline passed or the client went away.
+    """
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(f"Request abandoned ({reason})")
+        self.reason = reason
+
+
+class Deadline:
+    """
+    Time budget for one request.
+
+    `reason` becomes "timeout" once the budget is spent, or "disconnected"
+    when the request is cancelled. Database drivers that can abort a
+    running statement from another thread register an interrupt callback.
+    """
+
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout if timeout else None
+        self.reason: Optional[str] = None
+        self._interrupts: Dict[Any, Callable[[], Any]] = {}
+        self._lock = threading.Lock()
+
+    def remaining(self) -> Optional[float]:
+        """
+        Seconds left (None if unbounded).
+        """
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        if self.reason is not None:
+            return True
+        if self.expires_at is not None and time.monotonic() >= self.expires_at:
+            self.reason = "timeout"
+            return True
+        return False
+
+    def check(self) -> None:
+        """
+        Raise DeadlineExceeded if the work should stop.
+        """
+        if self.expired():
+            raise DeadlineExceeded(self.reason)
+
+    def cancel(self, reason: str = "disconnected") -> None:
+        """
+        Abandon the work and interrupt any running statement.
+        """
+
+        with self._lock:
+            if self.reason is None:
+                self.reason = reason
+            interrupts = list(self._interrupts.values())
+
+        for interrupt in interrupts:
+            try:
+                interrupt()
+            except Exception:  # the statement may have just finished
+                pass
+
+    def add_interrupt(self, key: Any, interrupt: Callable[[], Any]) -> None:
+        with self._lock:
+            self._interrupts[key] = interrupt
+
+    def remove_interrupt(self, key: Any) -> None:
+        with self._lock:
+            self._interrupts.pop(key, None)
+
+
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar(
+    "autorestify_deadline",
+    default=None,
+)
+
+
+def check_deadline() -> None:
+    """
+    Raise DeadlineExceeded if the current deadline has passed.
+    """
+    deadline = current_deadline.get()
+    if deadline is not None:
+        deadline.check()
+
+
+def call_with_deadline(deadline: Deadline, func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run `func` with `deadline` as the current deadline.
+    """
+
+    token = current_deadline.set(deadline)
+    try:
+        deadline.check()
+        return func(*args)
+    finally:
+        current_deadline.reset(token)
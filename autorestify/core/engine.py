@@ -5,7 +5,67 @@ Responsible for deterministic type detection based on Python types.
 No AI dependencies.
 """
 
-from typing import Any
+import uuid
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Union
+
+# Largest value stored in a 32-bit INTEGER column
+INT32_MAX = 2**31 - 1
+
+# Exact-type fast path; subclasses fall back to isinstance checks
+_TYPE_LABELS: Dict[type, str] = {
+    type(None): "null",
+    bool: "boolean",
+    int: "integer",
+    float: "float",
+    str: "string",
+    dict: "object",
+    list: "array",
+}
+
+# Native Python values recognized when rich types are enabled
+_RICH_TYPE_LABELS: Dict[type, str] = {
+    datetime: "datetime",
+    date: "date",
+    uuid.UUID: "uuid",
+}
+
+
+def _parse_datetime(value: str) -> datetime:
+    # datetime.fromisoformat only accepts "Z" from Python 3.11
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def _string_type(value: str) -> str:
+    """
+    Classify ISO-8601 dates/datetimes and canonical UUIDs.
+
+    Cheap shape checks run first so ordinary strings are never parsed.
+    """
+
+    size = len(value)
+
+    if size == 36 and value[8] == "-" and value[13] == "-" and value[23] == "-":
+        try:
+            uuid.UUID(value)
+            return "uuid"
+        except ValueError:
+            return "string"
+
+    if size >= 10 and value[4] == "-" and value[7] == "-" and value[:4].isdigit():
+        try:
+            if size == 10:
+                date.fromisoformat(value)
+                return "date"
+            if value[10] in "Tt ":
+                _parse_datetime(value)
+                return "datetime"
+        except ValueError:
+            pass
+
+    return "string"
 
 
 class Engine:
@@ -13,8 +73,26 @@ class Engine:
     Deterministic type inference engine.
 
     Maps Python values to internal schema types.
+
+    Args:
+        rich_types: Also detect datetime, date, uuid and bigint values,
+            including ISO-8601 and UUID strings. Off by default: such
+            strings are then stored as plain strings.
     """
 
+    def __init__(self, rich_types: bool = False) -> None:
+        self.rich_types = rich_types
+
+        # type → label, or a function refining the label from the value
+        self._dispatch: Dict[type, Union[str, Callable[[Any], str]]] = dict(
+            _TYPE_LABELS
+        )
+
+        if rich_types:
+            self._dispatch.update(_RICH_TYPE_LABELS)
+            self._dispatch[str] = _string_type
+            self._dispatch[int] = self._integer_type
+
     def detect_type(self, value: Any) -> str:
         """
         Detect internal type label from a Python value.
@@ -25,17 +103,38 @@ class Engine:
             - float
             - boolean
             - object
+            - array
             - null
+            - datetime, date, uuid, bigint (rich types only)
         """
 
-        if value is None:
-            return "null"
+        label = self._dispatch.get(type(value))
+
+        if label is None:
+            return self._detect_subclass(value)
+
+        if label.__class__ is str:
+            return label
+
+        return label(value)
+
+    # ----------------------------------
+    # Private Methods
+    # ----------------------------------
+
+    def _integer_type(self, value: int) -> str:
+        return "integer" if -INT32_MAX - 1 <= value <= INT32_MAX else "bigint"
+
+    def _detect_subclass(self, value: Any) -> str:
+        """
+        Slow path for subclasses of the supported types.
+        """
 
         if isinstance(value, bool):
             return "boolean"
 
-        if isinstance(value, int) and not isinstance(value, bool):
-            return "integer"
+        if isinstance(value, int):
+            return self._integer_type(value) if self.rich_types else "integer"
 
         if isinstance(value, float):
             return "float"
@@ -46,4 +145,11 @@ class Engine:
         if isinstance(value, list):
             return "array"
 
+        if self.rich_types:
+            for rich_type, label in _RICH_TYPE_LABELS.items():
+                if isinstance(value, rich_type):
+                    return label
+            if isinstance(value, str):
+                return _string_type(value)
+
         return "string"
@@ -0,0 +1,75 @@
+"""
+Profiling primitives for AutoRESTify.
+
+Contains:
+- RequestTrace: per-request accounting of database time
+- ProfileStore: bounded in-memory store of captured profiles
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+# =========================================================
+# Request Trace
+# =========================================================
+
+@dataclass
+class RequestTrace:
+    """
+    Database work attributed to the current request.
+    """
+
+    db_seconds: float = 0.0
+    queries: int = 0
+    slow_queries: List[Dict[str, Any]] = field(default_factory=list)
+
+
+current_trace: ContextVar[Optional[RequestTrace]] = ContextVar(
+    "autorestify_request_trace",
+    default=None,
+)
+
+
+# =========================================================
+# Profile Store
+# =========================================================
+
+class ProfileStore:
+    """
+    Keep the most recent request profiles, evicting the oldest.
+    """
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self.max_entries = max_entries
+        self._profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def reserve(self) -> str:
+        """
+        Allocate an id before the profile is available.
+        """
+        return f"{int(time.time())}-{next(self._ids)}"
+
+    def put(self, profile_id: str, report: str, **meta: Any) -> None:
+        with self._lock:
+            self._profiles[profile_id] = {"id": profile_id, "report": report, **meta}
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {k: v for k, v in entry.items() if k != "report"}
+                for entry in self._profiles.values()
+            ]
@@ -5,7 +5,7 @@ Responsible for generating a unified schema from
 a list of JSON-like documents.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set
 from collections import defaultdict
 
 from .engine import Engine
@@ -16,8 +16,12 @@ class SchemaInferer:
     Infer a consistent schema from a list of documents.
     """
 
-    def __init__(self, engine: Engine | None = None) -> None:
-        self.engine = engine or Engine()
+    def __init__(
+        self,
+        engine: Engine | None = None,
+        rich_types: bool = False,
+    ) -> None:
+        self.engine = engine or Engine(rich_types=rich_types)
 
     # ----------------------------------
     # Public API
@@ -31,32 +35,61 @@ class SchemaInferer:
         if not documents:
             return {}
 
-        field_types: Dict[str, List[str]] = defaultdict(list)
+        field_types: Dict[str, Set[str]] = defaultdict(set)
+        detect_type = self.engine.detect_type
 
         for doc in documents:
             if not isinstance(doc, dict):
                 continue
 
             for field, value in doc.items():
-                detected = self.engine.detect_type(value)
-                field_types[field].append(detected)
+                field_types[field].add(detect_type(value))
 
         return self._resolve_schema(field_types, documents)
 
+    def merge(
+        self,
+        existing: Dict[str, Any],
+        incoming: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Merge a newly inferred schema into an existing one.
+
+        New fields are added, conflicting scalar types are widened with the
+        same rules as inference, and nested objects are merged recursively.
+        A field cannot switch between object and scalar; the existing shape
+        is kept.
+        """
+
+        merged = dict(existing)
+
+        for field, new_type in incoming.items():
+            old_type = merged.get(field)
+
+            if old_type is None:
+                merged[field] = new_type
+            elif isinstance(old_type, dict) and isinstance(new_type, dict):
+                merged[field] = self.merge(old_type, new_type)
+            elif isinstance(old_type, dict) or isinstance(new_type, dict):
+                continue
+            else:
+                merged[field] = self._merge_scalar_types({old_type, new_type})
+
+        return merged
+
     # ----------------------------------
     # Private Methods
     # ----------------------------------
 
     def _resolve_schema(
         self,
-        field_types: Dict[str, List[str]],
+        field_types: Dict[str, Set[str]],
         documents: List[Dict[str, Any]],
     ) -> Dict[str, Any]:
 
         schema: Dict[str, Any] = {}
 
-        for field, types in field_types.items():
-            unique_types = set(types)
+        for field, unique_types in field_types.items():
 
             # -------------------------
             # Nested Object Handling
@@ -73,7 +106,9 @@ class SchemaInferer:
             # -------------------------
             # Type Conflict Resolution
             # -------------------------
-            schema[field] = self._merge_scalar_types(unique_types)
+            schema[field] = self._merge_scalar_types(
+                unique_types, ignore_null=self.engine.rich_types
+            )
 
         return schema
 
@@ -81,24 +116,36 @@ class SchemaInferer:
     # Type Merging Logic
     # ----------------------------------
 
-    def _merge_scalar_types(self, types: set[str]) -> str:
+    def _merge_scalar_types(self, types: set[str], ignore_null: bool = False) -> str:
         """
         Resolve scalar type conflicts.
+
+        With `ignore_null`, nulls mixed with other values carry no type.
+        Only inference of one upload with rich types sets it: an existing
+        "null" column is a text column, so evolving it keeps the baseline
+        widening to string.
         """
 
+        if ignore_null and len(types) > 1:
+            types = types - {"null"}
+
         # Only one type
         if len(types) == 1:
             return next(iter(types))
 
-        numeric_types = {"integer", "float"}
+        numeric_types = {"integer", "bigint", "float"}
 
-        # Numeric promotion: integer + float → float
+        # Numeric promotion: integer + bigint → bigint, anything + float → float
         if types.issubset(numeric_types):
-            return "float"
+            return "float" if "float" in types else "bigint"
 
         # Boolean mixed with integer (common JSON ambiguity)
         if types == {"boolean", "integer"}:
             return "integer"
 
+        # Dates promote to datetimes
+        if types == {"date", "datetime"}:
+            return "datetime"
+
         # Everything else → fallback to string
         return "string"
@@ -4,9 +4,17 @@ Security abstractions for AutoRESTify.
 Defines pluggable authentication and authorization system.
 """
 
+import hashlib
+import json
+import weakref
 from abc import ABC, abstractmethod
 from typing import Any, Optional
 
+from .cache import TTLCache
+
+
+CREDENTIAL_HEADERS = ("authorization", "x-api-key", "cookie")
+
 
 # =========================================================
 # Auth Provider Interface
@@ -28,6 +36,24 @@ class AuthProvider(ABC):
         """
         pass
 
+    def credential_key(self, request: Any) -> Optional[str]:
+        """
+        Return the credential material that determines the user.
+
+        Used by SecurityManager to cache authentication results. The
+        default covers Authorization, X-API-Key and Cookie headers;
+        providers that depend on anything else must override this, or
+        return None to disable caching for the request. Requests without
+        any of these headers are not cached.
+        """
+        headers = getattr(request, "headers", None)
+        if headers is None:
+            return None
+        values = [headers.get(name, "") for name in CREDENTIAL_HEADERS]
+        if not any(values):
+            return None
+        return "\n".join(values)
+
 
 # =========================================================
 # Access Policy Interface
@@ -50,6 +76,12 @@ class AccessPolicy(ABC):
     def can_delete(self, user: Any, resource: str) -> bool:
         pass
 
+    def can_admin(self, user: Any) -> bool:
+        """
+        Allow operational features such as request profiling.
+        """
+        return False
+
 
 # =========================================================
 # Default Implementations
@@ -78,6 +110,9 @@ class AllowAllPolicy(AccessPolicy):
     def can_delete(self, user: Any, resource: str) -> bool:
         return True
 
+    def can_admin(self, user: Any) -> bool:
+        return True
+
 
 # =========================================================
 # Security Manager
@@ -86,31 +121,169 @@ class AllowAllPolicy(AccessPolicy):
 class SecurityManager:
     """
     Central security orchestrator.
+
+    With `cache_ttl > 0`, authentication results are memoized by credential
+    fingerprint and authorization decisions by (principal, resource,
+    action), both in bounded LRU caches. Use `revoke_credential`,
+    `invalidate_principal`, `invalidate_resource` or `clear_cache` when
+    credentials or policies change.
     """
 
     def __init__(
         self,
         auth_provider: Optional[AuthProvider] = None,
         access_policy: Optional[AccessPolicy] = None,
+        cache_ttl: float = 0.0,
+        cache_size: int = 1024,
     ) -> None:
 
         self.auth_provider = auth_provider or NoAuthProvider()
         self.access_policy = access_policy or AllowAllPolicy()
 
+        self.cache_enabled = cache_ttl > 0
+        self._auth_cache = TTLCache(max_size=cache_size, ttl=cache_ttl)
+        self._decision_cache = TTLCache(max_size=cache_size * 4, ttl=cache_ttl)
+        # Principals of users without an identifier, keyed by credential
+        self._credential_principals: "weakref.WeakKeyDictionary[Any, str]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    # ----------------------------------
+    # Authentication
+    # ----------------------------------
+
     async def authenticate(self, request: Any) -> Any:
+        credential = self.auth_provider.credential_key(request)
+        fingerprint = None if credential is None else self._fingerprint(credential)
+
+        if self.cache_enabled and fingerprint is not None:
+            cached = self._auth_cache.get(fingerprint)
+            if cached is not None:
+                return cached[1]
+
         user = await self.auth_provider.authenticate(request)
         if user is None:
             raise PermissionError("Authentication failed")
+
+        if fingerprint is not None and self._identify(user) is None:
+            try:
+                self._credential_principals[user] = f"credential:{fingerprint}"
+            except TypeError:
+                pass  # Not weakly referenceable; principal_id will raise
+
+        if self.cache_enabled and fingerprint is not None:
+            self._auth_cache.set(fingerprint, (self.principal_id(user), user))
+
         return user
 
+    def principal_id(self, user: Any) -> str:
+        """
+        Stable identifier for a user object, used as a cache and quota key.
+
+        Objects without an `id`, `sub`, `user_id` or `username` are keyed by
+        the credential they were authenticated with; a TypeError is raised
+        when there is none.
+        """
+
+        principal = self._identify(user)
+        if principal is not None:
+            return principal
+
+        try:
+            principal = self._credential_principals.get(user)
+        except TypeError:
+            principal = None
+
+        if principal is None:
+            raise TypeError(
+                f"Cannot derive a stable principal for {type(user).__name__}; "
+                "return users with an id, sub, user_id or username"
+            )
+        return principal
+
+    # ----------------------------------
+    # Authorization
+    # ----------------------------------
+
     def authorize_read(self, user: Any, resource: str) -> None:
-        if not self.access_policy.can_read(user, resource):
+        if not self._decide(user, resource, "read", self.access_policy.can_read):
             raise PermissionError("Read access denied")
 
     def authorize_write(self, user: Any, resource: str) -> None:
-        if not self.access_policy.can_write(user, resource):
+        if not self._decide(user, resource, "write", self.access_policy.can_write):
             raise PermissionError("Write access denied")
 
     def authorize_delete(self, user: Any, resource: str) -> None:
-        if not self.access_policy.can_delete(user, resource):
+        if not self._decide(user, resource, "delete", self.access_policy.can_delete):
             raise PermissionError("Delete access denied")
+
+    def authorize_admin(self, user: Any) -> None:
+        if not self._decide(
+            user, "", "admin", lambda u, _: self.access_policy.can_admin(u)
+        ):
+            raise PermissionError("Admin access denied")
+
+    # ----------------------------------
+    # Cache Invalidation
+    # ----------------------------------
+
+    def revoke_credential(self, credential: str) -> None:
+        """
+        Forget the cached user for a credential (as returned by
+        `AuthProvider.credential_key`).
+        """
+        self._auth_cache.pop(self._fingerprint(credential))
+
+    def invalidate_principal(self, user: Any) -> None:
+        """
+        Forget every cached authentication and decision for a user.
+        """
+        principal = self.principal_id(user)
+        self._auth_cache.discard_where(lambda _, value: value[0] == principal)
+        self._decision_cache.discard_where(lambda key, _: key[0] == principal)
+
+    def invalidate_resource(self, resource: str) -> None:
+        """
+        Forget cached decisions for a resource, e.g. after a policy change.
+        """
+        self._decision_cache.discard_where(lambda key, _: key[1] == resource)
+
+    def clear_cache(self) -> None:
+        self._auth_cache.clear()
+        self._decision_cache.clear()
+
+    # ----------------------------------
+    # Internal Utilities
+    # ----------------------------------
+
+    def _decide(self, user: Any, resource: str, action: str, check) -> bool:
+        if not self.cache_enabled:
+            return check(user, resource)
+
+        key = (self.principal_id(user), resource, action)
+        allowed = self._decision_cache.get(key)
+
+        if allowed is None:
+            allowed = bool(check(user, resource))
+            self._decision_cache.set(key, allowed)
+
+        return allowed
+
+    @staticmethod
+    def _identify(user: Any) -> Optional[str]:
+        for attr in ("id", "sub", "user_id", "username"):
+            if isinstance(user, dict):
+                value = user.get(attr)
+            else:
+                value = getattr(user, attr, None)
+            if value is not None:
+                return f"{attr}:{value}"
+
+        if isinstance(user, dict):
+            return json.dumps(user, sort_keys=True, default=str)
+
+        return None
+
+    @staticmethod
+    def _fingerprint(credential: str) -> str:
+        return hashlib.sha256(credential.encode("utf-8")).hexdigest()
@@ -4,17 +4,19 @@ This module allows running the API server directly using:
 
     python -m autorestify.main
 
-It uses the default application factory.
+It uses the default application factory, configured from AUTORESTIFY_*
+environment variables (see `autorestify.cli`). For production use
+`autorestify serve`.
 """
 
-import uvicorn
-from autorestify.api.app_factory import create_app
+from autorestify.cli import APP_FACTORY
 
 
 def run(
     host: str = "127.0.0.1",
     port: int = 8000,
-    reload: bool = True,
+    reload: bool = False,
+    workers: int = 1,
 ) -> None:
     """
     Run the AutoRESTify server.
@@ -22,15 +24,18 @@ def run(
     Args:
         host: Server host
         port: Server port
-        reload: Enable auto-reload (development only)
+        reload: Enable auto-reload (development only, single worker)
+        workers: Number of worker processes
     """
-    app = create_app()
+    import uvicorn
 
     uvicorn.run(
-        app,
+        APP_FACTORY,
+        factory=True,
         host=host,
         port=port,
         reload=reload,
+        workers=None if reload else workers,
     )
 
 
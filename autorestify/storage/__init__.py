@@ -2,6 +2,17 @@
 Storage layer for AutoRESTify.
 """
 
-from .base import Database
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .base import Database
+
+_EXPORTS = {
+    "Database": ".base",
+}
 
 __all__ = ["Database"]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,149 @@
+"""
+Storage backends for AutoRESTify.
+
+SQL is the store of record for every collection. A backend selected with
+the `storage` collection option serves reads from another tier; writes
+always go to SQL first and the repository then hands the written rows to
+the backend.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+# Loader streaming a collection's records in id order
+Loader = Callable[[], Iterable[List[Dict[str, Any]]]]
+
+
+# =========================================================
+# Backend Interface
+# =========================================================
+
+class StorageBackend(ABC):
+    """
+    Read tier of one collection.
+
+    Args:
+        columns: Record keys, in order
+        load: Reads every record of the collection from SQL
+    """
+
+    def __init__(self, columns: List[str], load: Loader) -> None:
+        self.columns = columns
+        self.load = load
+
+    @abstractmethod
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Record by id, or None.
+        """
+
+    @abstractmethod
+    def list(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        First `limit` records in id order.
+        """
+
+    @abstractmethod
+    def put(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Store records just inserted or updated in SQL.
+        """
+
+    @abstractmethod
+    def remove(self, ids: Iterable[int]) -> None:
+        """
+        Forget records deleted from SQL.
+        """
+
+    def invalidate(self) -> None:
+        """
+        Drop cached state; it is reloaded from SQL on the next read.
+        """
+
+
+# =========================================================
+# Memory Backend
+# =========================================================
+
+class MemoryBackend(StorageBackend):
+    """
+    Whole collection held in process as an id → tuple dict.
+
+    Loaded from SQL on first read. Writes copy the dict and swap it in, so
+    readers never see a half-applied change; this suits small collections
+    that are read far more often than written.
+    """
+
+    def __init__(self, columns: List[str], load: Loader) -> None:
+        super().__init__(columns, load)
+        self._rows: Optional[Dict[int, tuple]] = None
+        self._lock = threading.Lock()
+
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        values = self._table().get(item_id)
+        if values is None:
+            return None
+        return dict(zip(self.columns, values))
+
+    def list(self, limit: int) -> List[Dict[str, Any]]:
+        columns = self.columns
+        return [
+            dict(zip(columns, values))
+            for values in islice(self._table().values(), limit)
+        ]
+
+    def put(self, rows: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            if self._rows is None:
+                return  # Not loaded yet: the load will read them
+            table = dict(self._rows)
+            last = next(reversed(table), 0)
+            ordered = True
+            for row in rows:
+                item_id = row["id"]
+                if item_id not in table:
+                    ordered = ordered and item_id > last
+                    last = max(last, item_id)
+                table[item_id] = self._pack(row)
+            self._rows = table if ordered else dict(sorted(table.items()))
+
+    def remove(self, ids: Iterable[int]) -> None:
+        with self._lock:
+            if self._rows is None:
+                return
+            table = dict(self._rows)
+            for item_id in ids:
+                table.pop(item_id, None)
+            self._rows = table
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._rows = None
+
+    # ----------------------------------
+    # Internal Utilities
+    # ----------------------------------
+
+    def _pack(self, row: Dict[str, Any]) -> tuple:
+        return tuple(row.get(column) for column in self.columns)
+
+    def _table(self) -> Dict[int, tuple]:
+        rows = self._rows
+        if rows is not None:
+            return rows
+
+        with self._lock:
+            if self._rows is None:
+                self._rows = {
+                    row["id"]: self._pack(row) for batch in self.load() for row in batch
+                }
+            return self._rows
+
+
+# Backends selectable with the `storage` option ("sql" is the default)
+BACKENDS: Dict[str, Callable[[List[str], Loader], StorageBackend]] = {
+    "memory": MemoryBackend,
+}
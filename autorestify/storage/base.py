@@ -8,12 +8,16 @@ Responsible for:
 - Proper SQLite in-memory handling for tests
 """
 
-from typing import Generator
-from sqlalchemy import create_engine
+import weakref
+from typing import TYPE_CHECKING, Generator, List
+from sqlalchemy import MetaData, create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.engine import Engine
 from sqlalchemy.pool import StaticPool
 
+if TYPE_CHECKING:
+    from .dynamic_models import DynamicModelFactory
+
 
 Base = declarative_base()
 
@@ -57,21 +61,41 @@ class Database:
             expire_on_commit=False,
         )
 
+        # Collection models live in per-collection MetaData, not Base
+        self._model_factories: "weakref.WeakSet[DynamicModelFactory]" = (
+            weakref.WeakSet()
+        )
+
     # ----------------------------------
     # Public Methods
     # ----------------------------------
 
+    def register_models(self, factory: "DynamicModelFactory") -> None:
+        """
+        Include the collections built by a model factory in create_all
+        and drop_all.
+        """
+        self._model_factories.add(factory)
+
     def create_all(self) -> None:
         """
         Create all registered tables.
         """
-        Base.metadata.create_all(self.engine)
+        for metadata in self._metadata():
+            metadata.create_all(self.engine)
 
     def drop_all(self) -> None:
         """
         Drop all tables (useful for testing).
         """
-        Base.metadata.drop_all(self.engine)
+        for metadata in self._metadata():
+            metadata.drop_all(self.engine)
+
+    def _metadata(self) -> List[MetaData]:
+        metadata = [Base.metadata]
+        for factory in list(self._model_factories):
+            metadata.extend(factory.metadata())
+        return metadata
 
     def get_session(self) -> Generator:
         """
@@ -0,0 +1,95 @@
+"""
+Statement deadlines for AutoRESTify.
+
+Hooks SQLAlchemy engine events so statements run under the current
+request Deadline stop when it expires or is cancelled:
+- SQLite: a progress handler, armed on connections used under a deadline
+  until they return to the pool, aborts the running statement (fetches
+  included)
+- PostgreSQL: `SET LOCAL statement_timeout` plus `cancel()` on disconnect
+"""
+
+import weakref
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from autorestify.core.deadlines import DeadlineExceeded, current_deadline
+
+
+# SQLite VM instructions between deadline checks
+PROGRESS_INTERVAL = 1000
+
+_ARMED_KEY = "autorestify_progress_handler"
+
+_installed: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+def _sqlite_progress() -> int:
+    # Runs on the thread executing the statement, so the context applies
+    deadline = current_deadline.get()
+    return 1 if deadline is not None and deadline.expired() else 0
+
+
+def install_deadlines(engine: Engine) -> None:
+    """
+    Enforce `current_deadline` on statements run through `engine`.
+
+    Calling this twice for the same engine is a no-op.
+    """
+
+    if engine in _installed:
+        return
+    _installed.add(engine)
+
+    dialect = engine.dialect.name
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        deadline = current_deadline.get()
+        if deadline is None:
+            return
+
+        deadline.check()
+        record = conn.connection
+
+        # Armed until the connection returns to the pool, so fetches after
+        # the statement are covered and other work pays no callback
+        if dialect == "sqlite" and not record.info.get(_ARMED_KEY):
+            record.dbapi_connection.set_progress_handler(
+                _sqlite_progress, PROGRESS_INTERVAL
+            )
+            record.info[_ARMED_KEY] = True
+
+        if dialect == "postgresql":
+            remaining = deadline.remaining()
+            if remaining is not None:
+                cursor.execute(
+                    f"SET LOCAL statement_timeout = {max(1, int(remaining * 1000))}"
+                )
+            dbapi_connection = record.dbapi_connection
+            deadline.add_interrupt(id(dbapi_connection), dbapi_connection.cancel)
+
+    @event.listens_for(engine, "checkin")
+    def _disarm(dbapi_connection: Any, connection_record: Any) -> None:
+        if connection_record.info.pop(_ARMED_KEY, False) and dbapi_connection:
+            dbapi_connection.set_progress_handler(None, 0)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        _release(conn)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context: Any) -> None:
+        if context.connection is not None:
+            _release(context.connection)
+
+        deadline = current_deadline.get()
+        if deadline is not None and deadline.expired():
+            raise DeadlineExceeded(deadline.reason) from context.original_exception
+
+    def _release(conn: Any) -> None:
+        deadline = current_deadline.get()
+        if deadline is not None and dialect == "postgresql":
+            deadline.remove_interrupt(id(conn.connection.dbapi_connection))
@@ -0,0 +1,272 @@
+"""
+Collection catalog for AutoRESTify.
+
+Persists each collection's inferred schema, options and version in the
+database so models can be rebuilt after a restart. A single generation
+counter, bumped with every change, lets other processes detect that
+something changed with one primary-key lookup.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    select,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import func
+
+from .base import Database
+
+
+CATALOG_TABLE = "_autorestify_collections"
+CATALOG_STATE_TABLE = "_autorestify_catalog_state"
+DATA_VERSIONS_TABLE = "_autorestify_data_versions"
+
+
+class CatalogConflict(Exception):
+    """
+    The collection was saved by someone else since it was read.
+    """
+
+
+@dataclass
+class CatalogEntry:
+    """
+    Registered collection definition.
+    """
+
+    name: str
+    schema: Dict[str, Any]
+    options: Dict[str, Any] = field(default_factory=dict)
+    version: int = 1
+
+
+class Catalog:
+    """
+    Database-backed registry of collection schemas.
+    """
+
+    def __init__(self, database: Database) -> None:
+        self.database = database
+        self.metadata = MetaData()
+        self.table = Table(
+            CATALOG_TABLE,
+            self.metadata,
+            Column("name", String(255), primary_key=True),
+            Column("schema", JSON, nullable=False),
+            Column("options", JSON, nullable=False),
+            Column("version", Integer, nullable=False),
+            Column(
+                "updated_at",
+                DateTime(timezone=True),
+                server_default=func.now(),
+                onupdate=func.now(),
+            ),
+        )
+        self.state = Table(
+            CATALOG_STATE_TABLE,
+            self.metadata,
+            Column("id", Integer, primary_key=True),
+            Column("generation", Integer, nullable=False),
+        )
+        # Counts writes to collections served by a storage backend, apart
+        # from the schema version so data changes never rebuild models
+        self.data = Table(
+            DATA_VERSIONS_TABLE,
+            self.metadata,
+            Column("name", String(255), primary_key=True),
+            Column("version", Integer, nullable=False),
+        )
+
+    # ----------------------------------
+    # Public API
+    # ----------------------------------
+
+    def create(self) -> None:
+        """
+        Create the catalog tables if missing.
+        """
+        self.metadata.create_all(self.database.engine)
+
+        try:
+            with self.database.engine.begin() as conn:
+                if conn.execute(select(self.state.c.id)).first() is None:
+                    conn.execute(self.state.insert().values(id=1, generation=0))
+        except IntegrityError:
+            pass  # Another process initialized it concurrently
+
+    def generation(self) -> int:
+        """
+        Counter incremented by every catalog change.
+        """
+        with self.database.engine.connect() as conn:
+            value = conn.execute(
+                select(self.state.c.generation).where(self.state.c.id == 1)
+            ).scalar()
+        return value or 0
+
+    def versions(self) -> Dict[str, int]:
+        """
+        Current version of every collection.
+        """
+        with self.database.engine.connect() as conn:
+            rows = conn.execute(select(self.table.c.name, self.table.c.version))
+            return {row.name: row.version for row in rows}
+
+    def get(self, name: str) -> Optional[CatalogEntry]:
+        with self.database.engine.connect() as conn:
+            row = conn.execute(
+                select(self.table).where(self.table.c.name == name)
+            ).first()
+        return self._entry(row) if row else None
+
+    def all(self) -> List[CatalogEntry]:
+        with self.database.engine.connect() as conn:
+            rows = conn.execute(select(self.table).order_by(self.table.c.name))
+            return [self._entry(row) for row in rows]
+
+    def save(
+        self,
+        name: str,
+        schema: Dict[str, Any],
+        options: Optional[Dict[str, Any]] = None,
+        expected_version: Optional[int] = None,
+    ) -> CatalogEntry:
+        """
+        Insert or update a collection definition, bumping its version.
+
+        Args:
+            expected_version: Version the definition was derived from (0 for
+                a new collection). When given, the save is refused if the
+                stored version differs, so concurrent changes are not lost.
+
+        Raises:
+            CatalogConflict: The stored version is not `expected_version`
+        """
+
+        table = self.table
+
+        with self.database.engine.begin() as conn:
+            conn.execute(
+                self.state.update()
+                .where(self.state.c.id == 1)
+                .values(generation=self.state.c.generation + 1)
+            )
+
+            # Read after the generation update, which holds the write lock
+            row = conn.execute(
+                select(table.c.version, table.c.options).where(table.c.name == name)
+            ).first()
+
+            stored_version = row.version if row is not None else 0
+            if expected_version is not None and stored_version != expected_version:
+                raise CatalogConflict(
+                    f"Collection '{name}' changed concurrently "
+                    f"(version {stored_version}, expected {expected_version})"
+                )
+
+            # Saves are serialized by the generation update, so the data
+            # version row is created without racing another save
+            if conn.execute(
+                select(self.data.c.name).where(self.data.c.name == name)
+            ).first() is None:
+                conn.execute(self.data.insert().values(name=name, version=0))
+
+            if row is None:
+                entry = CatalogEntry(name, schema, options or {}, 1)
+                conn.execute(
+                    table.insert().values(
+                        name=name,
+                        schema=schema,
+                        options=entry.options,
+                        version=entry.version,
+                    )
+                )
+                return entry
+
+            merged_options = {**(row.options or {}), **(options or {})}
+            entry = CatalogEntry(name, schema, merged_options, row.version + 1)
+            conn.execute(
+                table.update()
+                .where(table.c.name == name)
+                .values(schema=schema, options=merged_options, version=entry.version)
+            )
+            return entry
+
+    def bump(self, name: str) -> int:
+        """
+        Bump a collection's version without changing its definition, so
+        other processes reload it (e.g. after its tables changed).
+
+        Returns:
+            The new version
+        """
+
+        table = self.table
+
+        with self.database.engine.begin() as conn:
+            conn.execute(
+                self.state.update()
+                .where(self.state.c.id == 1)
+                .values(generation=self.state.c.generation + 1)
+            )
+            conn.execute(
+                table.update()
+                .where(table.c.name == name)
+                .values(version=table.c.version + 1)
+            )
+            return conn.execute(
+                select(table.c.version).where(table.c.name == name)
+            ).scalar()
+
+    def data_version(self, name: str) -> int:
+        """
+        Number of writes recorded for a collection with `touch`.
+        """
+        with self.database.engine.connect() as conn:
+            value = conn.execute(
+                select(self.data.c.version).where(self.data.c.name == name)
+            ).scalar()
+        return value or 0
+
+    def touch(self, conn: Any, name: str) -> int:
+        """
+        Record a write to a collection, inside the writer's transaction.
+
+        Unlike `bump`, this leaves the schema version and the generation
+        alone: other processes only refresh the collection's data.
+
+        Returns:
+            The new data version
+        """
+
+        data = self.data
+        conn.execute(
+            data.update()
+            .where(data.c.name == name)
+            .values(version=data.c.version + 1)
+        )
+        return conn.execute(
+            select(data.c.version).where(data.c.name == name)
+        ).scalar() or 0
+
+    # ----------------------------------
+    # Internal Utilities
+    # ----------------------------------
+
+    @staticmethod
+    def _entry(row: Any) -> CatalogEntry:
+        return CatalogEntry(
+            name=row.name,
+            schema=row.schema,
+            options=row.options or {},
+            version=row.version,
+        )
@@ -0,0 +1,158 @@
+"""
+Compact column types for AutoRESTify.
+
+Used for the rich types inferred when `rich_types` is enabled. PostgreSQL
+gets its native types; SQLite stores fixed-size binary or integer values
+instead of text, so rows stay small and ranges compare numerically.
+"""
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Tuple
+
+from sqlalchemy import BigInteger, Date, DateTime, Integer, LargeBinary
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import TypeDecorator
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class CompactUUID(TypeDecorator):
+    """
+    UUID stored as 16 raw bytes, or as a native UUID on PostgreSQL.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Any) -> Any:
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Any:
+        if value is None:
+            return None
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        return value if dialect.name == "postgresql" else value.bytes
+
+    def process_result_value(self, value: Any, dialect: Any) -> Any:
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        return uuid.UUID(bytes=bytes(value))
+
+
+class CompactDateTime(TypeDecorator):
+    """
+    Timezone-aware timestamp; naive values are taken as UTC.
+
+    SQLite stores microseconds since the Unix epoch as an integer.
+    Values are returned as aware UTC datetimes.
+    """
+
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Any) -> Any:
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(BigInteger())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Any:
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        if dialect.name != "sqlite":
+            return value
+        return (value - _EPOCH) // timedelta(microseconds=1)
+
+    def process_result_value(self, value: Any, dialect: Any) -> Any:
+        if value is None:
+            return None
+        if isinstance(value, int):
+            return _EPOCH + timedelta(microseconds=value)
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+
+class CompactDate(TypeDecorator):
+    """
+    Calendar date; SQLite stores days since the Unix epoch as an integer.
+    """
+
+    impl = Date
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Any) -> Any:
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(Integer())
+        return dialect.type_descriptor(Date())
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Any:
+        if value is None or dialect.name != "sqlite":
+            return value
+        return value.toordinal() - _EPOCH_ORDINAL
+
+    def process_result_value(self, value: Any, dialect: Any) -> Any:
+        if isinstance(value, int):
+            return date.fromordinal(value + _EPOCH_ORDINAL)
+        return value
+
+
+# =========================================================
+# SQLite Conversions
+# =========================================================
+
+def _uuid_to_text(column: str) -> str:
+    digits = f"lower(hex({column}))"
+    return " || '-' || ".join(
+        f"substr({digits}, {start}, {length})"
+        for start, length in ((1, 8), (9, 4), (13, 4), (17, 4), (21, 12))
+    )
+
+
+def _date_to_datetime(column: str) -> str:
+    return f"{column} * 86400000000"
+
+
+def _date_to_text(column: str) -> str:
+    return f"date({column} * 86400, 'unixepoch')"
+
+
+def _datetime_to_text(column: str) -> str:
+    return f"strftime('%Y-%m-%dT%H:%M:%fZ', {column} / 1000000.0, 'unixepoch')"
+
+
+def _number_to_text(column: str) -> str:
+    return f"CAST({column} AS TEXT)"
+
+
+def _boolean_to_text(column: str) -> str:
+    return f"CASE {column} WHEN 1 THEN 'true' WHEN 0 THEN 'false' END"
+
+
+# Rewrites of compact values when a column widens, keyed by
+# (old type, new type) → (SQL expression builder, SQLite storage class).
+SQLITE_WIDENING: Dict[Tuple[str, str], Tuple[Callable[[str], str], str]] = {
+    ("uuid", "string"): (_uuid_to_text, "blob"),
+    ("date", "datetime"): (_date_to_datetime, "integer"),
+}
+
+# Columns whose type affinity would turn text back into numbers (a string
+# "007" stored in an INTEGER column reads back as 7), including the integer
+# storage of compact dates. They are rebuilt with the new declared type,
+# converting values with these expressions; booleans become "true"/"false"
+# as on PostgreSQL and in string validation.
+SQLITE_REBUILDS: Dict[Tuple[str, str], Callable[[str], str]] = {
+    ("integer", "string"): _number_to_text,
+    ("bigint", "string"): _number_to_text,
+    ("float", "string"): _number_to_text,
+    ("boolean", "string"): _boolean_to_text,
+    ("date", "string"): _date_to_text,
+    ("datetime", "string"): _datetime_to_text,
+}
@@ -0,0 +1,93 @@
+"""
+Content-hash deduplication for AutoRESTify.
+
+Collections created with the `dedupe` option carry a uniquely indexed
+hash of each document's content. Batched inserts then skip documents
+already stored with `INSERT ... ON CONFLICT DO NOTHING`.
+"""
+
+import hashlib
+import json
+import uuid
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, Set
+
+from sqlalchemy import Table, select
+from sqlalchemy.engine import Connection
+
+
+HASH_COLUMN = "_content_hash"
+HASH_LENGTH = 32
+
+# Hashes per IN (...) lookup
+LOOKUP_BATCH = 500
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat()
+    if isinstance(value, (date, uuid.UUID)):
+        return str(value)
+    raise TypeError(f"Cannot hash {type(value).__name__}")
+
+
+def _prune(value: Any) -> Any:
+    # Null fields and empty nested objects read back the same as absent ones
+    if isinstance(value, dict):
+        pruned = ((k, _prune(v)) for k, v in value.items())
+        return {k: v for k, v in pruned if v is not None and v != {}}
+    return value
+
+
+def content_hash(document: Dict[str, Any]) -> str:
+    """
+    Stable hash of a document; key order and null fields do not matter.
+    """
+
+    encoded = json.dumps(
+        _prune(document),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_canonical,
+    )
+    return hashlib.blake2b(encoded.encode(), digest_size=HASH_LENGTH // 2).hexdigest()
+
+
+def insert_ignoring_duplicates(conn: Connection, table: Table) -> Any:
+    """
+    INSERT statement that skips rows whose content hash already exists.
+
+    Returns None on backends without ON CONFLICT support; callers then
+    filter with `existing_hashes` first.
+    """
+
+    column = table.c[HASH_COLUMN]
+
+    if conn.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+
+    return dialect_insert(table).on_conflict_do_nothing(index_elements=[column])
+
+
+def existing_hashes(conn: Connection, table: Table, hashes: Iterable[str]) -> Set[str]:
+    """
+    Subset of `hashes` already stored in the table.
+    """
+
+    column = table.c[HASH_COLUMN]
+    hashes = list(hashes)
+    found: Set[str] = set()
+
+    for start in range(0, len(hashes), LOOKUP_BATCH):
+        chunk = hashes[start : start + LOOKUP_BATCH]
+        found.update(conn.execute(select(column).where(column.in_(chunk))).scalars())
+
+    return found
+
@@ -0,0 +1,132 @@
+"""
+Slow-query diagnostics for AutoRESTify.
+
+Times every statement, attributes it to the current request trace and
+logs statements above a threshold together with their query plan.
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from autorestify.core.profiling import current_trace
+
+
+logger = logging.getLogger("autorestify.slow")
+
+_MAX_PARAMS_REPR = 512
+
+
+class SlowQueryLog:
+    """
+    Engine hooks that log statements slower than `threshold` seconds.
+
+    With `threshold=None` statements are only attributed to the request
+    trace, which the slow-request log uses to split DB and Python time.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        threshold: Optional[float] = None,
+        explain: bool = True,
+        max_entries: int = 100,
+    ) -> None:
+        self.engine = engine
+        self.threshold = threshold
+        self.explain = explain
+        self.entries: Deque[Dict[str, Any]] = deque(maxlen=max_entries)
+
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._on_error)
+
+    # ----------------------------------
+    # Engine Hooks
+    # ----------------------------------
+
+    def _before_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("autorestify_slow_start", []).append(time.perf_counter())
+
+    def _after_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        starts = conn.info.get("autorestify_slow_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+
+        trace = current_trace.get()
+        if trace is not None:
+            trace.db_seconds += elapsed
+            trace.queries += 1
+
+        if self.threshold is None or elapsed < self.threshold:
+            return
+
+        entry = {
+            "duration_ms": round(elapsed * 1000, 3),
+            "statement": statement,
+            "parameters": repr(parameters)[:_MAX_PARAMS_REPR],
+            "plan": None,
+        }
+
+        if self.explain and not executemany:
+            entry["plan"] = self._explain(conn, statement, parameters)
+
+        self.entries.append(entry)
+        if trace is not None:
+            trace.slow_queries.append(entry)
+
+        logger.warning(
+            "Slow query (%.1f ms): %s | params=%s | plan=%s",
+            entry["duration_ms"],
+            statement,
+            entry["parameters"],
+            entry["plan"],
+        )
+
+    def _on_error(self, exception_context):
+        # Failed statements never reach after_cursor_execute
+        conn = exception_context.connection
+        if conn is None or exception_context.execution_context is None:
+            return
+        starts = conn.info.get("autorestify_slow_start")
+        if starts:
+            starts.pop()
+
+    # ----------------------------------
+    # Query Plans
+    # ----------------------------------
+
+    def _explain(self, conn, statement: str, parameters: Any) -> Optional[List[str]]:
+        """
+        Run EXPLAIN for the statement on the same DBAPI connection.
+        """
+
+        dialect = conn.dialect.name
+
+        if dialect == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        elif dialect == "postgresql":
+            prefix = "EXPLAIN "
+        else:
+            return None
+
+        try:
+            cursor = conn.connection.dbapi_connection.cursor()
+            try:
+                cursor.execute(prefix + statement, parameters)
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception as exc:  # diagnostics must never break a request
+            return [f"<explain failed: {exc}>"]
+
+        return [" ".join(str(col) for col in row) for row in rows]
@@ -1,14 +1,23 @@
 """
 Dynamic model factory for AutoRESTify.
 
-Responsible for generating SQLAlchemy models dynamically
-based on inferred schema.
+Responsible for generating SQLAlchemy models and matching
+Pydantic validators dynamically based on inferred schema.
 """
 
+import json
 import re
-from typing import Any, Dict, Type
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BeforeValidator, ConfigDict, TypeAdapter, with_config
+from typing_extensions import Annotated, TypedDict
 
 from sqlalchemy import (
+    BigInteger,
     Column,
     Integer,
     String,
@@ -16,12 +25,15 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Identity,
     JSON,
+    MetaData,
 )
+from sqlalchemy.orm import registry
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
 
-from .base import Base
+from .column_types import CompactDate, CompactDateTime, CompactUUID
+from .dedup import HASH_COLUMN, HASH_LENGTH
 
 
 def _sanitize_name(name: str) -> str:
@@ -31,13 +43,88 @@ def _sanitize_name(name: str) -> str:
     return re.sub(r"[^0-9a-zA-Z]+", "_", name).strip("_").lower()
 
 
+def _type_name(*parts: str) -> str:
+    """
+    Build a PascalCase schema name, e.g. ("clientes", "address") → ClientesAddress.
+    """
+    words = re.split(r"[^0-9a-zA-Z]+", "_".join(parts))
+    return "".join(word.capitalize() for word in words if word)
+
+
+def _coerce_text(value: Any) -> Any:
+    """
+    Accept JSON scalars in string fields (type conflicts resolve to string).
+    """
+    if isinstance(value, (bool, int, float)):
+        return json.dumps(value)
+    return value
+
+
+Text = Annotated[str, BeforeValidator(_coerce_text)]
+
+# 64-bit ids for partition tables (INTEGER keeps the SQLite rowid alias)
+WideId = BigInteger().with_variant(Integer, "sqlite")
+
+_PYTHON_TYPES: Dict[str, Any] = {
+    "integer": int,
+    "bigint": int,
+    "float": float,
+    "boolean": bool,
+    "array": List[Any],
+    "datetime": datetime,
+    "date": date,
+    "uuid": uuid.UUID,
+}
+
+
+@dataclass(frozen=True)
+class CollectionTypes:
+    """
+    Pydantic validators and serializers generated for one collection.
+    """
+
+    input: TypeAdapter
+    record: TypeAdapter
+    records: TypeAdapter
+    input_type: Any
+    record_type: Any
+
+
+@dataclass(frozen=True)
+class CollectionModels:
+    """
+    Models and validators of one version of a collection.
+
+    Built completely before being published, then swapped into the
+    registry in a single assignment, so readers see either the old
+    version or the new one, never a mix.
+    """
+
+    model: Type[Any]
+    children: Dict[str, Type[Any]]
+    types: CollectionTypes
+    schema: Dict[str, Any]
+    layout: Tuple[bool, bool]
+    base: Type[Any]
+    version: int
+    partitions: Dict[str, Tuple[Type[Any], Dict[str, Type[Any]]]]
+
+
 class DynamicModelFactory:
     """
     Factory for creating dynamic SQLAlchemy models from schema.
+
+    Every collection version is mapped in its own registry and MetaData, so
+    it can be rebuilt when its schema evolves and different collections
+    can be built concurrently without sharing mutable state. Callers
+    serialize builds of the same collection.
     """
 
     def __init__(self) -> None:
-        self._models: Dict[str, Type[Base]] = {}
+        self._collections: Dict[str, CollectionModels] = {}
+        self._partition_lock = threading.Lock()
+        self._version_lock = threading.Lock()
+        self.version = 0
 
     # ----------------------------------
     # Public API
@@ -47,39 +134,182 @@ class DynamicModelFactory:
         self,
         table_name: str,
         schema: Dict[str, Any],
-    ) -> Dict[str, Type[Base]]:
+        version: Optional[int] = None,
+        dedupe: bool = False,
+        index_created_at: bool = False,
+    ) -> Dict[str, Type[Any]]:
         """
         Create main and nested models from schema.
 
+        If the collection is already registered with a different schema,
+        its models are rebuilt; existing tables are not touched. With
+        `dedupe`, the main table gets a uniquely indexed content hash;
+        `index_created_at` indexes its creation time (used by TTL expiry).
+
         Returns:
             Dict of created models (table_name → model class)
         """
 
         main_table = _sanitize_name(table_name)
 
-        if main_table in self._models:
-            return self._models
+        layout = (dedupe, index_created_at)
 
-        models_created: Dict[str, Type[Base]] = {}
+        current = self._collections.get(main_table)
+        if current is not None and (current.schema, current.layout) == (schema, layout):
+            return self.get_tables(main_table)
+
+        base = registry(metadata=MetaData()).generate_base()
 
         # Create main model
-        main_model = self._create_main_model(main_table, schema)
-        models_created[main_table] = main_model
+        main_model = self._create_main_model(main_table, schema, base, *layout)
 
         # Create nested models
-        for field, field_type in schema.items():
+        children: Dict[str, Type[Any]] = {}
+        for field_name, field_type in schema.items():
             if isinstance(field_type, dict):
-                child_table = f"{main_table}__{_sanitize_name(field)}"
-                child_model = self._create_child_model(
-                    child_table,
+                children[field_name] = self._create_child_model(
+                    f"{main_table}__{_sanitize_name(field_name)}",
                     main_table,
                     field_type,
+                    base,
+                )
+
+        if version is None:
+            version = current.version + 1 if current is not None else 1
+
+        self._collections[main_table] = CollectionModels(
+            model=main_model,
+            children=children,
+            types=self._create_types(main_table, schema),
+            schema=schema,
+            layout=layout,
+            base=base,
+            version=version,
+            partitions={},
+        )
+        with self._version_lock:
+            self.version += 1
+
+        return self.get_tables(main_table)
+
+    def get_collection(self, table_name: str) -> Optional[CollectionModels]:
+        """
+        Current models of a collection, if registered.
+        """
+        return self._collections.get(table_name)
+
+    def get_schema(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Registered schema of a main table.
+        """
+        current = self._collections.get(table_name)
+        return current.schema if current is not None else None
+
+    def get_version(self, table_name: str) -> int:
+        """
+        Schema version of a main table (0 if unregistered).
+        """
+        current = self._collections.get(table_name)
+        return current.version if current is not None else 0
+
+    def get_tables(self, table_name: str) -> Dict[str, Type[Any]]:
+        """
+        Main and child models of a collection (table_name → model class).
+        """
+        current = self._collections.get(table_name)
+        if current is None:
+            return {}
+        return {
+            model.__tablename__: model
+            for model in (current.model, *current.children.values())
+        }
+
+    def get_partition(
+        self,
+        table_name: str,
+        partition: str,
+        start_id: int,
+    ) -> Tuple[Type[Any], Dict[str, Type[Any]]]:
+        """
+        Main model and nested field → child model of one partition table.
+
+        Partitions mirror the collection's tables under the `partition`
+        name; their ids start after `start_id`. Models are built on first
+        use and dropped when the collection is rebuilt.
+        """
+
+        current = self._collections[table_name]
+
+        with self._partition_lock:
+            partitions = current.partitions
+            if partition in partitions:
+                return partitions[partition]
+
+            schema = current.schema
+            base = current.base
+            _, index_created_at = current.layout
+
+            main_model = self._create_main_model(
+                partition, schema, base, False, index_created_at, start_id
+            )
+            children = {
+                field_name: self._create_child_model(
+                    f"{partition}__{_sanitize_name(field_name)}",
+                    partition,
+                    field_type,
+                    base,
+                    WideId,
                 )
-                models_created[child_table] = child_model
+                for field_name, field_type in schema.items()
+                if isinstance(field_type, dict)
+            }
+
+            partitions[partition] = (main_model, children)
+            return partitions[partition]
+
+    def forget_partition(self, table_name: str, partition: str) -> None:
+        """
+        Drop a partition's models after its tables were dropped.
+        """
+
+        current = self._collections.get(table_name)
+        if current is None:
+            return
+
+        with self._partition_lock:
+            models = current.partitions.pop(partition, None)
+            if models is None:
+                return
+            main_model, children = models
+            for model in (main_model, *children.values()):
+                current.base.metadata.remove(model.__table__)
+
+    def get_children(self, table_name: str) -> Dict[str, Type[Any]]:
+        """
+        Nested field name → child model for a main table.
+        """
+        current = self._collections.get(table_name)
+        return current.children if current is not None else {}
+
+    def collections(self) -> List[str]:
+        """
+        Names of registered main tables.
+        """
+        return list(self._collections)
 
-        self._models.update(models_created)
+    def metadata(self) -> List[MetaData]:
+        """
+        MetaData of the current models of every collection, partitions
+        included.
+        """
+        return [current.base.metadata for current in list(self._collections.values())]
 
-        return models_created
+    def get_types(self, table_name: str) -> Optional[CollectionTypes]:
+        """
+        Pydantic validators for a main table, if registered.
+        """
+        current = self._collections.get(table_name)
+        return current.types if current is not None else None
 
     # ----------------------------------
     # Internal Methods
@@ -89,14 +319,32 @@ class DynamicModelFactory:
         self,
         table_name: str,
         schema: Dict[str, Any],
-    ) -> Type[Base]:
+        base: Type[Any],
+        dedupe: bool = False,
+        index_created_at: bool = False,
+        start_id: Optional[int] = None,
+    ) -> Type[Any]:
 
         attrs = {
             "__tablename__": table_name,
             "id": Column(Integer, primary_key=True, autoincrement=True),
-            "created_at": Column(DateTime(timezone=True), server_default=func.now()),
+            "created_at": Column(
+                DateTime(timezone=True),
+                server_default=func.now(),
+                index=index_created_at,
+            ),
         }
 
+        if start_id is not None:
+            attrs["id"] = Column(WideId, Identity(start=start_id + 1), primary_key=True)
+            # SQLite continues from the sqlite_sequence entry seeded on creation
+            attrs["__table_args__"] = {"sqlite_autoincrement": True}
+
+        if dedupe:
+            attrs[HASH_COLUMN] = Column(
+                String(HASH_LENGTH), nullable=True, unique=True, index=True
+            )
+
         for field, field_type in schema.items():
             if isinstance(field_type, dict):
                 continue  # nested handled separately
@@ -104,7 +352,7 @@ class DynamicModelFactory:
             column = self._map_type_to_column(field_type)
             attrs[field] = column
 
-        model = type(f"{table_name.capitalize()}Model", (Base,), attrs)
+        model = type(f"{table_name.capitalize()}Model", (base,), attrs)
         return model
 
     def _create_child_model(
@@ -112,13 +360,15 @@ class DynamicModelFactory:
         table_name: str,
         parent_table: str,
         schema: Dict[str, Any],
-    ) -> Type[Base]:
+        base: Type[Any],
+        parent_id_type: Any = Integer,
+    ) -> Type[Any]:
 
         attrs = {
             "__tablename__": table_name,
             "id": Column(Integer, primary_key=True, autoincrement=True),
             "parent_id": Column(
-                Integer,
+                parent_id_type,
                 ForeignKey(f"{parent_table}.id"),
                 nullable=False,
             ),
@@ -131,9 +381,80 @@ class DynamicModelFactory:
             else:
                 attrs[field] = self._map_type_to_column(field_type)
 
-        model = type(f"{table_name.capitalize()}Model", (Base,), attrs)
+        model = type(f"{table_name.capitalize()}Model", (base,), attrs)
         return model
 
+    def _create_types(
+        self,
+        table_name: str,
+        schema: Dict[str, Any],
+    ) -> CollectionTypes:
+        """
+        Build input (extra fields forbidden, all keys optional) and record
+        TypedDicts; validation and JSON encoding then run in pydantic-core.
+        """
+
+        input_type = self._typed_dict((table_name,), schema, "input", True)
+
+        record_fields: Dict[str, Any] = {
+            "id": int,
+            "created_at": Optional[datetime],
+        }
+        for field, field_type in schema.items():
+            if isinstance(field_type, dict):
+                nested = self._typed_dict(
+                    (table_name, field), field_type, "record", False
+                )
+                record_fields[field] = Optional[nested]
+            else:
+                record_fields[field] = Optional[self._map_type_to_python(field_type)]
+
+        record_type = TypedDict(
+            _type_name(table_name, "record"),
+            record_fields,
+            total=False,
+        )
+
+        return CollectionTypes(
+            input=TypeAdapter(input_type),
+            record=TypeAdapter(record_type),
+            records=TypeAdapter(List[record_type]),
+            input_type=input_type,
+            record_type=record_type,
+        )
+
+    def _typed_dict(
+        self,
+        path: tuple,
+        schema: Dict[str, Any],
+        suffix: str,
+        forbid_extra: bool,
+    ) -> Any:
+
+        fields: Dict[str, Any] = {}
+
+        for field, field_type in schema.items():
+            if isinstance(field_type, dict):
+                nested = self._typed_dict(
+                    path + (field,), field_type, suffix, forbid_extra
+                )
+                fields[field] = Optional[nested]
+            else:
+                fields[field] = Optional[self._map_type_to_python(field_type)]
+
+        typed_dict = TypedDict(_type_name(*path, suffix), fields, total=False)
+
+        if forbid_extra:
+            typed_dict = with_config(ConfigDict(extra="forbid"))(typed_dict)
+
+        return typed_dict
+
+    def _map_type_to_python(self, field_type: str) -> Any:
+        """
+        Map internal type to the Python type used for validation.
+        """
+        return _PYTHON_TYPES.get(field_type, Text)
+
     def _map_type_to_column(self, field_type: str) -> Column:
         """
         Map internal type to SQLAlchemy column.
@@ -142,6 +463,18 @@ class DynamicModelFactory:
         if field_type == "integer":
             return Column(Integer)
 
+        if field_type == "bigint":
+            return Column(BigInteger)
+
+        if field_type == "datetime":
+            return Column(CompactDateTime)
+
+        if field_type == "date":
+            return Column(CompactDate)
+
+        if field_type == "uuid":
+            return Column(CompactUUID)
+
         if field_type == "float":
             return Column(Float)
 
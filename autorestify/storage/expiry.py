@@ -0,0 +1,169 @@
+"""
+Row expiry for AutoRESTify.
+
+Collections uploaded with a `ttl` lose rows older than that many seconds.
+`ExpiryScheduler` deletes them from a background asyncio task in small
+batches with a pause in between, so no delete holds long locks, and can
+reclaim the freed pages of SQLite databases.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from autorestify.core.metrics import MetricsRegistry
+
+from .repository import Repository
+
+logger = logging.getLogger(__name__)
+
+# PRAGMA auto_vacuum value of databases supporting incremental_vacuum
+_INCREMENTAL = 2
+
+
+class ExpiryScheduler:
+    """
+    Background deletion of expired rows.
+
+    Args:
+        repository: Repository whose TTL collections are swept
+        interval: Seconds between sweeps
+        batch_size: Rows deleted per transaction
+        batch_pause: Seconds to wait between batches, bounding the delete rate
+        vacuum_interval: Seconds between SQLite vacuums (None disables them).
+            Databases created with `PRAGMA auto_vacuum = INCREMENTAL` run
+            `PRAGMA incremental_vacuum`; others run a full `VACUUM`, which
+            rewrites the whole file and suits small databases only.
+        vacuum_pages: Free pages released per incremental vacuum
+    """
+
+    def __init__(
+        self,
+        repository: Repository,
+        interval: float = 60.0,
+        batch_size: int = 500,
+        batch_pause: float = 0.05,
+        vacuum_interval: Optional[float] = None,
+        vacuum_pages: int = 1000,
+    ) -> None:
+        self.repository = repository
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.vacuum_interval = vacuum_interval
+        self.vacuum_pages = vacuum_pages
+        self._next_vacuum = time.monotonic() + (vacuum_interval or 0)
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._expired: Any = None
+
+    # ----------------------------------
+    # Lifecycle
+    # ----------------------------------
+
+    def start(self) -> None:
+        """
+        Start sweeping on the running event loop.
+        """
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """
+        Cancel the background task and wait for it to finish.
+        """
+
+        task, self._task = self._task, None
+        if task is None:
+            return
+
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def register_metrics(self, registry: MetricsRegistry) -> None:
+        """
+        Count expired rows on a metrics registry.
+        """
+        self._expired = registry.counter(
+            "autorestify_rows_expired_total",
+            "Rows deleted because their collection TTL passed.",
+            ("collection",),
+        )
+
+    # ----------------------------------
+    # Sweeping
+    # ----------------------------------
+
+    async def sweep(self) -> Dict[str, int]:
+        """
+        Delete every expired row, one batch per transaction.
+
+        Returns:
+            Rows deleted per collection
+        """
+
+        collections = await asyncio.to_thread(self.repository.expiring_collections)
+        deleted: Dict[str, int] = {}
+
+        for name in collections:
+            while True:
+                count = await asyncio.to_thread(
+                    self.repository.expire, name, self.batch_size
+                )
+                if count:
+                    deleted[name] = deleted.get(name, 0) + count
+                    if self._expired is not None:
+                        self._expired.inc(name, amount=count)
+                if count < self.batch_size:
+                    break
+                await asyncio.sleep(self.batch_pause)
+
+        if deleted:
+            logger.info("Expired rows: %s", deleted)
+
+        if self.vacuum_interval is not None and time.monotonic() >= self._next_vacuum:
+            self._next_vacuum = time.monotonic() + self.vacuum_interval
+            await asyncio.to_thread(self.vacuum)
+
+        return deleted
+
+    def vacuum(self) -> None:
+        """
+        Return free pages of a SQLite database to the filesystem.
+        """
+
+        engine = self.repository.database.engine
+        if engine.dialect.name != "sqlite":
+            return
+
+        raw = engine.raw_connection()
+        try:
+            connection = raw.driver_connection
+            mode = connection.execute("PRAGMA auto_vacuum").fetchone()[0]
+            # executescript steps the pragma to completion; a plain execute
+            # would free a single page
+            if mode == _INCREMENTAL:
+                connection.executescript(
+                    f"PRAGMA incremental_vacuum({int(self.vacuum_pages)});"
+                )
+            else:
+                connection.executescript("VACUUM;")
+        finally:
+            raw.close()
+
+    # ----------------------------------
+    # Internal Utilities
+    # ----------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Expiry sweep failed")
+            await asyncio.sleep(self.interval)
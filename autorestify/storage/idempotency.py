@@ -0,0 +1,188 @@
+"""
+Idempotency keys for AutoRESTify.
+
+Stores the response of a write sent with an `Idempotency-Key` header so
+retries of the same request replay it instead of repeating the work.
+Keys are scoped to the principal, method and path, and kept for `ttl`
+seconds.
+"""
+
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import (
+    Column,
+    Float,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    delete,
+    select,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+
+from .base import Database
+
+
+IDEMPOTENCY_TABLE = "_autorestify_idempotency"
+
+
+class IdempotencyConflict(Exception):
+    """
+    Key reused while still running (409) or with a different body (422).
+    """
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """
+    Response recorded for an idempotency key.
+    """
+
+    status_code: int
+    body: bytes
+
+
+class IdempotencyStore:
+    """
+    Database-backed record of responses per idempotency key.
+
+    Args:
+        database: Database holding the keys table
+        ttl: Seconds a completed response is replayed
+        lock_timeout: Seconds an unfinished request keeps its key, so a
+            crashed worker does not block retries for the whole ttl
+    """
+
+    def __init__(
+        self,
+        database: Database,
+        ttl: float = 86400.0,
+        lock_timeout: float = 300.0,
+    ) -> None:
+        self.database = database
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.metadata = MetaData()
+        self.table = Table(
+            IDEMPOTENCY_TABLE,
+            self.metadata,
+            Column("key", String(64), primary_key=True),
+            Column("fingerprint", String(64), nullable=False),
+            Column("status_code", Integer, nullable=True),
+            Column("body", LargeBinary, nullable=True),
+            Column("expires_at", Float, nullable=False, index=True),
+        )
+        self.metadata.create_all(self.database.engine)
+        self._next_purge = 0.0
+
+    # ----------------------------------
+    # Public API
+    # ----------------------------------
+
+    @staticmethod
+    def scope(principal: str, method: str, path: str, key: str) -> str:
+        """
+        Storage key of a client key, unique per principal and route.
+        """
+        raw = "\x00".join((principal, method, path, key))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def fingerprint(body: bytes) -> str:
+        return hashlib.sha256(body).hexdigest()
+
+    def begin(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """
+        Claim a key for a new request.
+
+        Returns:
+            The stored response if the request already completed, or None
+            when the caller owns the key and should run the request.
+
+        Raises:
+            IdempotencyConflict: The key is in use or bound to another body
+        """
+
+        now = time.time()
+        self._purge(now)
+        table = self.table
+
+        while True:
+            try:
+                with self.database.engine.begin() as conn:
+                    conn.execute(
+                        table.insert().values(
+                            key=key,
+                            fingerprint=fingerprint,
+                            expires_at=now + self.lock_timeout,
+                        )
+                    )
+                return None
+            except IntegrityError:
+                pass
+
+            with self.database.engine.begin() as conn:
+                row = conn.execute(select(table).where(table.c.key == key)).first()
+                if row is None:
+                    continue  # Released meanwhile
+                if row.expires_at <= now:
+                    conn.execute(delete(table).where(table.c.key == key))
+                    continue
+
+            if row.fingerprint != fingerprint:
+                raise IdempotencyConflict(
+                    422, "Idempotency-Key was already used with a different request"
+                )
+            if row.status_code is None:
+                raise IdempotencyConflict(
+                    409, "A request with this Idempotency-Key is in progress"
+                )
+            return StoredResponse(row.status_code, row.body)
+
+    def complete(self, key: str, status_code: int, body: bytes) -> None:
+        """
+        Record the response of a claimed key.
+        """
+        with self.database.engine.begin() as conn:
+            conn.execute(
+                update(self.table)
+                .where(self.table.c.key == key)
+                .values(
+                    status_code=status_code,
+                    body=body,
+                    expires_at=time.time() + self.ttl,
+                )
+            )
+
+    def release(self, key: str) -> None:
+        """
+        Forget a claimed key so the request can be retried.
+        """
+        with self.database.engine.begin() as conn:
+            conn.execute(delete(self.table).where(self.table.c.key == key))
+
+    # ----------------------------------
+    # Internal Utilities
+    # ----------------------------------
+
+    def _purge(self, now: float) -> None:
+        """
+        Delete expired keys, at most once a minute.
+        """
+
+        if now < self._next_purge:
+            return
+        self._next_purge = now + 60.0
+
+        with self.database.engine.begin() as conn:
+            conn.execute(delete(self.table).where(self.table.c.expires_at <= now))
@@ -0,0 +1,166 @@
+"""
+Database instrumentation for AutoRESTify.
+
+Hooks SQLAlchemy engine and pool events into a MetricsRegistry:
+- Per-collection statement timings
+- Pool checkout wait time
+- Connection counts
+"""
+
+import re
+import time
+import weakref
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from autorestify.core.metrics import MetricsRegistry
+
+
+_TABLE_PATTERN = re.compile(
+    r'\b(?:FROM|INTO|UPDATE|TABLE)\s+["`\[]?([A-Za-z0-9_]+)',
+    re.IGNORECASE,
+)
+
+_STATEMENT_CACHE_SIZE = 1024
+
+_instrumented: "weakref.WeakKeyDictionary[Engine, set]" = weakref.WeakKeyDictionary()
+
+_timed_pools: "weakref.WeakSet[Pool]" = weakref.WeakSet()
+
+
+def _classify(statement: str, cache: Dict[str, tuple]) -> tuple:
+    """
+    Extract (collection, operation) labels from a SQL statement.
+    """
+
+    labels = cache.get(statement)
+    if labels is not None:
+        return labels
+
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+    match = _TABLE_PATTERN.search(statement)
+    table = match.group(1).lower() if match else ""
+    collection = table.split("__", 1)[0] if table else "<none>"
+
+    labels = (collection, operation)
+    if len(cache) < _STATEMENT_CACHE_SIZE:
+        cache[statement] = labels
+    return labels
+
+
+def _time_checkouts(pool: Pool) -> None:
+    """
+    Stamp each record handed out by `pool` with the time its checkout began.
+
+    Pool events only fire once a connection is handed out, so the wait for
+    an exhausted pool (and the connect of a new connection) is timed around
+    the pool's own getter.
+    """
+
+    if pool in _timed_pools:
+        return
+    _timed_pools.add(pool)
+
+    do_get = pool._do_get
+
+    def _do_get():
+        started = time.perf_counter()
+        record = do_get()
+        record.info["autorestify_checkout_start"] = started
+        return record
+
+    pool._do_get = _do_get
+
+
+def instrument_engine(engine: Engine, registry: MetricsRegistry) -> None:
+    """
+    Attach statement, pool and connection metrics to an engine.
+
+    Calling this twice with the same registry is a no-op.
+    """
+
+    seen = _instrumented.setdefault(engine, set())
+    if id(registry) in seen:
+        return
+    seen.add(id(registry))
+
+    query_seconds = registry.histogram(
+        "autorestify_db_query_duration_seconds",
+        "Time spent executing SQL statements.",
+        ("collection", "operation"),
+    )
+    checkout_seconds = registry.histogram(
+        "autorestify_db_pool_checkout_seconds",
+        "Time spent waiting for a pooled connection, including opening it.",
+    )
+    connections_opened = registry.counter(
+        "autorestify_db_connections_opened_total",
+        "DBAPI connections opened by the pool.",
+    )
+
+    pool_ref = weakref.ref(engine)
+
+    def _pool_state():
+        target = pool_ref()
+        if target is None:
+            return []
+        pool = target.pool
+        samples = []
+        for state, attr in (("checked_out", "checkedout"), ("idle", "checkedin")):
+            getter = getattr(pool, attr, None)
+            if getter is not None:
+                samples.append(((state,), float(getter())))
+        return samples
+
+    registry.gauge(
+        "autorestify_db_pool_connections",
+        "Pooled connections by state.",
+        ("state",),
+        callback=_pool_state,
+    )
+
+    statement_cache: Dict[str, tuple] = {}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("autorestify_query_start", []).append(
+            time.perf_counter()
+        )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("autorestify_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        query_seconds.observe(elapsed, *_classify(statement, statement_cache))
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        # Failed statements never reach after_cursor_execute
+        conn = exception_context.connection
+        if conn is None or exception_context.execution_context is None:
+            return
+        starts = conn.info.get("autorestify_query_start")
+        if starts:
+            starts.pop()
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any):
+        connections_opened.inc()
+
+    _time_checkouts(engine.pool)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        started = connection_record.info.get("autorestify_checkout_start")
+        if started is not None:
+            checkout_seconds.observe(time.perf_counter() - started)
+
+        # engine.dispose() replaces the pool; time the new one from here on
+        target = pool_ref()
+        if target is not None:
+            _time_checkouts(target.pool)
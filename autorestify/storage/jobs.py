@@ -0,0 +1,324 @@
+"""
+Background jobs for AutoRESTify.
+
+Long uploads run as jobs on a small, bounded thread pool instead of
+holding their HTTP request open. Job state and progress are kept in the
+database, so `GET /_jobs/{id}` works from any worker process.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    delete,
+    select,
+    update,
+)
+
+from autorestify.core.metrics import MetricsRegistry
+
+from .base import Database
+
+logger = logging.getLogger(__name__)
+
+JOBS_TABLE = "_autorestify_jobs"
+MAX_JOB_ERRORS = 100
+
+
+class JobQueueFull(Exception):
+    """
+    Too many jobs are queued or running.
+    """
+
+
+@dataclass
+class Job:
+    """
+    State and progress of one background job.
+    """
+
+    id: str
+    kind: str
+    owner: str
+    collection: Optional[str] = None
+    state: str = "queued"  # queued, running, succeeded or failed
+    total: int = 0
+    processed: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def record_error(self, record: int, error: Any) -> None:
+        """
+        Count a rejected record, keeping the first MAX_JOB_ERRORS details.
+        """
+        self.failed += 1
+        if len(self.errors) < MAX_JOB_ERRORS:
+            self.errors.append({"record": record, "error": error})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Public representation, with throughput in records per second.
+        """
+
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "collection": self.collection,
+            "state": self.state,
+            "total": self.total,
+            "processed": self.processed,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "result": self.result,
+            "error": self.error,
+            "elapsed_seconds": elapsed,
+            "rows_per_second": self.processed / elapsed if elapsed else None,
+        }
+
+
+class JobManager:
+    """
+    Bounded pool running background jobs, with database-backed status.
+
+    Args:
+        database: Database holding the jobs table
+        workers: Jobs run at the same time. Kept small so ingestion
+            leaves the request threadpool and the database to
+            interactive traffic.
+        max_pending: Jobs queued or running before `submit` refuses more
+        retention: Seconds a finished job stays queryable
+    """
+
+    def __init__(
+        self,
+        database: Database,
+        workers: int = 2,
+        max_pending: int = 16,
+        retention: float = 86400.0,
+    ) -> None:
+        self.database = database
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self.metadata = MetaData()
+        self.table = Table(
+            JOBS_TABLE,
+            self.metadata,
+            Column("id", String(32), primary_key=True),
+            Column("kind", String(32), nullable=False),
+            Column("owner", String(64), nullable=False),
+            Column("collection", String(255), nullable=True),
+            Column("state", String(16), nullable=False),
+            Column("total", Integer, nullable=False),
+            Column("processed", Integer, nullable=False),
+            Column("inserted", Integer, nullable=False),
+            Column("failed", Integer, nullable=False),
+            Column("errors", JSON, nullable=False),
+            Column("result", JSON, nullable=True),
+            Column("error", Text, nullable=True),
+            Column("created_at", Float, nullable=False),
+            Column("started_at", Float, nullable=True),
+            Column("finished_at", Float, nullable=True, index=True),
+        )
+        self.metadata.create_all(self.database.engine)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Future is None while the job row is being inserted
+        self._pending: Dict[str, Tuple[Job, Optional["Future[None]"]]] = {}
+        self._lock = threading.Lock()
+        self._next_purge = 0.0
+
+    # ----------------------------------
+    # Lifecycle
+    # ----------------------------------
+
+    async def stop(self) -> None:
+        """
+        Fail queued jobs and wait for running ones to finish.
+        """
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+
+        executor.shutdown(wait=False, cancel_futures=True)
+        for job, future in list(self._pending.values()):
+            if future is not None and future.cancelled():
+                self._finish(job, "failed", error="Server shut down")
+        await asyncio.to_thread(executor.shutdown, True)
+
+    def register_metrics(self, registry: MetricsRegistry) -> None:
+        """
+        Expose queued and running job counts on a metrics registry.
+        """
+        registry.gauge(
+            "autorestify_jobs",
+            "Background jobs of this process by state.",
+            ("state",),
+            callback=self._counts,
+        )
+
+    # ----------------------------------
+    # Public API
+    # ----------------------------------
+
+    @staticmethod
+    def owner_of(principal: str) -> str:
+        """
+        Stored owner of a principal's jobs.
+        """
+        return hashlib.sha256(principal.encode("utf-8")).hexdigest()
+
+    def submit(
+        self,
+        kind: str,
+        principal: str,
+        run: Callable[[Job], Optional[Dict[str, Any]]],
+        collection: Optional[str] = None,
+        total: int = 0,
+    ) -> Job:
+        """
+        Queue `run(job)` on the pool.
+
+        `run` updates the job's counters and calls `progress(job)` to
+        publish them; its return value becomes the job result. The job
+        row is inserted outside the manager's lock, so this blocks neither
+        running jobs nor other submits on the database; call it from a
+        worker thread in async code.
+
+        Raises:
+            JobQueueFull: `max_pending` jobs are already queued or running
+        """
+
+        self._purge(time.time())
+        job = Job(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            owner=self.owner_of(principal),
+            collection=collection,
+            total=total,
+        )
+
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                raise JobQueueFull("Too many background jobs, retry later")
+            self._pending[job.id] = (job, None)
+
+        try:
+            with self.database.engine.begin() as conn:
+                conn.execute(self.table.insert().values(**asdict(job)))
+        except BaseException:
+            with self._lock:
+                self._pending.pop(job.id, None)
+            raise
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="autorestify-job"
+                )
+            future = self._executor.submit(self._run, job, run)
+            self._pending[job.id] = (job, future)
+
+        return job
+
+    def progress(self, job: Job) -> None:
+        """
+        Persist a running job's counters.
+        """
+        with self.database.engine.begin() as conn:
+            conn.execute(
+                update(self.table)
+                .where(self.table.c.id == job.id)
+                .values(**asdict(job))
+            )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self.database.engine.connect() as conn:
+            row = conn.execute(
+                select(self.table).where(self.table.c.id == job_id)
+            ).first()
+        return Job(**row._asdict()) if row else None
+
+    # ----------------------------------
+    # Internal Utilities
+    # ----------------------------------
+
+    def _run(self, job: Job, run: Callable[[Job], Optional[Dict[str, Any]]]) -> None:
+        job.state = "running"
+        job.started_at = time.time()
+        self.progress(job)
+
+        try:
+            result = run(job)
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            self._finish(job, "failed", error=str(e) or type(e).__name__)
+        else:
+            self._finish(job, "succeeded", result=result)
+
+    def _finish(
+        self,
+        job: Job,
+        state: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        job.state = state
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        try:
+            self.progress(job)
+        finally:
+            with self._lock:
+                self._pending.pop(job.id, None)
+
+    def _counts(self) -> List[Tuple[Tuple[str, ...], float]]:
+        with self._lock:
+            states = [job.state for job, _ in self._pending.values()]
+        return [
+            ((state,), float(states.count(state))) for state in ("queued", "running")
+        ]
+
+    def _purge(self, now: float) -> None:
+        """
+        Delete finished jobs past retention, at most once a minute.
+        """
+
+        if now < self._next_purge:
+            return
+        self._next_purge = now + 60
+
+        with self.database.engine.begin() as conn:
+            conn.execute(
+                delete(self.table).where(
+                    self.table.c.finished_at < now - self.retention
+                )
+            )
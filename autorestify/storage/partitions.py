@@ -0,0 +1,83 @@
+"""
+Time partitioning for AutoRESTify.
+
+Partitioned collections store their rows in one table per period of
+`created_at` (e.g. `events___202610` for October 2026). Record ids carry
+their partition: the period number (counted from 1970) sits above the low
+`ID_BITS` bits, so a lookup by id touches a single table and ids grow with
+time across partitions.
+"""
+
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+PERIODS = ("day", "month", "year")
+
+# Rows per partition: 2**ID_BITS - 1
+ID_BITS = 32
+
+_LABEL_FORMATS = {"day": "%Y%m%d", "month": "%Y%m", "year": "%Y"}
+_EPOCH = date(1970, 1, 1)
+
+
+def period_of(period: str, moment: datetime) -> int:
+    """
+    Number of the period containing `moment` (UTC), counted from 1970.
+    """
+
+    moment = moment.astimezone(timezone.utc)
+
+    if period == "day":
+        return (moment.date() - _EPOCH).days
+    if period == "month":
+        return (moment.year - 1970) * 12 + moment.month - 1
+    return moment.year - 1970
+
+
+def period_start(period: str, number: int) -> datetime:
+    """
+    First instant (UTC) of a period.
+    """
+
+    if period == "day":
+        start = _EPOCH + timedelta(days=number)
+        return datetime(start.year, start.month, start.day, tzinfo=timezone.utc)
+    if period == "month":
+        year, month = divmod(number, 12)
+        return datetime(1970 + year, month + 1, 1, tzinfo=timezone.utc)
+    return datetime(1970 + number, 1, 1, tzinfo=timezone.utc)
+
+
+def period_label(period: str, number: int) -> str:
+    return period_start(period, number).strftime(_LABEL_FORMATS[period])
+
+
+def partition_table(table_name: str, period: str, number: int) -> str:
+    return f"{table_name}___{period_label(period, number)}"
+
+
+def parse_partition(table_name: str, period: str, name: str) -> Optional[int]:
+    """
+    Period number of a partition table of `table_name`, or None.
+    """
+
+    match = re.fullmatch(rf"{re.escape(table_name)}___(\d+)", name)
+    if match is None:
+        return None
+    try:
+        moment = datetime.strptime(match.group(1), _LABEL_FORMATS[period])
+    except ValueError:
+        return None
+    return period_of(period, moment.replace(tzinfo=timezone.utc))
+
+
+def first_id(number: int) -> int:
+    """
+    Id preceding the first row of a partition.
+    """
+    return number << ID_BITS
+
+
+def period_of_id(item_id: int) -> int:
+    return item_id >> ID_BITS
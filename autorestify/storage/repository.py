@@ -2,27 +2,118 @@
 Repository layer for AutoRESTify.
 
 Responsible for:
-- Creating tables from schema
+- Creating and evolving tables from schema
 - Performing CRUD operations
 """
 
-from typing import Any, Dict, List, Optional, Type
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
 
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
 from sqlalchemy.orm import Session
-from sqlalchemy import inspect
+from sqlalchemy import bindparam, delete, func, inspect, select, text
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateColumn
 
-from .base import Database, Base
-from .dynamic_models import DynamicModelFactory
+from autorestify.core.changes import ChangeFeed
+from autorestify.core.schema_inference import SchemaInferer
+
+from .backends import BACKENDS, StorageBackend
+from .base import Database
+from .catalog import Catalog, CatalogConflict, CatalogEntry
+from .column_types import SQLITE_REBUILDS, SQLITE_WIDENING
+from .dedup import (
+    HASH_COLUMN,
+    content_hash,
+    existing_hashes,
+    insert_ignoring_duplicates,
+)
+from .dynamic_models import (
+    CollectionModels,
+    CollectionTypes,
+    DynamicModelFactory,
+    _sanitize_name,
+)
+from .partitions import (
+    PERIODS,
+    first_id,
+    parse_partition,
+    partition_table,
+    period_of,
+    period_of_id,
+    period_start,
+)
+from .search import SearchIndex
+from .statements import KEY_PARAM, StatementCache
+
+logger = logging.getLogger(__name__)
+
+# Registrations retried, after a short random pause, when another process
+# saves the collection first
+CATALOG_SAVE_ATTEMPTS = 10
+CATALOG_RETRY_DELAY = 0.05
+
+_CHILD_META_COLUMNS = ("id", "parent_id", "created_at")
+_META_COLUMNS = ("id", "created_at", HASH_COLUMN)
 
 
 class Repository:
     """
     High-level database interaction layer.
+
+    Args:
+        database: Database to operate on
+        changes: Change feed receiving committed writes
+        catalog_check_interval: Minimum seconds between checks for catalog
+            changes made by other processes (0 checks on every access)
+        backends: Extra storage backends selectable with the `storage`
+            option, by name (see `autorestify.storage.backends`)
     """
 
-    def __init__(self, database: Database) -> None:
+    def __init__(
+        self,
+        database: Database,
+        changes: Optional[ChangeFeed] = None,
+        catalog_check_interval: float = 1.0,
+        backends: Optional[Dict[str, Any]] = None,
+    ) -> None:
         self.database = database
+        self.changes = changes or ChangeFeed()
         self.model_factory = DynamicModelFactory()
+        database.register_models(self.model_factory)
+        self.inferer = SchemaInferer()
+        self.catalog = Catalog(database)
+        self.catalog.create()
+        self.search_index = SearchIndex()
+        self.catalog_check_interval = catalog_check_interval
+        self._options: Dict[str, Dict[str, Any]] = {}
+        self._catalog_versions: Dict[str, int] = {}
+        self._generation = self.catalog.generation()
+        self._next_check = time.monotonic() + catalog_check_interval
+        self._refresh_lock = threading.Lock()
+        self._partition_numbers: Dict[str, List[int]] = {}
+        self._partition_lock = threading.Lock()
+        self.backends = {**BACKENDS, **(backends or {})}
+        self._backends: Dict[str, StorageBackend] = {}
+        self._data_versions: Dict[str, int] = {}
+        self._next_data_check: Dict[str, float] = {}
+        self.statements = StatementCache()
+        self._registration_locks: Dict[str, threading.RLock] = {}
 
     # ----------------------------------
     # Schema / Table Management
@@ -32,17 +123,247 @@ class Repository:
         self,
         table_name: str,
         schema: Dict[str, Any],
+        options: Optional[Dict[str, Any]] = None,
     ) -> None:
         """
         Generate ORM models and create tables in database.
+
+        If the collection already exists, the schema is merged into the
+        registered one: new fields become nullable columns added in place
+        with ALTER TABLE, conflicting types are widened, and the models and
+        catalog version are rebuilt. Existing rows are never copied.
+
+        Supported options:
+            search: Top-level scalar fields to index for full-text search
+            dedupe: Skip documents whose content is already stored. Enabling
+                it on an existing collection hashes the stored rows; rows
+                duplicating an earlier one are kept without a hash. It
+                cannot be disabled.
+            ttl: Seconds after which rows are deleted by the expiry task
+                (null disables expiry); indexes `created_at`
+            partition: "day", "month" or "year" to store rows in one table
+                per period of `created_at`. Only accepted when the
+                collection is created; excludes search and dedupe.
+            storage: Backend serving reads ("sql" by default, or "memory"
+                to keep the whole collection in process)
+
+        Registrations of the same collection are serialized; different
+        collections register concurrently.
         """
 
-        self.model_factory.create_models_from_schema(table_name, schema)
-        Base.metadata.create_all(self.database.engine)
+        main_table = _sanitize_name(table_name)
+
+        with self._registration_lock(main_table):
+            self._register(main_table, schema, options)
+
+    def _register(
+        self,
+        main_table: str,
+        schema: Dict[str, Any],
+        options: Optional[Dict[str, Any]],
+    ) -> None:
+        """
+        Merge `schema` into the stored definition and save it.
+
+        The merge starts from the catalog's current entry rather than this
+        process's copy, which may be up to `catalog_check_interval` old.
+        When another process saves the collection in between, the save is
+        refused and the merge retried on top of its definition.
+        """
+
+        for attempt in range(CATALOG_SAVE_ATTEMPTS):
+            entry = self.catalog.get(main_table)
+            if entry is not None and entry.version != self._catalog_versions.get(
+                main_table
+            ):
+                self._apply(entry)
+            try:
+                self._register_version(main_table, schema, options)
+                return
+            except CatalogConflict:
+                if attempt == CATALOG_SAVE_ATTEMPTS - 1:
+                    raise
+                logger.info("Catalog entry of '%s' changed, retrying", main_table)
+                time.sleep(random.uniform(0, CATALOG_RETRY_DELAY))
+
+    def _register_version(
+        self,
+        main_table: str,
+        schema: Dict[str, Any],
+        options: Optional[Dict[str, Any]],
+    ) -> None:
+        previous = self._load_schema(main_table)
+        current_options = self._options.get(main_table, {})
+        options = {
+            k: v for k, v in (options or {}).items() if current_options.get(k) != v
+        }
+
+        if previous is None:
+            merged = schema
+        else:
+            merged = self.inferer.merge(previous, schema)
+            if merged == previous and not options:
+                return
+
+        self._check_partition(options, {**current_options, **options}, previous)
+        self._check_storage({**current_options, **options})
+
+        if "search" in options:
+            options["search"] = self._search_fields(merged, options["search"])
+
+        if "dedupe" in options:
+            self._check_dedupe(merged, options, current_options)
+            if not options and merged == previous:
+                return
+
+        if options.get("ttl") is not None:
+            ttl = options["ttl"]
+            if isinstance(ttl, bool) or not isinstance(ttl, (int, float)) or ttl <= 0:
+                raise ValueError("'ttl' must be a positive number of seconds")
+
+        layout = {**current_options, **options}
+        relayout = "dedupe" in options or "ttl" in options
+
+        if merged != previous or relayout:
+            version = self.model_factory.get_version(main_table) + 1
+            self.model_factory.create_models_from_schema(
+                main_table,
+                merged,
+                version,
+                bool(layout.get("dedupe")),
+                bool(layout.get("ttl")),
+            )
+            self._sync_tables(main_table, previous or {}, merged)
+
+        if relayout and previous is not None:
+            if "dedupe" in options:
+                self._backfill_hashes(main_table)
+            self._create_indexes(main_table)
+
+        if "search" in options:
+            table = self._get_model(main_table).__table__
+            with self.database.engine.begin() as conn:
+                self.search_index.ensure(conn, table, options["search"])
+
+        entry = self.catalog.save(
+            main_table,
+            merged,
+            options,
+            expected_version=self._catalog_versions.get(main_table, 0),
+        )
+        self._options[main_table] = entry.options
+        self._catalog_versions[main_table] = entry.version
+        self._backends.pop(main_table, None)
+
+    def load_catalog(self) -> List[str]:
+        """
+        Register models for every collection stored in the catalog.
+        """
+
+        self._generation = self.catalog.generation()
+
+        for entry in self.catalog.all():
+            self._apply(entry)
+        return self.collections()
+
+    def refresh_catalog(self, force: bool = False) -> List[str]:
+        """
+        Reload collections changed by other processes.
+
+        Reads the catalog generation at most once per
+        `catalog_check_interval`; only when it moved are the per-collection
+        versions compared and the stale collections rebuilt. Collections
+        this process has never used are left to lazy loading.
+
+        Returns:
+            Names of the reloaded collections
+        """
+
+        now = time.monotonic()
+        if force:
+            self._next_data_check.clear()
+        elif now < self._next_check:
+            return []
+
+        if not self._refresh_lock.acquire(blocking=False):
+            return []  # Another thread is already checking
+
+        try:
+            self._next_check = now + self.catalog_check_interval
+
+            generation = self.catalog.generation()
+            if generation == self._generation:
+                return []
+
+            reloaded = []
+            for name, version in self.catalog.versions().items():
+                known = self._catalog_versions.get(name)
+                if known is None or known == version:
+                    continue
+                entry = self.catalog.get(name)
+                if entry is not None:
+                    self._apply(entry)
+                    reloaded.append(name)
+
+            self._generation = generation
+            if reloaded:
+                logger.info("Reloaded collections from catalog: %s", reloaded)
+            return reloaded
+        finally:
+            self._refresh_lock.release()
 
     def table_exists(self, table_name: str) -> bool:
-        inspector = inspect(self.database.engine)
-        return table_name in inspector.get_table_names()
+        return self._load_schema(table_name.lower()) is not None
+
+    def collections(self) -> List[str]:
+        """
+        Names of registered collections.
+        """
+        return self.model_factory.collections()
+
+    def get_schema(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Registered schema of a collection.
+        """
+        return self._load_schema(table_name.lower())
+
+    def get_types(self, table_name: str) -> Optional[CollectionTypes]:
+        """
+        Pydantic validators/serializers for a registered collection.
+        """
+        return self.model_factory.get_types(table_name.lower())
+
+    def get_options(self, table_name: str) -> Dict[str, Any]:
+        """
+        Options of a registered collection (empty if unknown).
+        """
+        table_name = table_name.lower()
+        self._load_schema(table_name)
+        return self._options.get(table_name, {})
+
+    @contextmanager
+    def snapshot(self) -> Iterator[Session]:
+        """
+        Read-only session on one connection and transaction, so that
+        several `get`/`list` calls see the same database state.
+
+        Postgres and MySQL run it at REPEATABLE READ. SQLite starts an
+        explicit transaction, except on a shared in-memory connection,
+        where other requests' writes would join it. Collections served by
+        a storage backend are read from the backend, outside the snapshot.
+        """
+
+        engine = self.database.engine
+
+        with engine.connect() as conn:
+            if conn.dialect.name != "sqlite":
+                conn.execution_options(isolation_level="REPEATABLE READ")
+            elif not isinstance(engine.pool, StaticPool):
+                conn.exec_driver_sql("BEGIN")
+
+            with Session(bind=conn) as session:
+                yield session
+            # Closing the connection rolls the transaction back
 
     # ----------------------------------
     # CRUD Operations
@@ -55,48 +376,113 @@ class Repository:
     ) -> int:
         """
         Insert a new record.
+
+        In collections with `dedupe`, a document already stored is not
+        inserted again; the id of the stored copy is returned.
         """
 
-        model = self._get_model(table_name)
+        model, children, created_at = self._write_target(table_name)
+        scalars, nested = self._split_nested(data, children)
+        digest = None
 
-        with self.database.SessionLocal() as session:
-            instance = model(**data)
-            session.add(instance)
-            session.commit()
-            session.refresh(instance)
-            return int(instance.id)
+        if created_at is not None:
+            scalars = {**scalars, "created_at": created_at}
+
+        if self.get_options(table_name).get("dedupe"):
+            digest = content_hash(data)
+            existing = self._find_hash(model, digest)
+            if existing is not None:
+                return existing
+            scalars = {**scalars, HASH_COLUMN: digest}
+
+        statements = self.statements
+
+        try:
+            with self.database.engine.begin() as conn:
+                result = conn.execute(statements.insert(model.__table__), scalars)
+                item_id = int(result.inserted_primary_key[0])
+
+                for field, value in nested.items():
+                    conn.execute(
+                        statements.insert(children[field].__table__),
+                        {**value, "parent_id": item_id},
+                    )
+                version = self._touch_backend(conn, table_name)
+        except IntegrityError:
+            if digest is None:
+                raise
+            return self._find_hash(model, digest)  # Inserted concurrently
+
+        self.changes.publish(table_name.lower(), "insert", item_id, data)
+        self._sync_backend(table_name, version, written=[item_id])
+        return item_id
 
     def list(
         self,
         table_name: str,
         limit: int = 100,
+        session: Optional[Session] = None,
     ) -> List[Dict[str, Any]]:
         """
         List records from table.
+
+        Partitioned collections are read oldest partition first, in id
+        order, until `limit` records are found. Reads go through `session`
+        when given (see `snapshot`).
         """
 
-        model = self._get_model(table_name)
+        backend = self._backend(table_name)
+        if backend is not None:
+            return backend.list(limit)
 
-        with self.database.SessionLocal() as session:
-            results = session.query(model).limit(limit).all()
-            return [self._serialize(r) for r in results]
+        self._get_model(table_name)
+        rows: List[Dict[str, Any]] = []
+
+        ordered = self._is_partitioned(table_name)
+
+        with self._connection(session) as conn:
+            for model, children in self._read_targets(table_name):
+                table = model.__table__
+                statement = self.statements.select_page(
+                    table, self._record_columns(table), ordered
+                )
+                result = conn.execute(statement, {"limit": limit - len(rows)})
+                page = [dict(row) for row in result.mappings()]
+                self._attach_children(conn, children, page)
+                rows.extend(page)
+                if len(rows) >= limit:
+                    break
+
+        return rows
 
     def get(
         self,
         table_name: str,
         item_id: int,
+        session: Optional[Session] = None,
     ) -> Optional[Dict[str, Any]]:
         """
-        Get single record by ID.
+        Get single record by ID, through `session` when given.
         """
 
-        model = self._get_model(table_name)
+        backend = self._backend(table_name)
+        if backend is not None:
+            return backend.get(item_id)
 
-        with self.database.SessionLocal() as session:
-            instance = session.get(model, item_id)
-            if not instance:
+        target = self._id_target(table_name, item_id)
+        if target is None:
+            return None
+        model, children = target
+        table = model.__table__
+        statement = self.statements.select_by_id(table, self._record_columns(table))
+
+        with self._connection(session) as conn:
+            row = conn.execute(statement, {"id": item_id}).mappings().first()
+            if row is None:
                 return None
-            return self._serialize(instance)
+            row = dict(row)
+            self._attach_children(conn, children, [row])
+            return row
 
     def update(
         self,
@@ -108,20 +494,29 @@ class Repository:
         Update record by ID.
         """
 
-        model = self._get_model(table_name)
+        target = self._id_target(table_name, item_id)
+        if target is None:
+            return False
+        model, children = target
+        scalars, nested = self._split_nested(data, children)
+        table = model.__table__
+        statements = self.statements
 
-        with self.database.SessionLocal() as session:
-            instance = session.get(model, item_id)
-            if not instance:
+        with self.database.engine.begin() as conn:
+            if not self._update_row(conn, table, "id", item_id, scalars):
                 return False
 
-            for key, value in data.items():
-                if hasattr(instance, key):
-                    setattr(instance, key, value)
+            for field, value in nested.items():
+                child = children[field].__table__
+                if not self._update_row(conn, child, "parent_id", item_id, value):
+                    conn.execute(
+                        statements.insert(child), {**value, "parent_id": item_id}
+                    )
+            version = self._touch_backend(conn, table_name)
 
-            session.add(instance)
-            session.commit()
-            return True
+        self.changes.publish(table_name.lower(), "update", item_id, data)
+        self._sync_backend(table_name, version, written=[item_id])
+        return True
 
     def delete(
         self,
@@ -132,32 +527,1097 @@ class Repository:
         Delete record by ID.
         """
 
+        target = self._id_target(table_name, item_id)
+        if target is None:
+            return False
+        model, children = target
+        statements = self.statements
+
+        with self.database.engine.begin() as conn:
+            for child_model in children.values():
+                conn.execute(
+                    statements.delete_by(child_model.__table__, "parent_id"),
+                    {KEY_PARAM: item_id},
+                )
+            result = conn.execute(
+                statements.delete_by(model.__table__, "id"), {KEY_PARAM: item_id}
+            )
+            if not result.rowcount:
+                return False
+            version = self._touch_backend(conn, table_name)
+
+        self.changes.publish(table_name.lower(), "delete", item_id)
+        self._sync_backend(table_name, version, removed=[item_id])
+        return True
+
+    # ----------------------------------
+    # Bulk Operations
+    # ----------------------------------
+
+    def insert_many(
+        self,
+        table_name: str,
+        documents: List[Dict[str, Any]],
+    ) -> int:
+        """
+        Insert a batch of records with one executemany per table.
+
+        Ids are returned in parameter order (batched RETURNING) so each
+        row can be published to the change feed. In collections with
+        `dedupe`, documents already stored (or repeated in the batch) are
+        skipped with INSERT ... ON CONFLICT DO NOTHING.
+
+        Returns:
+            Number of records inserted
+        """
+
+        if not documents:
+            return 0
+
+        model, children, created_at = self._write_target(table_name)
+        table = model.__table__
+        split = [self._split_nested(doc, children) for doc in documents]
+        dedupe = self.get_options(table_name).get("dedupe")
+
+        if created_at is not None:
+            split = [
+                ({**scalars, "created_at": created_at}, nested)
+                for scalars, nested in split
+            ]
+
+        if dedupe:
+            documents, split = self._hash_batch(documents, split)
+
+        with self.database.engine.begin() as conn:
+            if dedupe:
+                ids, documents, split = self._insert_new(conn, table, documents, split)
+            else:
+                ids = conn.execute(
+                    table.insert().returning(table.c.id, sort_by_parameter_order=True),
+                    self._uniform([scalars for scalars, _ in split]),
+                ).scalars().all()
+
+            for field, child_model in children.items():
+                child_rows = [
+                    {**nested[field], "parent_id": parent_id}
+                    for parent_id, (_, nested) in zip(ids, split)
+                    if field in nested
+                ]
+                if child_rows:
+                    conn.execute(
+                        child_model.__table__.insert(), self._uniform(child_rows)
+                    )
+            version = self._touch_backend(conn, table_name) if ids else None
+
+        for item_id, document in zip(ids, documents):
+            self.changes.publish(table_name.lower(), "insert", item_id, document)
+
+        if ids:
+            self._sync_backend(table_name, version, written=ids)
+        return len(ids)
+
+    def expire(
+        self,
+        table_name: str,
+        batch_size: int = 500,
+    ) -> int:
+        """
+        Delete up to `batch_size` of the oldest rows past the collection's ttl.
+
+        Partitions lying entirely before the cutoff are dropped whole first.
+
+        Returns:
+            Number of records deleted
+        """
+
+        ttl = self.get_options(table_name).get("ttl")
+        if not ttl:
+            return 0
+
+        table_name = table_name.lower()
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=ttl)
+
+        if self._is_partitioned(table_name):
+            dropped = sum(
+                self._drop_partition(table_name, number)
+                for number in self._expired_partitions(table_name, cutoff)
+            )
+            if dropped:
+                return dropped
+
+        for model, children in self._read_targets(table_name):
+            deleted = self._delete_before(
+                table_name, model, children, cutoff, batch_size
+            )
+            if deleted:
+                return deleted
+
+        return 0
+
+    def expiring_collections(self) -> List[str]:
+        """
+        Names of catalogued collections with a ttl.
+        """
+        return [entry.name for entry in self.catalog.all() if entry.options.get("ttl")]
+
+    def iter_batches(
+        self,
+        table_name: str,
+        batch_size: int = 1000,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream all records in id order through a server-side cursor.
+        """
+
+        self._get_model(table_name)
+
+        with self.database.SessionLocal() as session:
+            for model, children in self._read_targets(table_name):
+                table = model.__table__
+                columns = [c for c in table.columns if c.name != HASH_COLUMN]
+                statement = (
+                    select(*columns)
+                    .order_by(table.c.id)
+                    .execution_options(stream_results=True, yield_per=batch_size)
+                )
+
+                result = session.execute(statement)
+                for partition in result.mappings().partitions():
+                    rows = [dict(row) for row in partition]
+                    self._attach_children(session, children, rows)
+                    yield rows
+
+    # ----------------------------------
+    # Partitions
+    # ----------------------------------
+
+    def partitions(self, table_name: str) -> List[str]:
+        """
+        Partition tables of a partitioned collection, oldest first.
+        """
+
+        table_name = table_name.lower()
+        period = self.get_options(table_name).get("partition")
+        if not period:
+            return []
+
+        return [
+            partition_table(table_name, period, number)
+            for number in self._partitions_of(table_name)
+        ]
+
+    def drop_partitions(self, table_name: str, before: datetime) -> List[str]:
+        """
+        Drop the partitions whose whole period ends before `before`.
+
+        Returns:
+            Names of the dropped partition tables
+        """
+
+        table_name = table_name.lower()
+        period = self.get_options(table_name).get("partition")
+        if not period:
+            raise ValueError(f"Collection '{table_name}' is not partitioned")
+
+        names = []
+        for number in self._expired_partitions(table_name, before):
+            self._drop_partition(table_name, number)
+            names.append(partition_table(table_name, period, number))
+        return names
+
+    # ----------------------------------
+    # Search
+    # ----------------------------------
+
+    def search(
+        self,
+        table_name: str,
+        query: str,
+        fields: Optional[List[str]] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Full-text search over the collection's indexed fields.
+
+        Records carry a `_score` key: the BM25 rank on SQLite (lower is
+        better) or None on backends using the LIKE fallback.
+        """
+
         model = self._get_model(table_name)
+        indexed = self.get_options(table_name).get("search") or []
+
+        if not indexed:
+            raise ValueError(f"Collection '{table_name}' has no search fields")
+
+        fields = fields or indexed
+        unknown = [f for f in fields if f not in indexed]
+        if unknown:
+            raise ValueError(f"Fields not indexed for search: {', '.join(unknown)}")
 
         with self.database.SessionLocal() as session:
-            instance = session.get(model, item_id)
-            if not instance:
-                return False
+            results = self.search_index.search(
+                session.connection(), model.__table__, query, fields, limit, offset
+            )
+            rows = [row for row, _ in results]
+            self._attach_children(
+                session, self.model_factory.get_children(table_name.lower()), rows
+            )
+
+        for row, score in results:
+            row.pop(HASH_COLUMN, None)
+            row["_score"] = score
+        return rows
+
+    # ----------------------------------
+    # Storage Backends
+    # ----------------------------------
+
+    def _backend(self, table_name: str) -> Optional[StorageBackend]:
+        """
+        Backend serving the collection's reads, or None for plain SQL.
+
+        At most once per `catalog_check_interval`, the collection's data
+        version is compared with the one this process last saw; writes
+        made by other processes then reload the backend.
+        """
+
+        table_name = table_name.lower()
+        storage = self.get_options(table_name).get("storage", "sql")
+        if storage == "sql":
+            return None
+
+        backend = self._backends.get(table_name)
+        if backend is None:
+            columns = ["id", "created_at", *self._load_schema(table_name)]
+            backend = self._backends.setdefault(
+                table_name,
+                self.backends[storage](
+                    columns, lambda: self.iter_batches(table_name)
+                ),
+            )
+
+        now = time.monotonic()
+        if now >= self._next_data_check.get(table_name, 0.0):
+            self._next_data_check[table_name] = now + self.catalog_check_interval
+            version = self.catalog.data_version(table_name)
+            if version != self._data_versions.get(table_name):
+                backend.invalidate()
+                self._data_versions[table_name] = version
+
+        return backend
+
+    def _touch_backend(self, conn: Any, table_name: str) -> Optional[int]:
+        """
+        Record a write to a backend-served collection in the writer's
+        transaction; returns the new data version (None for plain SQL).
+        """
+
+        table_name = table_name.lower()
+        if self.get_options(table_name).get("storage", "sql") == "sql":
+            return None
+        return self.catalog.touch(conn, table_name)
+
+    def _sync_backend(
+        self,
+        table_name: str,
+        version: Optional[int],
+        written: Sequence[int] = (),
+        removed: Sequence[int] = (),
+    ) -> None:
+        """
+        Apply a committed write to the collection's backend.
+
+        The write is applied in place when it is the only one since the
+        data version this process last saw; otherwise another process wrote
+        too, and the backend is reloaded.
+        """
+
+        if version is None:
+            return
+
+        table_name = table_name.lower()
+        backend = self._backends.get(table_name)
+        if backend is None:
+            return
+
+        known = self._data_versions.get(table_name, 0)
+        if known == version - 1:
+            if written:
+                backend.put(self._fetch(table_name, written))
+            if removed:
+                backend.remove(removed)
+        else:
+            backend.invalidate()
+        self._data_versions[table_name] = max(known, version)
+
+    def _fetch(self, table_name: str, ids: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Records by id, read from SQL.
+        """
 
-            session.delete(instance)
-            session.commit()
-            return True
+        current = self._collection(table_name)
+        table = current.model.__table__
+        statement = self.statements.select_by_ids(table, self._record_columns(table))
+
+        with self.database.engine.connect() as conn:
+            result = conn.execute(statement, {"ids": list(ids)})
+            rows = [dict(row) for row in result.mappings()]
+            self._attach_children(conn, current.children, rows)
+        return rows
+
+    # ----------------------------------
+    # Partition Routing
+    # ----------------------------------
+
+    def _is_partitioned(self, table_name: str) -> bool:
+        return bool(self.get_options(table_name).get("partition"))
+
+    def _write_target(self, table_name: str) -> tuple:
+        """
+        (model, children, created_at) receiving new records.
+
+        Partitioned collections write to the partition of the current
+        period, created on demand, with an explicit `created_at`.
+        """
+
+        current = self._collection(table_name)
+        table_name = table_name.lower()
+        period = self.get_options(table_name).get("partition")
+
+        if not period:
+            return current.model, current.children, None
+
+        now = datetime.now(timezone.utc)
+        model, children = self._ensure_partition(table_name, period_of(period, now))
+        return model, children, now
+
+    def _read_targets(self, table_name: str) -> List[tuple]:
+        """
+        (model, children) of every table holding records, in id order.
+        """
+
+        current = self._collection(table_name)
+        table_name = table_name.lower()
+
+        if not self._is_partitioned(table_name):
+            return [(current.model, current.children)]
+
+        return [
+            self._partition_models(table_name, number)
+            for number in self._partitions_of(table_name)
+        ]
+
+    def _all_targets(self, table_name: str) -> List[tuple]:
+        """
+        (model, children) of the collection's tables and its partitions.
+        """
+
+        current = self.model_factory.get_collection(table_name)
+        targets = [(current.model, current.children)]
+        if self._options.get(table_name, {}).get("partition"):
+            targets += [
+                self._partition_models(table_name, number)
+                for number in self._partitions_of(table_name)
+            ]
+        return targets
+
+    def _id_target(self, table_name: str, item_id: int) -> Optional[tuple]:
+        """
+        (model, children) of the table holding `item_id`, if it exists.
+        """
+
+        current = self._collection(table_name)
+        table_name = table_name.lower()
+
+        if not self._is_partitioned(table_name):
+            return current.model, current.children
+
+        number = period_of_id(item_id)
+        if number not in self._partitions_of(table_name):
+            return None
+        return self._partition_models(table_name, number)
+
+    def _partitions_of(self, table_name: str) -> List[int]:
+        """
+        Period numbers of existing partitions, found by listing tables.
+
+        Cached until the catalog entry changes; creating or dropping a
+        partition bumps it so other processes list them again.
+        """
+
+        numbers = self._partition_numbers.get(table_name)
+        if numbers is not None:
+            return numbers
+
+        period = self._options.get(table_name, {}).get("partition")
+        if not period:
+            return []
+
+        names = inspect(self.database.engine).get_table_names()
+        parsed = (parse_partition(table_name, period, name) for name in names)
+        numbers = sorted(number for number in parsed if number is not None)
+        self._partition_numbers[table_name] = numbers
+        return numbers
+
+    def _partition_models(self, table_name: str, number: int) -> tuple:
+        period = self._options[table_name]["partition"]
+        return self.model_factory.get_partition(
+            table_name, partition_table(table_name, period, number), first_id(number)
+        )
+
+    def _ensure_partition(self, table_name: str, number: int) -> tuple:
+        """
+        Partition models for `number`, creating its tables if missing.
+        """
+
+        models = self._partition_models(table_name, number)
+        if number in self._partitions_of(table_name):
+            return models
+
+        with self._partition_lock:
+            if number not in self._partitions_of(table_name):
+                self._create_partition(models, number)
+                self._partition_numbers[table_name] = sorted(
+                    {*self._partitions_of(table_name), number}
+                )
+                self._catalog_versions[table_name] = self.catalog.bump(table_name)
+
+        return models
+
+    def _create_partition(self, models: tuple, number: int) -> None:
+        model, children = models
+        table = model.__table__
+
+        try:
+            with self.database.engine.begin() as conn:
+                table.create(conn)
+                if conn.dialect.name == "sqlite":
+                    # AUTOINCREMENT continues from here
+                    conn.execute(
+                        text(
+                            "INSERT INTO sqlite_sequence (name, seq) "
+                            "VALUES (:name, :seq)"
+                        ),
+                        {"name": table.name, "seq": first_id(number)},
+                    )
+                for child in children.values():
+                    child.__table__.create(conn)
+        except (OperationalError, ProgrammingError):
+            if not inspect(self.database.engine).has_table(table.name):
+                raise
+            # Created concurrently by another process
+
+    def _expired_partitions(self, table_name: str, before: datetime) -> List[int]:
+        """
+        Partitions whose whole period ends before `before`.
+        """
+
+        period = self._options[table_name]["partition"]
+        return [
+            number
+            for number in self._partitions_of(table_name)
+            if period_start(period, number + 1) <= before
+        ]
+
+    def _drop_partition(self, table_name: str, number: int) -> int:
+        """
+        Drop a partition's tables.
+
+        Returns:
+            Number of records dropped (not published to the change feed)
+        """
+
+        model, children = self._partition_models(table_name, number)
+        table = model.__table__
+
+        with self._partition_lock:
+            with self.database.engine.begin() as conn:
+                count = conn.execute(
+                    select(func.count()).select_from(table)
+                ).scalar()
+                for child in children.values():
+                    child.__table__.drop(conn, checkfirst=True)
+                table.drop(conn, checkfirst=True)
+
+            self.model_factory.forget_partition(table_name, table.name)
+            self._partition_numbers[table_name] = [
+                n for n in self._partitions_of(table_name) if n != number
+            ]
+            self._catalog_versions[table_name] = self.catalog.bump(table_name)
+
+        logger.info("Dropped partition %s (%d rows)", table.name, count)
+        return count
+
+    def _delete_before(
+        self,
+        table_name: str,
+        model: Type[Any],
+        children: Dict[str, Type[Any]],
+        cutoff: datetime,
+        batch_size: int,
+    ) -> int:
+        """
+        Delete up to `batch_size` of a table's oldest rows created before `cutoff`.
+        """
+
+        table = model.__table__
+
+        with self.database.engine.begin() as conn:
+            ids = conn.execute(
+                select(table.c.id)
+                .where(table.c.created_at < cutoff)
+                .order_by(table.c.created_at)
+                .limit(batch_size)
+            ).scalars().all()
+
+            if not ids:
+                return 0
+
+            for child_model in children.values():
+                child = child_model.__table__
+                conn.execute(delete(child).where(child.c.parent_id.in_(ids)))
+            conn.execute(delete(table).where(table.c.id.in_(ids)))
+            version = self._touch_backend(conn, table_name)
+
+        for item_id in ids:
+            self.changes.publish(table_name.lower(), "delete", item_id)
+
+        self._sync_backend(table_name, version, removed=ids)
+        return len(ids)
 
     # ----------------------------------
     # Internal Utilities
     # ----------------------------------
 
-    def _get_model(self, table_name: str) -> Type[Base]:
+    def _connection(self, session: Optional[Session]) -> Any:
+        """
+        Context yielding the connection of `session`, or a new connection
+        when None.
+        """
+        if session is not None:
+            return nullcontext(session.connection())
+        return self.database.engine.connect()
+
+    @staticmethod
+    def _record_columns(table: Any) -> Tuple[str, ...]:
+        return tuple(c.name for c in table.columns if c.name != HASH_COLUMN)
+
+    def _update_row(
+        self,
+        conn: Any,
+        table: Any,
+        key_column: str,
+        key: int,
+        values: Dict[str, Any],
+    ) -> bool:
+        """
+        Update the row where `key_column` = `key` with the known columns of
+        `values`.
+
+        Returns:
+            Whether the row exists
+        """
+
+        values = {k: v for k, v in values.items() if k in table.c}
+
+        if not values:
+            statement = self.statements.exists_by(table, key_column)
+            return conn.execute(statement, {KEY_PARAM: key}).first() is not None
+
+        statement = self.statements.update_by(table, key_column)
+        return bool(conn.execute(statement, {**values, KEY_PARAM: key}).rowcount)
+
+    @staticmethod
+    def _uniform(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Give every row the same keys, as executemany requires.
+        """
+
+        keys: Dict[str, None] = {}
+        for row in rows:
+            keys.update(dict.fromkeys(row))
+
+        return [
+            row if len(row) == len(keys) else {k: row.get(k) for k in keys}
+            for row in rows
+        ]
+
+    def _get_model(self, table_name: str) -> Type[Any]:
         """
         Retrieve dynamically created model.
         """
+        return self._collection(table_name).model
+
+    def _collection(self, table_name: str) -> CollectionModels:
+        """
+        Current models of a collection, loaded from the catalog if needed.
+
+        Callers needing several models take them from the one returned
+        record, so a concurrent rebuild cannot mix two versions.
+        """
 
         table_name = table_name.lower()
+        self.refresh_catalog()
+
+        current = self.model_factory.get_collection(table_name)
+        if current is None:
+            self._load_schema(table_name)
+            current = self.model_factory.get_collection(table_name)
 
-        if table_name not in self.model_factory._models:
+        if current is None:
             raise ValueError(f"Table '{table_name}' is not registered.")
 
-        return self.model_factory._models[table_name]
+        return current
+
+    def _load_schema(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the registered schema, loading it from the catalog if needed.
+        """
+
+        self.refresh_catalog()
+
+        schema = self.model_factory.get_schema(table_name)
+        if schema is not None:
+            return schema
+
+        entry = self.catalog.get(table_name)
+        if entry is None:
+            return None
+
+        self._apply(entry)
+        return entry.schema
+
+    def _apply(self, entry: CatalogEntry) -> None:
+        """
+        Register a catalog entry's models and options in this process.
+
+        Entries older than the version already applied (read before a
+        concurrent registration saved a newer one) are ignored.
+        """
+
+        with self._registration_lock(entry.name):
+            if entry.version < self._catalog_versions.get(entry.name, 0):
+                return
+
+            self.model_factory.create_models_from_schema(
+                entry.name,
+                entry.schema,
+                entry.version,
+                bool(entry.options.get("dedupe")),
+                bool(entry.options.get("ttl")),
+            )
+            self._options[entry.name] = entry.options
+            self._catalog_versions[entry.name] = entry.version
+            self._partition_numbers.pop(entry.name, None)
+            self._backends.pop(entry.name, None)
+
+    def _registration_lock(self, table_name: str) -> threading.RLock:
+        """
+        Lock ordering the registrations of one collection in this process.
+        """
+        lock = self._registration_locks.get(table_name)
+        if lock is None:
+            lock = self._registration_locks.setdefault(table_name, threading.RLock())
+        return lock
+
+    @staticmethod
+    def _search_fields(schema: Dict[str, Any], fields: Any) -> List[str]:
+        """
+        Validate the fields requested for full-text indexing.
+        """
+
+        if not isinstance(fields, list) or not all(isinstance(f, str) for f in fields):
+            raise ValueError("'search' must be a list of field names")
+
+        for field in fields:
+            field_type = schema.get(field)
+            if field_type is None:
+                raise ValueError(f"Unknown search field '{field}'")
+            if isinstance(field_type, dict) or field_type == "array":
+                raise ValueError(f"Search field '{field}' must be a scalar field")
+
+        return list(dict.fromkeys(fields))
+
+    @staticmethod
+    def _check_partition(
+        options: Dict[str, Any],
+        layout: Dict[str, Any],
+        previous: Optional[Dict[str, Any]],
+    ) -> None:
+        """
+        Validate the partition option and the options it excludes.
+        """
+
+        if "partition" in options and previous is not None:
+            raise ValueError("Partitioning can only be chosen for a new collection")
+
+        period = layout.get("partition")
+        if period is None:
+            return
+
+        if period not in PERIODS:
+            raise ValueError(f"'partition' must be one of: {', '.join(PERIODS)}")
+
+        if layout.get("search") or layout.get("dedupe"):
+            raise ValueError("Partitioned collections cannot use search or dedupe")
+
+    def _check_storage(self, layout: Dict[str, Any]) -> None:
+        """
+        Validate the storage option.
+        """
+
+        storage = layout.get("storage", "sql")
+        if storage != "sql" and storage not in self.backends:
+            names = ", ".join(["sql", *self.backends])
+            raise ValueError(f"'storage' must be one of: {names}")
+
+        if storage != "sql" and layout.get("partition"):
+            raise ValueError("Partitioned collections are stored in SQL only")
+
+    @staticmethod
+    def _check_dedupe(
+        schema: Dict[str, Any],
+        options: Dict[str, Any],
+        current: Dict[str, Any],
+    ) -> None:
+        """
+        Validate the dedupe option, dropping it when it changes nothing.
+        """
+
+        if not isinstance(options["dedupe"], bool):
+            raise ValueError("'dedupe' must be true or false")
+
+        if HASH_COLUMN in schema:
+            raise ValueError(f"Field '{HASH_COLUMN}' is reserved for deduplication")
+
+        if not options["dedupe"]:
+            if current.get("dedupe"):
+                raise ValueError("Deduplication cannot be disabled")
+            del options["dedupe"]
+
+    def _backfill_hashes(self, table_name: str) -> None:
+        """
+        Hash the stored rows of a collection that just enabled dedupe.
+        Later duplicates keep a NULL hash.
+        """
+
+        seen: Dict[str, int] = {}
+        for rows in self.iter_batches(table_name):
+            for row in rows:
+                document = {k: v for k, v in row.items() if k not in _META_COLUMNS}
+                seen.setdefault(content_hash(document), row["id"])
+
+        table = self._get_model(table_name).__table__
+
+        with self.database.engine.begin() as conn:
+            if seen:
+                conn.execute(
+                    table.update()
+                    .where(table.c.id == bindparam("row_id"))
+                    .values({HASH_COLUMN: bindparam("digest")}),
+                    [{"row_id": i, "digest": d} for d, i in seen.items()],
+                )
+
+    def _create_indexes(self, table_name: str) -> None:
+        """
+        Create indexes the main models declare but their tables lack.
+        """
+
+        with self.database.engine.begin() as conn:
+            for model, _ in self._all_targets(table_name):
+                for index in model.__table__.indexes:
+                    index.create(conn, checkfirst=True)
+
+    def _find_hash(self, model: Type[Any], digest: str) -> Optional[int]:
+        """
+        Id of the row storing a content hash.
+        """
+        column = model.__table__.c[HASH_COLUMN]
+        with self.database.engine.connect() as conn:
+            return conn.execute(
+                select(model.__table__.c.id).where(column == digest)
+            ).scalar()
+
+    @staticmethod
+    def _hash_batch(documents: List[Dict[str, Any]], split: List[tuple]) -> tuple:
+        """
+        Add content hashes to a batch, keeping the first of repeated documents.
+        """
+
+        unique: Dict[str, tuple] = {}
+        for document, (scalars, nested) in zip(documents, split):
+            digest = content_hash(document)
+            if digest not in unique:
+                unique[digest] = (document, ({**scalars, HASH_COLUMN: digest}, nested))
+
+        return [d for d, _ in unique.values()], [s for _, s in unique.values()]
+
+    def _insert_new(
+        self,
+        conn: Any,
+        table: Any,
+        documents: List[Dict[str, Any]],
+        split: List[tuple],
+    ) -> tuple:
+        """
+        Insert hashed rows whose hash is not stored yet.
+
+        Returns:
+            (ids, documents, split) of the rows actually inserted
+        """
+
+        statement = insert_ignoring_duplicates(conn, table)
+
+        if statement is None:
+            present = existing_hashes(
+                conn, table, [scalars[HASH_COLUMN] for scalars, _ in split]
+            )
+            kept = [
+                (document, pair)
+                for document, pair in zip(documents, split)
+                if pair[0][HASH_COLUMN] not in present
+            ]
+            documents = [document for document, _ in kept]
+            split = [pair for _, pair in kept]
+            statement = table.insert()
+
+        if not split:
+            return [], [], []
+
+        inserted = dict(
+            conn.execute(
+                statement.returning(table.c[HASH_COLUMN], table.c.id),
+                self._uniform([scalars for scalars, _ in split]),
+            ).all()
+        )
+
+        kept = [
+            (inserted[pair[0][HASH_COLUMN]], document, pair)
+            for document, pair in zip(documents, split)
+            if pair[0][HASH_COLUMN] in inserted
+        ]
+        return (
+            [item_id for item_id, _, _ in kept],
+            [document for _, document, _ in kept],
+            [pair for _, _, pair in kept],
+        )
+
+    def _sync_tables(
+        self,
+        table_name: str,
+        previous: Dict[str, Any],
+        schema: Dict[str, Any],
+    ) -> None:
+        """
+        Create missing tables, add missing columns and widen changed types.
+        """
+
+        engine = self.database.engine
+        inspector = inspect(engine)
+        existing_tables = set(inspector.get_table_names())
+        preparer = engine.dialect.identifier_preparer
+
+        models = [
+            model
+            for main_model, children in self._all_targets(table_name)
+            for model in (main_model, *children.values())
+        ]
+
+        with engine.begin() as conn:
+            for model in models:
+                table = model.__table__
+
+                if table.name not in existing_tables:
+                    table.create(conn)
+                    continue
+
+                present = {c["name"] for c in inspector.get_columns(table.name)}
+
+                for column in table.columns:
+                    if column.name in present:
+                        continue
+                    spec = CreateColumn(column).compile(dialect=engine.dialect)
+                    conn.execute(
+                        text(
+                            f"ALTER TABLE {preparer.format_table(table)} "
+                            f"ADD COLUMN {spec}"
+                        )
+                    )
+
+            for table, column, old_type, new_type in self._widened_columns(
+                table_name, previous, schema
+            ):
+                self._widen_column(conn, table, column, old_type, new_type)
+
+    def _widened_columns(
+        self,
+        table_name: str,
+        previous: Dict[str, Any],
+        schema: Dict[str, Any],
+    ) -> List[tuple]:
+        """
+        (table, column, old type, new type) for changed scalar types.
+        """
+
+        changed = []
+
+        def compare(model, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+            for field, new_type in new.items():
+                old_type = old.get(field)
+                if isinstance(new_type, dict) or isinstance(old_type, dict):
+                    continue
+                if old_type is not None and old_type != new_type:
+                    changed.append(
+                        (model.__table__, model.__table__.c[field], old_type, new_type)
+                    )
+
+        for main_model, children in self._all_targets(table_name):
+            compare(main_model, previous, schema)
+
+            for field, child in children.items():
+                if isinstance(previous.get(field), dict):
+                    compare(child, previous[field], schema[field])
+
+        return changed
+
+    def _widen_column(
+        self,
+        conn: Any,
+        table: Any,
+        column: Any,
+        old_type: str,
+        new_type: str,
+    ) -> None:
+        """
+        Change a column's declared type in place.
+
+        SQLite columns are dynamically typed and mostly need no DDL; values
+        stored in a compact form (UUID blobs, integer dates and timestamps)
+        are rewritten for their new type, and numeric or boolean columns
+        widening to string are rebuilt so their affinity no longer
+        converts text to numbers.
+        """
+
+        dialect = conn.dialect
+        preparer = dialect.identifier_preparer
+        name = preparer.quote(column.name)
+
+        if dialect.name == "sqlite":
+            rebuild = SQLITE_REBUILDS.get((old_type, new_type))
+            if rebuild is not None:
+                # The full-text triggers name the column, which blocks DROP
+                search = self._options.get(table.name, {}).get("search") or []
+                if column.name in search:
+                    self.search_index.drop(conn, table.name)
+                self._rebuild_sqlite_column(conn, table, column, rebuild)
+                if column.name in search:
+                    self.search_index.ensure(conn, table, search)
+                return
+
+            conversion = SQLITE_WIDENING.get((old_type, new_type))
+            if conversion is not None:
+                expression, storage_class = conversion
+                conn.execute(
+                    text(
+                        f"UPDATE {preparer.format_table(table)} "
+                        f"SET {name} = {expression(name)} "
+                        f"WHERE typeof({name}) = '{storage_class}'"
+                    )
+                )
+            return
+
+        if dialect.name != "postgresql":
+            logger.warning(
+                "Cannot widen %s.%s on %s; column type left unchanged",
+                table.name,
+                column.name,
+                dialect.name,
+            )
+            return
+
+        type_sql = column.type.compile(dialect=dialect)
+        conn.execute(
+            text(
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ALTER COLUMN {name} TYPE {type_sql} USING {name}::{type_sql}"
+            )
+        )
+
+    @staticmethod
+    def _rebuild_sqlite_column(
+        conn: Any,
+        table: Any,
+        column: Any,
+        expression: Callable[[str], str],
+    ) -> None:
+        """
+        Replace a SQLite column by one of its new declared type.
+        """
+
+        preparer = conn.dialect.identifier_preparer
+        table_sql = preparer.format_table(table)
+        name = preparer.quote(column.name)
+        staging = preparer.quote(f"{column.name}__widened")
+        type_sql = column.type.compile(dialect=conn.dialect)
+
+        for statement in (
+            f"ALTER TABLE {table_sql} ADD COLUMN {staging} {type_sql}",
+            f"UPDATE {table_sql} SET {staging} = {expression(name)}",
+            f"ALTER TABLE {table_sql} DROP COLUMN {name}",
+            f"ALTER TABLE {table_sql} RENAME COLUMN {staging} TO {name}",
+        ):
+            conn.execute(text(statement))
+
+    def _split_nested(
+        self,
+        data: Dict[str, Any],
+        children: Dict[str, Type[Any]],
+    ) -> tuple:
+        """
+        Separate nested objects (stored in child tables) from scalar fields.
+        """
+
+        if not children:
+            return data, {}
+
+        scalars = {k: v for k, v in data.items() if k not in children}
+        nested = {
+            k: v for k, v in data.items() if k in children and isinstance(v, dict)
+        }
+        return scalars, nested
+
+    def _attach_children(
+        self,
+        conn: Any,
+        children: Dict[str, Type[Any]],
+        rows: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Load nested objects for serialized parent rows (one query per child).
+
+        `conn` is a Connection or a Session.
+        """
+
+        if not children or not rows:
+            return
+
+        ids = [row["id"] for row in rows]
+
+        for field, child_model in children.items():
+            table = child_model.__table__
+            columns = tuple(
+                c.name for c in table.columns if c.name not in _CHILD_META_COLUMNS
+            )
+            statement = self.statements.select_children(
+                table, ("parent_id", *columns)
+            )
+            by_parent = {
+                child["parent_id"]: {k: child[k] for k in columns}
+                for child in conn.execute(statement, {"ids": ids}).mappings()
+            }
+            for row in rows:
+                row[field] = by_parent.get(row["id"])
 
     def _serialize(self, instance: Any) -> Dict[str, Any]:
         """
@@ -167,6 +1627,7 @@ class Repository:
         result = {}
 
         for column in instance.__table__.columns:
-            result[column.name] = getattr(instance, column.name)
+            if column.name != HASH_COLUMN:
+                result[column.name] = getattr(instance, column.name)
 
         return result
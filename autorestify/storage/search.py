@@ -0,0 +1,156 @@
+"""
+Full-text search for AutoRESTify.
+
+On SQLite, opted-in string fields are indexed in an FTS5 external-content
+table kept in sync with the main table by triggers, and queried with BM25
+ranking. Other backends fall back to a case-insensitive LIKE scan over the
+same fields (no ranking).
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, column, func, literal_column, or_, select, text
+from sqlalchemy import table as sql_table
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+
+
+def fts_table(table_name: str) -> str:
+    """
+    Name of the FTS index for a collection.
+
+    Three underscores cannot clash with child tables, whose suffix is a
+    sanitized field name that never starts with an underscore.
+    """
+    return f"{table_name}___fts"
+
+
+class SearchIndex:
+    """
+    Create, rebuild and query full-text indexes.
+    """
+
+    def supported(self, conn: Connection) -> bool:
+        return conn.dialect.name == "sqlite"
+
+    # ----------------------------------
+    # Index Management
+    # ----------------------------------
+
+    def ensure(self, conn: Connection, table: Any, fields: Sequence[str]) -> None:
+        """
+        (Re)create the index and its triggers for `fields`, then backfill.
+        """
+
+        if not self.supported(conn):
+            return
+
+        self.drop(conn, table.name)
+
+        if not fields:
+            return
+
+        q = conn.dialect.identifier_preparer.quote
+        name = fts_table(table.name)
+        columns = ", ".join(q(f) for f in fields)
+        new_values = ", ".join(f"new.{q(f)}" for f in fields)
+        old_values = ", ".join(f"old.{q(f)}" for f in fields)
+
+        statements = [
+            f"CREATE VIRTUAL TABLE {q(name)} USING fts5({columns}, "
+            f"content='{table.name}', content_rowid='id')",
+            f"CREATE TRIGGER {q(name + '_ai')} AFTER INSERT ON {q(table.name)} BEGIN "
+            f"INSERT INTO {q(name)}(rowid, {columns}) VALUES (new.id, {new_values}); "
+            f"END",
+            f"CREATE TRIGGER {q(name + '_ad')} AFTER DELETE ON {q(table.name)} BEGIN "
+            f"INSERT INTO {q(name)}({q(name)}, rowid, {columns}) "
+            f"VALUES ('delete', old.id, {old_values}); "
+            f"END",
+            f"CREATE TRIGGER {q(name + '_au')} AFTER UPDATE ON {q(table.name)} BEGIN "
+            f"INSERT INTO {q(name)}({q(name)}, rowid, {columns}) "
+            f"VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {q(name)}(rowid, {columns}) VALUES (new.id, {new_values}); "
+            f"END",
+            f"INSERT INTO {q(name)}({q(name)}) VALUES ('rebuild')",
+        ]
+
+        for statement in statements:
+            conn.execute(text(statement))
+
+    def drop(self, conn: Connection, table_name: str) -> None:
+        if not self.supported(conn):
+            return
+
+        q = conn.dialect.identifier_preparer.quote
+        name = fts_table(table_name)
+
+        for suffix in ("_ai", "_ad", "_au"):
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {q(name + suffix)}"))
+        conn.execute(text(f"DROP TABLE IF EXISTS {q(name)}"))
+
+    # ----------------------------------
+    # Queries
+    # ----------------------------------
+
+    def search(
+        self,
+        conn: Connection,
+        table: Any,
+        query: str,
+        fields: Sequence[str],
+        limit: int,
+        offset: int,
+    ) -> List[Tuple[Dict[str, Any], Optional[float]]]:
+        """
+        Return (row, score) pairs, best match first.
+
+        Lower BM25 scores are better, as reported by SQLite.
+        """
+
+        if self.supported(conn):
+            return self._search_fts(conn, table, query, fields, limit, offset)
+        return self._search_like(conn, table, query, fields, limit, offset)
+
+    def _search_fts(self, conn, table, query, fields, limit, offset):
+        name = fts_table(table.name)
+        quoted = conn.dialect.identifier_preparer.quote(name)
+        index = sql_table(name, column("rowid"))
+        score = func.bm25(literal_column(quoted)).label("_score")
+        match = "{" + " ".join(fields) + "} : (" + query + ")"
+
+        statement = (
+            select(table, score)
+            .join_from(table, index, table.c.id == index.c.rowid)
+            .where(text(f"{quoted} MATCH :match").bindparams(match=match))
+            .order_by(score)
+            .limit(limit)
+            .offset(offset)
+        )
+
+        try:
+            rows = conn.execute(statement).mappings().all()
+        except OperationalError as e:
+            raise ValueError(f"Invalid search query: {e.orig}") from e
+
+        results = []
+        for row in rows:
+            record = dict(row)
+            score_value = record.pop("_score")
+            results.append((record, score_value))
+        return results
+
+    def _search_like(self, conn, table, query, fields, limit, offset):
+        terms = [term for term in query.split() if term]
+        conditions = [
+            or_(*(table.c[f].ilike(f"%{term}%") for f in fields)) for term in terms
+        ]
+
+        statement = (
+            select(table)
+            .where(and_(*conditions))
+            .order_by(table.c.id)
+            .limit(limit)
+            .offset(offset)
+        )
+
+        return [(dict(row), None) for row in conn.execute(statement).mappings()]
@@ -0,0 +1,176 @@
+"""
+Statement cache for AutoRESTify.
+
+The SQL of a CRUD operation only depends on the table and the columns
+involved, so `Repository` builds each Core statement once and reuses it.
+Statements memoize their cache key, under which the engine's compiled
+cache keeps one compiled form per set of parameter columns, so hot paths
+skip both statement construction and compilation.
+"""
+
+import threading
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import Table, bindparam, delete, select, update
+from sqlalchemy.sql import Executable
+
+# Parameter holding the row key in update_by / delete_by statements
+KEY_PARAM = "_autorestify_key"
+
+
+class StatementCache:
+    """
+    Core statements per table, operation and column set.
+
+    Statements are kept per Table object: when a collection's schema
+    version changes its models, and tables, are rebuilt, so the statements
+    of the previous version are dropped on first use of the new one.
+
+    Args:
+        max_per_table: Statements kept per table; the cache of a table is
+            cleared when full (column sets are few in practice)
+    """
+
+    def __init__(self, max_per_table: int = 256) -> None:
+        self.max_per_table = max_per_table
+        self._tables: Dict[str, Tuple[Table, Dict[Hashable, Executable]]] = {}
+        self._lock = threading.Lock()
+
+    # ----------------------------------
+    # Public API
+    # ----------------------------------
+
+    def get(
+        self,
+        table: Table,
+        key: Hashable,
+        build: Callable[[], Executable],
+    ) -> Executable:
+        """
+        Cached statement for `table` and `key`, built on first use.
+        """
+
+        entry = self._tables.get(table.name)
+        if entry is not None and entry[0] is table:
+            statement = entry[1].get(key)
+            if statement is not None:
+                return statement
+
+        statement = build()
+
+        with self._lock:
+            entry = self._tables.get(table.name)
+            if entry is None or entry[0] is not table:
+                entry = (table, {})
+                self._tables[table.name] = entry
+            if len(entry[1]) >= self.max_per_table:
+                entry[1].clear()
+            entry[1][key] = statement
+
+        return statement
+
+    def invalidate(self, table_name: Optional[str] = None) -> None:
+        """
+        Drop the statements of one table, or of every table.
+        """
+        with self._lock:
+            if table_name is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(table_name, None)
+
+    # ----------------------------------
+    # Statements
+    # ----------------------------------
+
+    def select_by_id(self, table: Table, columns: Tuple[str, ...]) -> Executable:
+        """
+        SELECT columns WHERE id = :id
+        """
+        return self.get(
+            table,
+            ("get", columns),
+            lambda: select(*(table.c[c] for c in columns)).where(
+                table.c.id == bindparam("id")
+            ),
+        )
+
+    def select_by_ids(self, table: Table, columns: Tuple[str, ...]) -> Executable:
+        """
+        SELECT columns WHERE id IN :ids
+        """
+        return self.get(
+            table,
+            ("get_many", columns),
+            lambda: select(*(table.c[c] for c in columns)).where(
+                table.c.id.in_(bindparam("ids", expanding=True))
+            ),
+        )
+
+    def select_page(
+        self,
+        table: Table,
+        columns: Tuple[str, ...],
+        ordered: bool = False,
+    ) -> Executable:
+        """
+        SELECT columns [ORDER BY id] LIMIT :limit
+        """
+
+        def build() -> Executable:
+            statement = select(*(table.c[c] for c in columns))
+            if ordered:
+                statement = statement.order_by(table.c.id)
+            return statement.limit(bindparam("limit"))
+
+        return self.get(table, ("list", columns, ordered), build)
+
+    def select_children(self, table: Table, columns: Tuple[str, ...]) -> Executable:
+        """
+        SELECT columns WHERE parent_id IN :ids
+        """
+        return self.get(
+            table,
+            ("children", columns),
+            lambda: select(*(table.c[c] for c in columns)).where(
+                table.c.parent_id.in_(bindparam("ids", expanding=True))
+            ),
+        )
+
+    def insert(self, table: Table) -> Executable:
+        """
+        INSERT of the columns passed as parameters.
+        """
+        return self.get(table, ("insert",), table.insert)
+
+    def update_by(self, table: Table, key_column: str) -> Executable:
+        """
+        UPDATE SET <parameter columns> WHERE key_column = :key
+        """
+        return self.get(
+            table,
+            ("update", key_column),
+            lambda: update(table).where(table.c[key_column] == bindparam(KEY_PARAM)),
+        )
+
+    def exists_by(self, table: Table, key_column: str) -> Executable:
+        """
+        SELECT key_column WHERE key_column = :key LIMIT 1
+        """
+        return self.get(
+            table,
+            ("exists", key_column),
+            lambda: select(table.c[key_column])
+            .where(table.c[key_column] == bindparam(KEY_PARAM))
+            .limit(1),
+        )
+
+    def delete_by(self, table: Table, key_column: str) -> Executable:
+        """
+        DELETE WHERE key_column = :key
+        """
+        return self.get(
+            table,
+            ("delete", key_column),
+            lambda: delete(table).where(table.c[key_column] == bindparam(KEY_PARAM)),
+        )
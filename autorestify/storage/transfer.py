@@ -0,0 +1,229 @@
+"""
+Bulk transfer formats for AutoRESTify.
+
+Incremental CSV / NDJSON encoders and parsers used by the export and
+import endpoints. Everything works chunk by chunk so memory stays
+bounded by the batch size, not the collection size.
+"""
+
+import codecs
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from pydantic import TypeAdapter
+
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# Server-managed columns ignored on import
+META_COLUMNS = ("id", "created_at")
+
+# Parse errors kept in detail; later ones are only counted
+MAX_PARSE_ERRORS = 100
+
+
+# =========================================================
+# Encoders
+# =========================================================
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def encode_csv(
+    batches: Iterable[List[Dict[str, Any]]],
+    columns: List[str],
+) -> Iterator[bytes]:
+    """
+    Encode record batches as CSV, one chunk per batch.
+    """
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    for batch in batches:
+        writer.writerows([[_csv_value(row.get(c)) for c in columns] for row in batch])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def encode_ndjson(
+    batches: Iterable[List[Dict[str, Any]]],
+    adapter: TypeAdapter,
+) -> Iterator[bytes]:
+    """
+    Encode record batches as newline-delimited JSON, one chunk per batch.
+    """
+
+    for batch in batches:
+        yield b"".join(adapter.dump_json(row) + b"\n" for row in batch)
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Gzip a stream of chunks incrementally.
+    """
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+
+    yield compressor.flush()
+
+
+# =========================================================
+# Parsers
+# =========================================================
+
+def _record_error(parser: Any, error: str) -> None:
+    parser.failed += 1
+    if len(parser.errors) < MAX_PARSE_ERRORS:
+        parser.errors.append({"line": parser.line, "error": error})
+
+
+class NDJSONParser:
+    """
+    Incremental newline-delimited JSON parser.
+
+    Malformed lines are skipped and counted in `failed`; the first
+    MAX_PARSE_ERRORS are reported in `errors`.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._tail = ""
+        self.line = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        text = self._tail + self._decoder.decode(chunk)
+        lines = text.split("\n")
+        self._tail = lines.pop()
+        return self._parse(lines)
+
+    def close(self) -> List[Any]:
+        text = self._tail + self._decoder.decode(b"", final=True)
+        self._tail = ""
+        return self._parse([text])
+
+    def _parse(self, lines: List[str]) -> List[Any]:
+        records = []
+        for line in lines:
+            self.line += 1
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as exc:
+                _record_error(self, f"invalid JSON ({exc.msg})")
+        return records
+
+
+class CSVParser:
+    """
+    Incremental CSV parser; the first record is the header.
+
+    Lines are only handed to the csv module once quotes are balanced, so
+    quoted fields may span chunks and lines. Problems are counted in
+    `failed` and the first MAX_PARSE_ERRORS reported in `errors`.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._tail = ""
+        self._pending = ""
+        self.header: Optional[List[str]] = None
+        self.line = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def feed(self, chunk: bytes) -> List[Dict[str, str]]:
+        text = self._tail + self._decoder.decode(chunk)
+        lines = text.split("\n")
+        self._tail = lines.pop()
+        return self._parse(lines)
+
+    def close(self) -> List[Dict[str, str]]:
+        text = self._tail + self._decoder.decode(b"", final=True)
+        self._tail = ""
+        records = self._parse([text] if text else [])
+        if self._pending:
+            _record_error(self, "unterminated quoted field")
+            self._pending = ""
+        return records
+
+    def _parse(self, lines: List[str]) -> List[Dict[str, str]]:
+        complete = []
+
+        for line in lines:
+            self.line += 1
+            self._pending += line + "\n"
+            if self._pending.count('"') % 2 == 0:
+                complete.append(self._pending)
+                self._pending = ""
+
+        records = []
+        for values in csv.reader(complete):
+            if not values:
+                continue
+            if self.header is None:
+                self.header = values
+                continue
+            records.append(dict(zip(self.header, values)))
+
+        return records
+
+
+PARSERS = {
+    "csv": CSVParser,
+    "ndjson": NDJSONParser,
+}
+
+
+def coerce_csv_record(
+    record: Dict[str, str],
+    schema: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Prepare CSV text values for validation against the collection schema.
+
+    Empty cells become missing fields; arrays and nested objects are
+    decoded from JSON. Scalar conversion is left to the validator.
+    """
+
+    document: Dict[str, Any] = {}
+
+    for field, value in record.items():
+        if value == "" or field in META_COLUMNS:
+            continue
+        field_type = schema.get(field)
+        if isinstance(field_type, dict) or field_type == "array":
+            value = json.loads(value)
+        document[field] = value
+
+    return document
@@ -0,0 +1,11 @@
+"""
+Benchmark suite for AutoRESTify.
+
+Measures the ingestion, inference and CRUD hot paths offline against
+in-memory and file-backed SQLite.
+
+Usage:
+
+    python -m benchmarks run --output results.json
+    python -m benchmarks compare baseline.json results.json --threshold 0.2
+"""
@@ -0,0 +1,41 @@
+"""
+Command line interface for the benchmark suite.
+"""
+
+import argparse
+import sys
+
+from .harness import compare, write_report
+from .suites import run_all
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmark suite")
+    run.add_argument("--output", "-o", help="Write JSON results to this file")
+    run.add_argument("--quick", action="store_true", help="Smaller sizes and rounds")
+
+    diff = commands.add_parser("compare", help="Compare two result files")
+    diff.add_argument("baseline")
+    diff.add_argument("current")
+    diff.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed relative slowdown of the median (default: 0.2)",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        write_report(run_all(quick=args.quick), args.output, seed=0)
+        return 0
+
+    regressions = compare(args.baseline, args.current, args.threshold)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
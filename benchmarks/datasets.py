@@ -0,0 +1,90 @@
+"""
+Synthetic document generators for the benchmark suite.
+
+All generators are seeded so repeated runs produce identical data.
+"""
+
+import random
+import string
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+
+def _word(rng: random.Random, size: int = 8) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=size))
+
+
+def flat_documents(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Generate flat documents with mixed scalar fields.
+    """
+
+    rng = random.Random(seed)
+
+    return [
+        {
+            "name": _word(rng),
+            "email": f"{_word(rng, 6)}@example.com",
+            "age": rng.randint(18, 90),
+            "score": round(rng.uniform(0, 100), 3),
+            "active": rng.random() < 0.5,
+            "tags": [_word(rng, 4) for _ in range(rng.randint(0, 3))],
+        }
+        for _ in range(count)
+    ]
+
+
+def nested_documents(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Generate documents with one level of nested objects.
+    """
+
+    rng = random.Random(seed)
+
+    return [
+        {
+            "name": _word(rng),
+            "age": rng.randint(18, 90),
+            "address": {
+                "street": _word(rng, 12),
+                "number": rng.randint(1, 9999),
+                "city": _word(rng, 6),
+                "geo": {"lat": rng.uniform(-90, 90), "lng": rng.uniform(-180, 180)},
+            },
+            "profile": {
+                "bio": _word(rng, 32),
+                "verified": rng.random() < 0.5,
+            },
+        }
+        for _ in range(count)
+    ]
+
+
+def typed_documents(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Generate documents with timestamps, dates, UUIDs and 64-bit ids.
+    """
+
+    rng = random.Random(seed)
+    epoch = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    return [
+        {
+            "external_id": 10**12 + rng.randint(0, 10**9),
+            "uuid": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "created": (epoch + timedelta(seconds=rng.randint(0, 10**7)))
+            .isoformat()
+            .replace("+00:00", "Z"),
+            "birthday": (date(1950, 1, 1) + timedelta(days=rng.randint(0, 20000)))
+            .isoformat(),
+            "name": _word(rng),
+        }
+        for _ in range(count)
+    ]
+
+
+DATASETS = {
+    "flat": flat_documents,
+    "nested": nested_documents,
+}
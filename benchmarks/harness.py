@@ -0,0 +1,130 @@
+"""
+Timing and reporting utilities for the benchmark suite.
+"""
+
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class Result:
+    """
+    Timing summary for a single benchmark.
+    """
+
+    name: str
+    rounds: int
+    median_s: float
+    min_s: float
+    max_s: float
+    ops: int = 1
+    size_bytes: Optional[int] = None
+
+    @property
+    def ops_per_s(self) -> float:
+        return self.ops / self.median_s if self.median_s else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["ops_per_s"] = self.ops_per_s
+        return data
+
+
+def summarize(
+    name: str,
+    timings: List[float],
+    ops: int = 1,
+    size_bytes: Optional[int] = None,
+) -> Result:
+    return Result(
+        name=name,
+        rounds=len(timings),
+        median_s=statistics.median(timings),
+        min_s=min(timings),
+        max_s=max(timings),
+        ops=ops,
+        size_bytes=size_bytes,
+    )
+
+
+def measure(
+    name: str,
+    func: Callable[[], Any],
+    rounds: int = 5,
+    ops: int = 1,
+    setup: Optional[Callable[[], Any]] = None,
+) -> Result:
+    """
+    Time `func` over several rounds, running `setup` untimed before each.
+    """
+
+    timings: List[float] = []
+
+    for _ in range(rounds):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    return summarize(name, timings, ops)
+
+
+def environment() -> Dict[str, Any]:
+    import sqlalchemy
+
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def write_report(results: List[Result], path: Optional[str], seed: int) -> None:
+    report = {
+        "meta": {**environment(), "seed": seed},
+        "results": {r.name: r.to_dict() for r in results},
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+
+    if path:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+
+def compare(baseline_path: str, current_path: str, threshold: float) -> int:
+    """
+    Compare two reports; return the number of regressions beyond threshold.
+    """
+
+    with open(baseline_path, encoding="utf-8") as fh:
+        baseline = json.load(fh)["results"]
+    with open(current_path, encoding="utf-8") as fh:
+        current = json.load(fh)["results"]
+
+    regressions = 0
+
+    for name in sorted(set(baseline) & set(current)):
+        before = baseline[name]["median_s"]
+        after = current[name]["median_s"]
+        change = (after - before) / before if before else 0.0
+        status = "ok"
+
+        if change > threshold:
+            status = "REGRESSION"
+            regressions += 1
+
+        print(f"{status:<10} {name:<55} {before:.6f}s -> {after:.6f}s ({change:+.1%})")
+
+    for name in sorted(set(baseline) - set(current)):
+        print(f"{'missing':<10} {name}")
+
+    return regressions
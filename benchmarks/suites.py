@@ -0,0 +1,384 @@
+"""
+Benchmark scenarios for AutoRESTify hot paths.
+
+Each scenario builds its own application and database so results do not
+depend on execution order.
+"""
+
+import asyncio
+import csv
+import io
+import itertools
+import json
+import os
+import tempfile
+import time
+from typing import Iterator, List, Sequence
+
+import httpx
+
+from autorestify.api.app_factory import create_app
+from autorestify.core.schema_inference import SchemaInferer
+from autorestify.storage.base import Database
+from autorestify.storage.repository import Repository
+from autorestify.storage.statements import StatementCache
+
+from .datasets import DATASETS, flat_documents, typed_documents
+from .harness import Result, measure, summarize
+
+
+BACKENDS = ("memory", "file")
+
+_names: Iterator[int] = itertools.count()
+
+
+def _collection(prefix: str) -> str:
+    """
+    Unique collection name per scenario round.
+    """
+    return f"bench_{prefix}_{os.getpid()}_{next(_names)}"
+
+
+def _database(backend: str, workdir: str) -> Database:
+    if backend == "memory":
+        return Database(database_url="sqlite:///:memory:")
+    path = os.path.join(workdir, f"bench_{next(_names)}.db")
+    return Database(database_url=f"sqlite:///{path}")
+
+
+def _client(database: Database) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=create_app(database=database))
+    return httpx.AsyncClient(transport=transport, base_url="http://bench")
+
+
+# =========================================================
+# Scenarios
+# =========================================================
+
+def bench_inference(sizes: Sequence[int], rounds: int) -> List[Result]:
+    inferer = SchemaInferer()
+    results = []
+
+    for kind, generator in DATASETS.items():
+        for size in sizes:
+            documents = generator(size)
+            results.append(
+                measure(
+                    f"infer[{kind}-{size}]",
+                    lambda: inferer.infer(documents),
+                    rounds=rounds,
+                    ops=size,
+                )
+            )
+
+    return results
+
+
+def bench_types(sizes: Sequence[int], rounds: int, workdir: str) -> List[Result]:
+    """
+    Default vs rich type detection: inference throughput, insert time and
+    on-disk size of timestamp / date / UUID / 64-bit id columns.
+    """
+
+    results = []
+
+    for mode, size in itertools.product(("default", "rich"), sizes):
+        documents = typed_documents(size)
+        inferer = SchemaInferer(rich_types=mode == "rich")
+
+        results.append(
+            measure(
+                f"infer[typed-{mode}-{size}]",
+                lambda: inferer.infer(documents),
+                rounds=rounds,
+                ops=size,
+            )
+        )
+
+        timings = []
+        for _ in range(rounds):
+            path = os.path.join(workdir, f"bench_{next(_names)}.db")
+            database = Database(database_url=f"sqlite:///{path}")
+            repository = Repository(database)
+            repository.create_tables_from_schema("typed", inferer.infer(documents))
+            adapter = repository.get_types("typed").input
+
+            started = time.perf_counter()
+            repository.insert_many(
+                "typed", [adapter.validate_python(doc) for doc in documents]
+            )
+            timings.append(time.perf_counter() - started)
+
+            with database.engine.connect() as conn:
+                conn.exec_driver_sql("VACUUM")
+            database.engine.dispose()
+            size_bytes = os.path.getsize(path)
+
+        results.append(
+            summarize(
+                f"store[typed-{mode}-{size}]", timings, ops=size, size_bytes=size_bytes
+            )
+        )
+
+    return results
+
+
+def bench_upload(sizes: Sequence[int], rounds: int, workdir: str) -> List[Result]:
+    results = []
+
+    for backend, kind, size in itertools.product(BACKENDS, DATASETS, sizes):
+        documents = DATASETS[kind](size)
+
+        async def run() -> List[float]:
+            timings = []
+            for _ in range(rounds):
+                async with _client(_database(backend, workdir)) as client:
+                    payload = {
+                        "collection": _collection("upload"),
+                        "documents": documents,
+                    }
+                    started = time.perf_counter()
+                    response = await client.post("/upload", json=payload)
+                    timings.append(time.perf_counter() - started)
+                    response.raise_for_status()
+            return timings
+
+        timings = asyncio.run(run())
+        results.append(
+            summarize(f"upload[{backend}-{kind}-{size}]", timings, ops=size)
+        )
+
+    return results
+
+
+def _encode(documents: List[dict], fmt: str) -> bytes:
+    if fmt == "ndjson":
+        return "\n".join(json.dumps(doc) for doc in documents).encode()
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(documents[0]))
+    writer.writeheader()
+    for doc in documents:
+        writer.writerow({**doc, "tags": json.dumps(doc["tags"])})
+    return buffer.getvalue().encode()
+
+
+def bench_transfer(sizes: Sequence[int], rounds: int, workdir: str) -> List[Result]:
+    """
+    Rows per second through /_import and /_export; compare with upload[...].
+    """
+
+    results = []
+
+    for backend, size in itertools.product(BACKENDS, sizes):
+        documents = flat_documents(size)
+
+        async def run() -> List[Result]:
+            scenario = []
+            timings = {"import-ndjson": [], "import-csv": [], "export-ndjson": []}
+
+            for _ in range(rounds):
+                async with _client(_database(backend, workdir)) as client:
+                    collection = _collection("transfer")
+                    seed = {"collection": collection, "documents": documents[:1]}
+                    (await client.post("/upload", json=seed)).raise_for_status()
+
+                    for fmt in ("ndjson", "csv"):
+                        body = _encode(documents, fmt)
+                        started = time.perf_counter()
+                        response = await client.post(
+                            f"/{collection}/_import",
+                            params={"format": fmt},
+                            content=body,
+                        )
+                        timings[f"import-{fmt}"].append(time.perf_counter() - started)
+                        response.raise_for_status()
+
+                    started = time.perf_counter()
+                    response = await client.get(
+                        f"/{collection}/_export", params={"format": "ndjson"}
+                    )
+                    timings["export-ndjson"].append(time.perf_counter() - started)
+                    response.raise_for_status()
+
+            for name, values in timings.items():
+                ops = size * 2 + 1 if name.startswith("export") else size
+                scenario.append(
+                    summarize(f"transfer[{backend}-{name}-{size}]", values, ops=ops)
+                )
+            return scenario
+
+        results.extend(asyncio.run(run()))
+
+    return results
+
+
+def bench_list(
+    limits: Sequence[int],
+    rows: int,
+    rounds: int,
+    workdir: str,
+) -> List[Result]:
+    results = []
+
+    for backend in BACKENDS:
+
+        async def run() -> List[Result]:
+            collection = _collection("list")
+            scenario = []
+
+            async with _client(_database(backend, workdir)) as client:
+                payload = {"collection": collection, "documents": flat_documents(rows)}
+                (await client.post("/upload", json=payload)).raise_for_status()
+
+                for limit in limits:
+                    timings = []
+                    for _ in range(rounds):
+                        started = time.perf_counter()
+                        response = await client.get(
+                            f"/{collection}", params={"limit": limit}
+                        )
+                        timings.append(time.perf_counter() - started)
+                        response.raise_for_status()
+                    scenario.append(
+                        summarize(f"list[{backend}-limit{limit}]", timings, ops=limit)
+                    )
+
+            return scenario
+
+        results.extend(asyncio.run(run()))
+
+    return results
+
+
+def bench_crud(
+    concurrency: int,
+    iterations: int,
+    rounds: int,
+    workdir: str,
+) -> List[Result]:
+    results = []
+
+    for backend in BACKENDS:
+
+        async def worker(client: httpx.AsyncClient, collection: str) -> None:
+            for i in range(iterations):
+                response = await client.post(
+                    f"/{collection}", json={"name": "bench", "age": i}
+                )
+                item_id = response.json()["id"]
+                await client.get(f"/{collection}/{item_id}")
+                await client.put(f"/{collection}/{item_id}", json={"age": i + 1})
+                await client.delete(f"/{collection}/{item_id}")
+
+        async def run() -> List[float]:
+            collection = _collection("crud")
+            timings = []
+
+            async with _client(_database(backend, workdir)) as client:
+                payload = {"collection": collection, "documents": flat_documents(10)}
+                (await client.post("/upload", json=payload)).raise_for_status()
+
+                for _ in range(rounds):
+                    started = time.perf_counter()
+                    await asyncio.gather(
+                        *(worker(client, collection) for _ in range(concurrency))
+                    )
+                    timings.append(time.perf_counter() - started)
+
+            return timings
+
+        timings = asyncio.run(run())
+        results.append(
+            summarize(
+                f"crud[{backend}-c{concurrency}]",
+                timings,
+                ops=concurrency * iterations * 4,
+            )
+        )
+
+    return results
+
+
+class _UncachedStatements(StatementCache):
+    """
+    Builds every statement again on each call, as before the cache.
+    """
+
+    def get(self, table, key, build):
+        return build()
+
+
+def bench_statements(iterations: int, rounds: int) -> List[Result]:
+    """
+    Repository CRUD calls with cached vs rebuilt Core statements.
+
+    Per-call saving = median_s / ops of the `rebuilt` row minus the same
+    for the `cached` row.
+    """
+
+    results = []
+
+    for mode in ("rebuilt", "cached"):
+        repository = Repository(Database(database_url="sqlite:///:memory:"))
+        if mode == "rebuilt":
+            repository.statements = _UncachedStatements()
+
+        schema = {"name": "string", "age": "integer", "address": {"city": "string"}}
+        repository.create_tables_from_schema("people", schema)
+        document = {"name": "ann", "age": 30, "address": {"city": "Lisbon"}}
+        repository.insert_many("people", [document] * 100)
+
+        def get() -> None:
+            for i in range(iterations):
+                repository.get("people", i % 100 + 1)
+
+        def page() -> None:
+            for _ in range(iterations):
+                repository.list("people", limit=10)
+
+        def update() -> None:
+            for i in range(iterations):
+                repository.update("people", i % 100 + 1, {"age": i})
+
+        def insert_delete() -> None:
+            for _ in range(iterations):
+                repository.delete("people", repository.insert("people", document))
+
+        for op, func, ops in (
+            ("get", get, iterations),
+            ("list10", page, iterations),
+            ("update", update, iterations),
+            ("insert-delete", insert_delete, iterations * 2),
+        ):
+            results.append(
+                measure(f"statements[{mode}-{op}]", func, rounds=rounds, ops=ops)
+            )
+
+    return results
+
+
+# =========================================================
+# Entry Point
+# =========================================================
+
+def run_all(quick: bool = False) -> List[Result]:
+    sizes = (100, 1000) if quick else (100, 1000, 10000)
+    limits = (10, 100, 1000) if quick else (10, 100, 1000, 5000)
+    rounds = 3 if quick else 5
+
+    with tempfile.TemporaryDirectory(prefix="autorestify-bench-") as workdir:
+        results: List[Result] = []
+        results.extend(bench_inference(sizes, rounds))
+        results.extend(bench_statements(iterations=1000, rounds=rounds))
+        results.extend(bench_types(sizes, rounds, workdir))
+        results.extend(bench_upload(sizes, rounds, workdir))
+        results.extend(bench_transfer(sizes, rounds, workdir))
+        results.extend(
+            bench_list(limits, rows=max(limits), rounds=rounds * 4, workdir=workdir)
+        )
+        results.extend(
+            bench_crud(concurrency=16, iterations=5, rounds=rounds, workdir=workdir)
+        )
+
+    return results
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from autorestify.api.app_factory import create_app
+from autorestify.core.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    ConcurrencyLimit,
+)
+from autorestify.storage.base import Database
+
+
+def test_rate_limit_returns_429_with_retry_after():
+    admission = AdmissionController(rate=0.01, burst=2, queue_timeout=0)
+    database = Database(database_url="sqlite:///:memory:")
+    client = TestClient(create_app(database=database, admission=admission))
+
+    payload = {"collection": "limited_items", "documents": [{"name": "Ana"}]}
+    assert client.post("/upload", json=payload).status_code == 200
+    assert client.get("/limited_items").status_code == 200
+
+    response = client.get("/limited_items")
+
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+
+    metrics = client.get("/_metrics").text
+    assert (
+        'autorestify_admission_rejected_total{class="default",reason="rate_limited"} 1'
+        in metrics
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_queues_then_sheds():
+    limit = ConcurrencyLimit(1)
+
+    assert await limit.acquire(timeout=0)
+
+    # Waits and is handed the slot when it is released
+    waiter = asyncio.create_task(limit.acquire(timeout=1))
+    await asyncio.sleep(0.01)
+    assert limit.queued == 1
+    limit.release()
+    assert await waiter is True
+    assert limit.active == 1
+
+    # Sheds once the deadline passes
+    assert await limit.acquire(timeout=0.01) is False
+    assert limit.queued == 0
+
+    limit.release()
+    assert limit.active == 0
+
+
+@pytest.mark.asyncio
+async def test_heavy_class_rejected_with_503():
+    admission = AdmissionController(concurrency={"upload": 1}, queue_timeout=0.01)
+
+    ticket = await admission.acquire("alice", "upload")
+
+    with pytest.raises(AdmissionRejected) as exc:
+        await admission.acquire("bob", "upload")
+
+    assert exc.value.status_code == 503
+
+    ticket.release()
+    (await admission.acquire("bob", "upload")).release()
+
+
+def test_non_positive_list_limits_cannot_bypass_the_large_list_cap():
+    admission = AdmissionController(
+        concurrency={"list_large": 0}, queue_timeout=0, large_list_threshold=10
+    )
+    database = Database(database_url="sqlite:///:memory:")
+    client = TestClient(create_app(database=database, admission=admission))
+
+    payload = {"collection": "capped_items", "documents": [{"n": i} for i in range(20)]}
+    assert client.post("/upload", json=payload).status_code == 200
+
+    assert client.get("/capped_items?limit=5").status_code == 200
+    assert client.get("/capped_items?limit=50").status_code == 503
+    for limit in (-1, 0):
+        assert client.get(f"/capped_items?limit={limit}").status_code == 422
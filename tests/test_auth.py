@@ -3,7 +3,7 @@ from fastapi import Request
 from starlette.datastructures import Headers
 from starlette.requests import Request as StarletteRequest
 
-from autorestify.core.security import SecurityManager
+from autorestify.core.security import AllowAllPolicy, AuthProvider, SecurityManager
 
 
 class DummyScope(dict):
@@ -27,3 +27,134 @@ async def test_default_security_allows_access():
     security.authorize_read(user, "resource")
     security.authorize_write(user, "resource")
     security.authorize_delete(user, "resource")
+
+
+class CountingProvider(AuthProvider):
+    def __init__(self):
+        self.calls = 0
+
+    async def authenticate(self, request):
+        self.calls += 1
+        token = request.headers.get("authorization")
+        return {"id": token} if token else None
+
+
+class CountingPolicy(AllowAllPolicy):
+    def __init__(self):
+        self.calls = 0
+
+    def can_read(self, user, resource):
+        self.calls += 1
+        return resource != "secret"
+
+
+def make_request(token=None):
+    scope = DummyScope()
+    if token:
+        scope["headers"] = [(b"authorization", token.encode())]
+    return StarletteRequest(scope)
+
+
+@pytest.mark.asyncio
+async def test_authentication_cache_and_revocation():
+    provider = CountingProvider()
+    security = SecurityManager(auth_provider=provider, cache_ttl=60)
+
+    user = await security.authenticate(make_request("Bearer a"))
+    assert await security.authenticate(make_request("Bearer a")) == user
+    assert provider.calls == 1
+
+    await security.authenticate(make_request("Bearer b"))
+    assert provider.calls == 2
+
+    security.revoke_credential(provider.credential_key(make_request("Bearer a")))
+    await security.authenticate(make_request("Bearer a"))
+    assert provider.calls == 3
+
+    # Failures are never cached
+    for _ in range(2):
+        with pytest.raises(PermissionError):
+            await security.authenticate(make_request())
+    assert provider.calls == 5
+
+
+def test_authorization_decision_cache_and_invalidation():
+    policy = CountingPolicy()
+    security = SecurityManager(access_policy=policy, cache_ttl=60)
+    user = {"id": 1}
+
+    security.authorize_read(user, "items")
+    security.authorize_read(user, "items")
+    assert policy.calls == 1
+
+    for _ in range(2):
+        with pytest.raises(PermissionError):
+            security.authorize_read(user, "secret")
+    assert policy.calls == 2
+
+    security.invalidate_resource("items")
+    security.authorize_read(user, "items")
+    assert policy.calls == 3
+
+    security.invalidate_principal(user)
+    security.authorize_read(user, "items")
+    assert policy.calls == 4
+
+
+class AddressProvider(AuthProvider):
+    async def authenticate(self, request):
+        return {"id": request.scope["client"][0]}
+
+
+@pytest.mark.asyncio
+async def test_requests_without_credentials_are_not_cached():
+    provider = AddressProvider()
+    security = SecurityManager(auth_provider=provider, cache_ttl=60)
+
+    requests = []
+    for address in ("10.0.0.1", "10.0.0.2"):
+        scope = DummyScope()
+        scope["client"] = (address, 1234)
+        requests.append(StarletteRequest(scope))
+
+    assert provider.credential_key(requests[0]) is None
+    assert (await security.authenticate(requests[0]))["id"] == "10.0.0.1"
+    assert (await security.authenticate(requests[1]))["id"] == "10.0.0.2"
+
+
+class Account:
+    def __init__(self, token):
+        self.token = token
+
+
+class AccountProvider(AuthProvider):
+    async def authenticate(self, request):
+        token = request.headers.get("authorization")
+        return Account(token) if token else None
+
+
+@pytest.mark.asyncio
+async def test_users_without_an_identifier_are_keyed_by_credential():
+    policy = CountingPolicy()
+    security = SecurityManager(auth_provider=AccountProvider(), access_policy=policy)
+
+    # Each request builds a new user object
+    first = await security.authenticate(make_request("Bearer a"))
+    again = await security.authenticate(make_request("Bearer a"))
+    other = await security.authenticate(make_request("Bearer b"))
+
+    assert first is not again
+    assert security.principal_id(first) == security.principal_id(again)
+    assert security.principal_id(first) != security.principal_id(other)
+    assert "Bearer" not in security.principal_id(first)
+
+    security = SecurityManager(
+        auth_provider=AccountProvider(), access_policy=policy, cache_ttl=60
+    )
+    for _ in range(2):
+        user = await security.authenticate(make_request("Bearer c"))
+        security.authorize_read(user, "items")
+    assert policy.calls == 1
+
+    with pytest.raises(TypeError):
+        security.principal_id(Account("Bearer d"))
@@ -0,0 +1,95 @@
+import pytest
+from sqlalchemy import event
+
+from autorestify.storage.base import Database
+from autorestify.storage.repository import Repository
+
+
+@pytest.fixture
+def repository():
+    repository = Repository(
+        Database(database_url="sqlite:///:memory:"), catalog_check_interval=60
+    )
+    schema = {"code": "string", "rate": "float", "meta": {"region": "string"}}
+    repository.create_tables_from_schema("currencies", schema, {"storage": "memory"})
+    repository.insert_many(
+        "currencies",
+        [
+            {"code": "EUR", "rate": 1.0, "meta": {"region": "eu"}},
+            {"code": "USD", "rate": 1.1},
+        ],
+    )
+    return repository
+
+
+def count_statements(engine):
+    statements = []
+    event.listen(
+        engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+    return statements
+
+
+def test_memory_backend_serves_reads_without_sql(repository: Repository):
+    assert [row["code"] for row in repository.list("currencies")] == ["EUR", "USD"]
+
+    statements = count_statements(repository.database.engine)
+    for _ in range(100):
+        row = repository.get("currencies", 1)
+        repository.list("currencies", limit=1)
+    assert statements == []
+    assert row["meta"] == {"region": "eu"}
+    assert row["created_at"] is not None
+    assert repository.get("currencies", 99) is None
+
+    new_id = repository.insert("currencies", {"code": "GBP", "rate": 0.9})
+    repository.update("currencies", 1, {"rate": 1.05, "meta": {"region": "ez"}})
+    repository.delete("currencies", 2)
+    assert statements
+
+    rows = repository.list("currencies")
+    assert [(row["id"], row["code"]) for row in rows] == [(1, "EUR"), (new_id, "GBP")]
+    assert repository.get("currencies", 1)["meta"] == {"region": "ez"}
+    assert repository.get("currencies", 1)["rate"] == 1.05
+    assert repository.get("currencies", 2) is None
+
+
+def test_memory_backend_follows_other_processes(repository: Repository):
+    other = Repository(repository.database, catalog_check_interval=60)
+    assert len(other.list("currencies")) == 2
+
+    repository.insert("currencies", {"code": "JPY"})
+    other.refresh_catalog(force=True)
+    assert [row["code"] for row in other.list("currencies")][-1] == "JPY"
+
+    # Back to SQL reads
+    repository.create_tables_from_schema("currencies", {}, {"storage": "sql"})
+    assert len(repository.list("currencies")) == 3
+
+    with pytest.raises(ValueError):
+        repository.create_tables_from_schema("currencies", {}, {"storage": "disk"})
+
+
+def test_writes_advance_the_data_version_only(repository: Repository):
+    other = Repository(repository.database, catalog_check_interval=60)
+    assert len(other.list("currencies")) == 2
+    models = other.model_factory.get_collection("currencies")
+
+    generation = repository.catalog.generation()
+    version = repository.catalog.get("currencies").version
+    data_version = repository.catalog.data_version("currencies")
+
+    repository.insert_many("currencies", [{"code": "CHF"}, {"code": "SEK"}])
+    repository.update("currencies", 1, {"rate": 1.2})
+
+    assert repository.catalog.generation() == generation
+    assert repository.catalog.get("currencies").version == version
+    assert repository.catalog.data_version("currencies") == data_version + 2
+
+    # Still within the check interval: the stale rows are served
+    assert len(other.list("currencies")) == 2
+
+    other.refresh_catalog(force=True)
+    assert [row["code"] for row in other.list("currencies")][-2:] == ["CHF", "SEK"]
+    assert other.get("currencies", 1)["rate"] == 1.2
+    assert other.model_factory.get_collection("currencies") is models
@@ -0,0 +1,80 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from autorestify.api.app_factory import create_app
+from autorestify.core.security import AllowAllPolicy, SecurityManager
+from autorestify.storage.base import Database
+from autorestify.storage.repository import Repository
+
+
+class NoSecrets(AllowAllPolicy):
+    def can_read(self, user, resource):
+        return resource != "secret"
+
+
+def test_batch_runs_reads_on_one_connection():
+    database = Database(database_url="sqlite:///:memory:")
+    client = TestClient(
+        create_app(
+            database=database,
+            security=SecurityManager(access_policy=NoSecrets()),
+        )
+    )
+    for collection, documents in {
+        "users": [{"name": "ann", "address": {"city": "Lisbon"}}, {"name": "bob"}],
+        "orders": [{"total": 10}, {"total": 20}, {"total": 30}],
+        "secret": [{"code": "x"}],
+    }.items():
+        payload = {"collection": collection, "documents": documents}
+        assert client.post("/upload", json=payload).status_code == 200
+
+    response = client.post(
+        "/_batch",
+        json={
+            "operations": [
+                {"collection": "users", "id": 1},
+                {"collection": "orders", "limit": 2},
+                {"collection": "users", "id": 99},
+                {"collection": "secret"},
+                {"collection": "missing"},
+                {"collection": "users", "limit": 0},
+                {"id": 1},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    statuses = [result["status"] for result in results]
+    assert statuses == [200, 200, 404, 403, 404, 400, 400]
+    assert results[0]["body"]["address"] == {"city": "Lisbon"}
+    assert [row["total"] for row in results[1]["body"]] == [10, 20]
+
+    checkouts = []
+    event.listen(database.engine, "checkout", lambda *args: checkouts.append(1))
+    reads = [{"collection": "users", "id": 2}, {"collection": "orders"}] * 5
+    results = client.post("/_batch", json={"operations": reads}).json()["results"]
+    assert [result["status"] for result in results] == [200] * 10
+    assert len(checkouts) == 1
+
+    assert client.post("/_batch", json={"operations": []}).status_code == 400
+    too_many = {"operations": [{"collection": "users"}] * 51}
+    assert client.post("/_batch", json=too_many).status_code == 400
+
+
+def test_snapshot_ignores_concurrent_writes(tmp_path):
+    database = Database(database_url=f"sqlite:///{tmp_path / 'batch.db'}")
+    with database.engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+
+    repository = Repository(database)
+    repository.create_tables_from_schema("items", {"n": "integer"})
+    repository.insert("items", {"n": 1})
+
+    with repository.snapshot() as session:
+        assert len(repository.list("items", session=session)) == 1
+        new_id = repository.insert("items", {"n": 2})
+        assert len(repository.list("items", session=session)) == 1
+        assert repository.get("items", new_id, session=session) is None
+
+    assert len(repository.list("items")) == 2
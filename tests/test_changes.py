@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+import pytest
+
+from autorestify.api.app_factory import create_app
+from autorestify.core.changes import ChangeFeed
+from autorestify.storage.base import Database
+
+
+async def read_events(app, path, headers=(), count=1):
+    """
+    Call the SSE endpoint and disconnect after `count` events.
+    """
+
+    disconnect = asyncio.Event()
+    events = []
+    body = ""
+
+    async def receive():
+        if not hasattr(receive, "sent"):
+            receive.sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal body
+        if message["type"] != "http.response.body":
+            return
+        body += message.get("body", b"").decode()
+        while "\n\n" in body:
+            block, body = body.split("\n\n", 1)
+            fields = dict(
+                line.split(": ", 1) for line in block.splitlines() if ": " in line
+            )
+            if "event" in fields:
+                events.append(fields)
+        if len(events) >= count:
+            disconnect.set()
+
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+
+    await asyncio.wait_for(app(scope, receive, send), 5)
+    return events
+
+
+@pytest.mark.asyncio
+async def test_change_feed_streams_and_resumes():
+    app = create_app(database=Database(database_url="sqlite:///:memory:"))
+    repository = app.state.repository
+    repository.create_tables_from_schema("feed_items", {"name": "string"})
+
+    item_id = repository.insert("feed_items", {"name": "a"})
+    repository.update("feed_items", item_id, {"name": "b"})
+    repository.delete("feed_items", item_id)
+
+    events = await read_events(app, "/feed_items/_changes?since=0", count=3)
+    assert [e["event"] for e in events] == ["insert", "update", "delete"]
+    assert [e["id"] for e in events] == ["1", "2", "3"]
+    assert json.loads(events[1]["data"])["data"] == {"name": "b"}
+
+    events = await read_events(
+        app, "/feed_items/_changes", headers=[("last-event-id", "2")]
+    )
+    assert [e["event"] for e in events] == ["delete"]
+
+    # A sequence this process never issued (e.g. before a restart) resets
+    events = await read_events(app, "/feed_items/_changes?since=99")
+    assert events[0]["event"] == "reset"
+    assert json.loads(events[0]["data"]) == {"seq": 3}
+
+
+@pytest.mark.asyncio
+async def test_change_feed_wakes_waiters_and_reports_gaps():
+    feed = ChangeFeed(capacity=2)
+
+    waiters = [asyncio.ensure_future(feed.wait("c", 0, 5)) for _ in range(3)]
+    await asyncio.sleep(0)
+    await asyncio.get_running_loop().run_in_executor(
+        None, feed.publish, "c", "insert", 1
+    )
+    assert await asyncio.gather(*waiters) == [True, True, True]
+
+    feed.publish("c", "insert", 2)
+    feed.publish("c", "insert", 3)
+
+    assert [c.seq for c in feed.since("c", 1)] == [2, 3]
+    assert feed.since("c", 0) is None
+    assert feed.since("c", 3) == []
+    assert await feed.wait("c", 3, 0.01) is False
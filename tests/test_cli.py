@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+from autorestify.cli import app_from_env, build_parser, settings_from_env
+
+
+def test_import_is_lazy():
+    code = (
+        "import sys, autorestify, autorestify.cli; "
+        "print(any(m in sys.modules for m in ('fastapi', 'sqlalchemy')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_lazy_exports():
+    import autorestify.storage
+
+    assert "Database" in dir(autorestify.storage)
+    assert autorestify.storage.Database.__name__ == "Database"
+    assert "Database" in vars(autorestify.storage)
+
+
+def test_app_factory_reads_environment(monkeypatch, tmp_path):
+    url = f"sqlite:///{tmp_path / 'cli.db'}"
+    monkeypatch.setenv("AUTORESTIFY_DATABASE_URL", url)
+    monkeypatch.setenv("AUTORESTIFY_SLOW_QUERY_SECONDS", "0.5")
+
+    assert settings_from_env()["slow_query_threshold"] == 0.5
+    assert settings_from_env()["idempotency_ttl"] == 86400.0
+
+    monkeypatch.setenv("AUTORESTIFY_IDEMPOTENCY_TTL", "0")
+    monkeypatch.setenv("AUTORESTIFY_EXPIRY_INTERVAL", "0")
+    assert settings_from_env()["idempotency_ttl"] == 0.0
+    assert settings_from_env()["expiry_interval"] is None
+
+    first = app_from_env()
+    first.state.repository.create_tables_from_schema("people", {"name": "string"})
+
+    second = app_from_env()
+    assert second.state.repository.collections() == ["people"]
+
+    args = build_parser().parse_args(["serve", "--workers", "4"])
+    assert args.workers == 4 and args.preload and args.loop == "auto"
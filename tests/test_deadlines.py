@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from autorestify.api.app_factory import create_app
+from autorestify.core.deadlines import Deadline, DeadlineExceeded, call_with_deadline
+from autorestify.storage.base import Database
+from autorestify.storage.cancellation import _ARMED_KEY as ARMED_KEY, install_deadlines
+
+ENDLESS = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) "
+    "SELECT count(*) FROM c"
+)
+
+
+@pytest.fixture
+def database():
+    database = Database(database_url="sqlite:///:memory:")
+    install_deadlines(database.engine)
+    return database
+
+
+def run_endless(database: Database) -> None:
+    with database.engine.connect() as conn:
+        conn.execute(text(ENDLESS))
+
+
+def test_deadline_interrupts_running_sqlite_statement(database: Database):
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded) as exc:
+        call_with_deadline(Deadline(0.05), run_endless, database)
+
+    assert exc.value.reason == "timeout"
+    assert time.monotonic() - started < 2
+
+    # The connection is usable again afterwards
+    with database.engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_cancel_aborts_statement_from_another_thread(database: Database):
+    deadline = Deadline()
+    threading.Timer(0.05, deadline.cancel).start()
+
+    with pytest.raises(DeadlineExceeded) as exc:
+        call_with_deadline(deadline, run_endless, database)
+
+    assert exc.value.reason == "disconnected"
+
+
+def test_expired_request_deadline_returns_504_and_is_counted():
+    client = TestClient(
+        create_app(database=Database(database_url="sqlite:///:memory:"))
+    )
+    payload = {"collection": "slow", "documents": [{"name": "a"}]}
+    assert client.post("/upload", json=payload).status_code == 200
+
+    assert client.get("/slow", headers={"x-request-timeout": "5"}).status_code == 200
+
+    response = client.get("/slow", headers={"x-request-timeout": "0.000001"})
+    assert response.status_code == 504
+
+    metrics = client.get("/_metrics").text
+    assert (
+        'autorestify_requests_abandoned_total{route="/{collection}",reason="timeout"} 1'
+        in metrics
+    )
+
+
+def test_progress_handler_is_armed_only_under_a_deadline(tmp_path):
+    database = Database(database_url=f"sqlite:///{tmp_path / 'd.db'}")
+    install_deadlines(database.engine)
+
+    def armed() -> bool:
+        with database.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            return bool(conn.connection.info.get(ARMED_KEY))
+
+    assert not armed()
+    assert call_with_deadline(Deadline(5), armed)
+
+    # Disarmed once the connection went back to the pool
+    assert not armed()
@@ -0,0 +1,64 @@
+import logging
+
+from fastapi.testclient import TestClient
+
+from autorestify.api.app_factory import create_app
+from autorestify.core.security import AllowAllPolicy, SecurityManager
+from autorestify.storage.base import Database
+
+
+class NoAdminPolicy(AllowAllPolicy):
+    def can_admin(self, user):
+        return False
+
+
+def test_slow_query_log_captures_plan(caplog):
+    database = Database(database_url="sqlite:///:memory:")
+    client = TestClient(
+        create_app(
+            database=database,
+            slow_request_threshold=0.0,
+            slow_query_threshold=0.0,
+        )
+    )
+
+    payload = {"collection": "diag_items", "documents": [{"name": "Ana"}]}
+    client.post("/upload", json=payload)
+
+    with caplog.at_level(logging.WARNING, logger="autorestify.slow"):
+        assert client.get("/diag_items?limit=5").status_code == 200
+
+    messages = [r.getMessage() for r in caplog.records]
+
+    assert any(
+        "Slow query" in m and "diag_items" in m and "SCAN" in m for m in messages
+    )
+    assert any("Slow request" in m and "route=/{collection}" in m for m in messages)
+
+
+def test_profiler_header_stores_profile_for_admins():
+    database = Database(database_url="sqlite:///:memory:")
+    client = TestClient(create_app(database=database, enable_profiling=True))
+
+    response = client.get("/", headers={"X-AutoRESTify-Profile": "1"})
+    assert response.status_code == 200
+
+    profile_id = response.headers["x-autorestify-profile-id"]
+
+    report = client.get(f"/_profiles/{profile_id}")
+    assert report.status_code == 200
+    assert "function calls" in report.text
+
+
+def test_profiler_ignored_for_non_admins():
+    database = Database(database_url="sqlite:///:memory:")
+    security = SecurityManager(access_policy=NoAdminPolicy())
+    client = TestClient(
+        create_app(security=security, database=database, enable_profiling=True)
+    )
+
+    response = client.get("/", headers={"X-AutoRESTify-Profile": "1"})
+
+    assert response.status_code == 200
+    assert "x-autorestify-profile-id" not in response.headers
+    assert client.get("/_profiles").status_code == 403
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect
+
+from autorestify.api.app_factory import create_app
+from autorestify.storage.base import Database
+from autorestify.storage.expiry import ExpiryScheduler
+from autorestify.storage.repository import Repository
+
+
+def age_rows(repository: Repository, collection: str, ids, seconds: float) -> None:
+    table = repository._get_model(collection).__table__
+    old = datetime.now(timezone.utc) - timedelta(seconds=seconds)
+    with repository.database.engine.begin() as conn:
+        conn.execute(table.update().where(table.c.id.in_(ids)).values(created_at=old))
+
+
+def test_expiry_deletes_old_rows_in_batches():
+    repository = Repository(Database(database_url="sqlite:///:memory:"))
+    schema = {"kind": "string", "meta": {"ip": "string"}}
+    repository.create_tables_from_schema("events", schema)
+    repository.insert_many(
+        "events", [{"kind": "click", "meta": {"ip": "1"}} for _ in range(7)]
+    )
+    repository.create_tables_from_schema("sessions", {"user": "string"})
+    repository.insert("sessions", {"user": "ann"})
+
+    repository.create_tables_from_schema("events", schema, {"ttl": 3600})
+
+    indexes = inspect(repository.database.engine).get_indexes("events")
+    assert [index["column_names"] for index in indexes] == [["created_at"]]
+    assert repository.expiring_collections() == ["events"]
+
+    age_rows(repository, "events", [1, 2, 3, 4, 5], 7200)
+    age_rows(repository, "sessions", [1], 7200)
+
+    scheduler = ExpiryScheduler(repository, batch_size=2, batch_pause=0)
+    assert asyncio.run(scheduler.sweep()) == {"events": 5}
+
+    assert [row["id"] for row in repository.list("events")] == [6, 7]
+    assert len(repository.list("sessions")) == 1
+    children = repository.model_factory.get_children("events")["meta"].__table__
+    with repository.database.engine.connect() as conn:
+        assert len(conn.execute(children.select()).all()) == 2
+
+
+def test_ttl_upload_option_and_background_task():
+    database = Database(database_url="sqlite:///:memory:")
+    app = create_app(database=database, expiry_interval=0.05, vacuum_interval=0)
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/upload", json={"collection": "logs", "ttl": 0, "documents": []}
+        )
+        assert response.status_code == 400
+
+        payload = {"collection": "logs", "ttl": 60, "documents": [{"line": "a"}]}
+        assert client.post("/upload", json=payload).status_code == 200
+
+        age_rows(app.state.repository, "logs", [1], 120)
+
+        for _ in range(100):
+            if not client.get("/logs").json():
+                break
+            time.sleep(0.02)
+
+        assert client.get("/logs").json() == []
+        assert 'autorestify_rows_expired_total{collection="logs"} 1' in (
+            client.get("/_metrics").text
+        )
@@ -0,0 +1,87 @@
+from fastapi.testclient import TestClient
+
+from autorestify.api.app_factory import create_app
+from autorestify.storage.base import Database
+from autorestify.storage.dedup import HASH_COLUMN, content_hash
+from autorestify.storage.repository import Repository
+
+
+def make_client() -> TestClient:
+    database = Database(database_url="sqlite:///:memory:")
+    return TestClient(create_app(database=database))
+
+
+def test_idempotency_key_replays_response():
+    client = make_client()
+    payload = {"collection": "orders", "documents": [{"sku": "a", "qty": 1}]}
+    headers = {"Idempotency-Key": "upload-1"}
+
+    first = client.post("/upload", json=payload, headers=headers)
+    assert first.status_code == 200
+    assert first.json()["inserted"] == 1
+
+    retry = client.post("/upload", json=payload, headers=headers)
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert len(client.get("/orders").json()) == 1
+
+    changed = {"collection": "orders", "documents": [{"sku": "b", "qty": 2}]}
+    assert client.post("/upload", json=changed, headers=headers).status_code == 422
+
+    headers = {"Idempotency-Key": "create-1"}
+    created = client.post("/orders", json={"sku": "c"}, headers=headers)
+    replayed = client.post("/orders", json={"sku": "c"}, headers=headers)
+    assert replayed.json() == created.json()
+    assert len(client.get("/orders").json()) == 2
+
+    # Failed requests release the key
+    headers = {"Idempotency-Key": "missing-1"}
+    assert client.post("/nothing", json={}, headers=headers).status_code == 404
+    assert client.post("/nothing", json={}, headers=headers).status_code == 404
+
+
+def test_dedupe_skips_stored_documents():
+    client = make_client()
+    documents = [
+        {"sku": "a", "qty": 1, "meta": {"color": "red"}},
+        {"qty": 1, "sku": "a", "meta": {"color": "red"}},
+        {"sku": "b", "qty": 2},
+    ]
+    payload = {"collection": "items", "dedupe": True, "documents": documents}
+
+    assert client.post("/upload", json=payload).json()["inserted"] == 2
+    assert client.post("/upload", json=payload).json()["inserted"] == 0
+
+    rows = client.get("/items").json()
+    assert len(rows) == 2
+    assert all(HASH_COLUMN not in row for row in rows)
+
+    first_id = rows[0]["id"]
+    response = client.post("/items", json=documents[1])
+    assert response.json() == {"id": first_id}
+    assert client.post("/items", json={"sku": "c"}).json()["id"] != first_id
+
+    response = client.post(
+        "/upload", json={"collection": "items", "dedupe": False, "documents": []}
+    )
+    assert response.status_code == 400
+
+
+def test_enabling_dedupe_hashes_existing_rows():
+    repository = Repository(Database(database_url="sqlite:///:memory:"))
+    schema = {"name": "string", "n": "integer"}
+    repository.create_tables_from_schema("people", schema)
+    repository.insert_many(
+        "people", [{"name": "ann", "n": 1}, {"name": "ann", "n": 1}, {"name": "bo"}]
+    )
+
+    repository.create_tables_from_schema("people", schema, {"dedupe": True})
+
+    assert repository.insert_many("people", [{"name": "bo"}, {"name": "cy"}]) == 1
+    assert repository.insert("people", {"n": 1, "name": "ann"}) == 1
+    assert len(repository.list("people")) == 4
+    assert content_hash({"a": 1, "b": None, "c": {}}) == content_hash({"a": 1})
+
+    reloaded = Repository(repository.database)
+    assert reloaded.insert_many("people", [{"name": "cy"}]) == 0
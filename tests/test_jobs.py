@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from autorestify.api.app_factory import create_app
+from autorestify.storage.base import Database
+from autorestify.storage.jobs import JobManager, JobQueueFull
+
+
+def wait_for(client, url):
+    for _ in range(200):
+        job = client.get(url).json()
+        if job["state"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError("job did not finish")
+
+
+def test_async_upload_reports_progress(tmp_path):
+    database = Database(database_url=f"sqlite:///{tmp_path / 'jobs.db'}")
+    documents = [{"n": i, "meta": {"tag": str(i)}} for i in range(2500)]
+    documents.append({"n": 1, "meta": 5})
+
+    with TestClient(create_app(database=database)) as client:
+        response = client.post(
+            "/upload?async=true",
+            json={"collection": "readings", "documents": documents},
+            headers={"Idempotency-Key": "readings-1"},
+        )
+        assert response.status_code == 202
+        job = wait_for(client, response.json()["status"])
+
+        assert job["state"] == "succeeded"
+        assert job["total"] == job["processed"] == 2501
+        assert job["inserted"] == 2500
+        assert job["failed"] == 1
+        assert job["errors"][0]["record"] == 2500
+        assert job["rows_per_second"] > 0
+        assert job["result"]["schema"]["n"] == "integer"
+        assert len(client.get("/readings?limit=5000").json()) == 2500
+
+        # A retried request gets the same job instead of a second one
+        retry = client.post(
+            "/upload?async=true",
+            json={"collection": "readings", "documents": documents},
+            headers={"Idempotency-Key": "readings-1"},
+        )
+        assert retry.status_code == 202
+        assert retry.json()["job"] == response.json()["job"]
+
+        assert client.get("/_jobs/unknown").status_code == 404
+        assert 'autorestify_jobs{state="running"}' in client.get("/_metrics").text
+
+
+def test_job_manager_bounds_pending_jobs(tmp_path):
+    database = Database(database_url=f"sqlite:///{tmp_path / 'jobs.db'}")
+    jobs = JobManager(database, workers=1, max_pending=1)
+    release = threading.Event()
+
+    def blocked(job):
+        release.wait(5)
+        return {"ok": True}
+
+    first = jobs.submit("test", "alice", blocked)
+    with pytest.raises(JobQueueFull):
+        jobs.submit("test", "alice", blocked)
+
+    release.set()
+    asyncio.run(jobs.stop())
+
+    job = jobs.get(first.id)
+    assert job.state == "succeeded"
+    assert job.result == {"ok": True}
+    assert job.owner == JobManager.owner_of("alice")
+
+
+def test_submit_writes_the_job_row_outside_the_lock(tmp_path):
+    database = Database(database_url=f"sqlite:///{tmp_path / 'jobs.db'}")
+    jobs = JobManager(database, workers=1)
+    inserting = threading.Event()
+    resume = threading.Event()
+
+    def hold_insert(conn, cursor, statement, *args):
+        if statement.startswith("INSERT INTO _autorestify_jobs"):
+            inserting.set()
+            resume.wait(5)
+
+    event.listen(database.engine, "before_cursor_execute", hold_insert)
+
+    submitter = threading.Thread(
+        target=jobs.submit, args=("test", "alice", lambda job: None)
+    )
+    submitter.start()
+    assert inserting.wait(5)
+
+    # The manager's lock is free while the row is written
+    acquired = jobs._lock.acquire(timeout=1)
+    assert acquired
+    jobs._lock.release()
+    assert jobs._counts() == [(("queued",), 1.0), (("running",), 0.0)]
+
+    resume.set()
+    submitter.join(5)
+    asyncio.run(jobs.stop())
@@ -0,0 +1,117 @@
+import re
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+from autorestify.api.app_factory import create_app
+from autorestify.core.metrics import MetricsRegistry
+from autorestify.storage.base import Database
+from autorestify.storage.diagnostics import SlowQueryLog
+from autorestify.storage.instrumentation import instrument_engine
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+
+    counter = registry.counter("jobs_total", "Jobs.", ("kind",))
+    counter.inc("a")
+    counter.inc("a", amount=2)
+
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+
+    text = registry.render()
+
+    assert "# TYPE jobs_total counter" in text
+    assert 'jobs_total{kind="a"} 3' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "latency_seconds_count 2" in text
+
+
+def test_metrics_endpoint_reports_routes_and_queries():
+    database = Database(database_url="sqlite:///:memory:")
+    client = TestClient(create_app(database=database))
+
+    payload = {
+        "collection": "metrics_items",
+        "documents": [{"name": "Ana"}, {"name": "Carlos"}],
+    }
+    assert client.post("/upload", json=payload).status_code == 200
+    assert client.get("/metrics_items").status_code == 200
+
+    response = client.get("/_metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+    text = response.text
+
+    assert (
+        'autorestify_http_requests_total{method="GET",route="/{collection}",'
+        'status="200"} 1'
+    ) in text
+    assert 'collection="metrics_items",operation="INSERT"' in text
+    assert "autorestify_schema_inference_documents_total 2" in text
+    assert "autorestify_db_pool_checkout_seconds_count" in text
+
+
+def test_failed_statements_do_not_leak_timings():
+    database = Database(database_url="sqlite:///:memory:")
+    registry = MetricsRegistry()
+    instrument_engine(database.engine, registry)
+    SlowQueryLog(database.engine)
+
+    with database.engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.exec_driver_sql("SELECT * FROM missing_table")
+        conn.exec_driver_sql("SELECT 1")
+
+        assert conn.info["autorestify_query_start"] == []
+        assert conn.info["autorestify_slow_start"] == []
+
+    assert registry.get("autorestify_db_pool_checkout_seconds").count() >= 1
+
+
+def test_checkout_time_includes_waiting_for_a_saturated_pool(tmp_path):
+    database = Database(database_url=f"sqlite:///{tmp_path / 'p.db'}")
+    database.engine = create_engine(
+        f"sqlite:///{tmp_path / 'p.db'}", pool_size=1, max_overflow=0
+    )
+    registry = MetricsRegistry()
+    instrument_engine(database.engine, registry)
+
+    held = threading.Event()
+    hold = 0.3
+
+    def holder():
+        with database.engine.connect():
+            held.set()
+            time.sleep(hold)
+
+    thread = threading.Thread(target=holder)
+    thread.start()
+    assert held.wait(5)
+    with database.engine.connect() as conn:
+        conn.exec_driver_sql("SELECT 1")
+    thread.join()
+
+    seconds = registry.get("autorestify_db_pool_checkout_seconds")
+    assert seconds.count() == 2
+    total = re.search(
+        r"^autorestify_db_pool_checkout_seconds_sum (\S+)$", registry.render(), re.M
+    )
+    assert float(total.group(1)) >= hold * 0.9
+
+    # A disposed engine gets a new pool, which is timed as well
+    database.engine.dispose()
+    with database.engine.connect():
+        pass
+    with database.engine.connect():
+        pass
+    assert seconds.count() == 3
@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+import autorestify.storage.repository as repository_module
+from autorestify.api.app_factory import create_app
+from autorestify.storage.base import Database
+from autorestify.storage.repository import Repository
+
+
+class FrozenDatetime(datetime):
+    moment = datetime(2026, 1, 15, tzinfo=timezone.utc)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.moment
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(repository_module, "datetime", FrozenDatetime)
+
+    def set_time(*args):
+        FrozenDatetime.moment = datetime(*args, tzinfo=timezone.utc)
+
+    return set_time
+
+
+def test_partitioned_collection_routes_reads_and_writes(clock):
+    repository = Repository(Database(database_url="sqlite:///:memory:"))
+    schema = {"kind": "string", "meta": {"ip": "string"}}
+    repository.create_tables_from_schema("events", schema, {"partition": "month"})
+
+    clock(2026, 1, 15)
+    repository.insert_many(
+        "events",
+        [{"kind": "a", "meta": {"ip": "1"}}, {"kind": "b", "meta": {"ip": "2"}}],
+    )
+    clock(2026, 2, 15)
+    feb_id = repository.insert("events", {"kind": "c", "meta": {"ip": "3"}})
+
+    assert repository.partitions("events") == ["events___202601", "events___202602"]
+
+    rows = repository.list("events")
+    assert [row["kind"] for row in rows] == ["a", "b", "c"]
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+    assert rows[-1]["id"] == feb_id
+    assert repository.get("events", rows[0]["id"])["meta"] == {"ip": "1"}
+    assert [row["kind"] for row in repository.list("events", limit=2)] == ["a", "b"]
+    assert repository.get("events", 5) is None
+
+    assert repository.update("events", rows[0]["id"], {"kind": "z"})
+    assert repository.get("events", rows[0]["id"])["kind"] == "z"
+    assert repository.delete("events", rows[1]["id"])
+    assert not repository.delete("events", rows[1]["id"])
+
+    # Schema evolution reaches existing partitions
+    repository.create_tables_from_schema("events", {"kind": "string", "n": "integer"})
+    repository.insert("events", {"kind": "d", "n": 4})
+    assert [row.get("n") for row in repository.list("events")] == [None, None, 4]
+
+    # Another process sees the same partitions
+    other = Repository(repository.database)
+    assert [len(batch) for batch in other.iter_batches("events")] == [1, 2]
+
+    dropped = repository.drop_partitions(
+        "events", datetime(2026, 2, 1, tzinfo=timezone.utc)
+    )
+    assert dropped == ["events___202601"]
+    assert repository.get("events", rows[0]["id"]) is None
+    assert [row["kind"] for row in repository.list("events")] == ["c", "d"]
+
+    other.refresh_catalog(force=True)
+    assert other.partitions("events") == ["events___202602"]
+
+
+def test_ttl_drops_whole_partitions(clock):
+    repository = Repository(Database(database_url="sqlite:///:memory:"))
+    repository.create_tables_from_schema(
+        "logs", {"line": "string"}, {"partition": "day", "ttl": 86400}
+    )
+
+    for day in (1, 2, 3):
+        clock(2026, 3, day, 12)
+        repository.insert_many("logs", [{"line": f"{day}-{i}"} for i in range(3)])
+
+    clock(2026, 3, 3, 18)
+    assert repository.expire("logs") == 3
+    assert repository.partitions("logs") == ["logs___20260302", "logs___20260303"]
+    assert repository.expire("logs", batch_size=2) == 2
+    assert repository.expire("logs", batch_size=2) == 1
+    assert repository.expire("logs") == 0
+    assert len(repository.list("logs")) == 3
+
+
+def test_partition_option_validation():
+    client = TestClient(create_app(database=Database(database_url="sqlite:///:memory:")))
+
+    def upload(**options):
+        payload = {"collection": "metrics", "documents": [{"v": 1}], **options}
+        return client.post("/upload", json=payload)
+
+    assert upload(partition="week").status_code == 400
+    assert upload(partition="month", search=["v"]).status_code == 400
+    assert upload().status_code == 200
+    assert upload(partition="month").status_code == 400
+
+    payload = {"collection": "ticks", "partition": "month", "documents": [{"v": 1}]}
+    assert client.post("/upload", json=payload).status_code == 200
+    item = client.get("/ticks").json()[0]
+    assert item["id"] > 2**32
+    assert client.get(f"/ticks/{item['id']}").json()["v"] == 1
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from sqlalchemy import inspect
+
+from autorestify.api.app_factory import create_app
+from autorestify.storage.base import Database
+from autorestify.storage.repository import Repository
+
+
+def test_concurrent_registrations_are_neither_lost_nor_duplicated(tmp_path):
+    repository = Repository(Database(database_url=f"sqlite:///{tmp_path / 'r.db'}"))
+    collections = [f"c{i}" for i in range(6)]
+    fields = [f"f{j}" for j in range(5)]
+    barrier = threading.Barrier(len(collections) * len(fields))
+
+    def upload(collection, field):
+        barrier.wait()
+        schema = {field: "integer", "meta": {field: "string"}}
+        repository.create_tables_from_schema(collection, schema)
+        repository.insert(collection, {field: 1, "meta": {field: "x"}})
+
+    with ThreadPoolExecutor(max_workers=len(collections) * len(fields)) as pool:
+        futures = [
+            pool.submit(upload, collection, field)
+            for collection in collections
+            for field in fields
+        ]
+        for future in futures:
+            future.result()
+
+    assert sorted(repository.collections()) == collections
+
+    inspector = inspect(repository.database.engine)
+    for entry in repository.catalog.all():
+        assert set(entry.schema) == {*fields, "meta"}
+        assert set(entry.schema["meta"]) == set(fields)
+        assert entry.version == len(fields)
+
+        columns = {c["name"] for c in inspector.get_columns(entry.name)}
+        assert set(fields) <= columns
+        assert len(repository.list(entry.name)) == len(fields)
+
+    # A fresh process sees the same registrations
+    other = Repository(repository.database)
+    assert sorted(other.load_catalog()) == collections
+    assert other.get_schema("c0") == repository.get_schema("c0")
+
+
+def test_registration_of_one_collection_does_not_block_others():
+    repository = Repository(Database(database_url="sqlite:///:memory:"))
+    repository.create_tables_from_schema("busy", {"a": "integer"})
+
+    done = threading.Event()
+
+    def register(name):
+        repository.create_tables_from_schema(name, {"b": "integer"})
+        done.set()
+
+    with repository._registration_lock("busy"):
+        other = threading.Thread(target=register, args=("free",))
+        other.start()
+        assert done.wait(5)
+        other.join()
+
+        blocked = threading.Thread(target=register, args=("busy",))
+        done.clear()
+        blocked.start()
+        assert not done.wait(0.2)
+
+    blocked.join(5)
+    assert done.is_set()
+    assert repository.get_schema("busy") == {"a": "integer", "b": "integer"}
+
+
+def test_stale_workers_do_not_lose_each_others_fields(tmp_path):
+    database = Database(database_url=f"sqlite:///{tmp_path / 'w.db'}")
+    worker_a = Repository(database, catalog_check_interval=60)
+    worker_b = Repository(database, catalog_check_interval=60)
+
+    worker_a.create_tables_from_schema("items", {"a": "integer"})
+    assert worker_b.get_schema("items") == {"a": "integer"}
+
+    worker_a.create_tables_from_schema("items", {"x": "integer"})
+    worker_b.create_tables_from_schema("items", {"y": "integer"})
+
+    fresh = Repository(database)
+    assert fresh.get_schema("items") == {"a": "integer", "x": "integer", "y": "integer"}
+    assert fresh.catalog.get("items").version == 3
+    fresh.insert("items", {"a": 1, "x": 2, "y": 3})
+
+
+def test_concurrent_saves_are_retried_on_conflict(tmp_path):
+    database = Database(database_url=f"sqlite:///{tmp_path / 'c.db'}")
+    workers = [Repository(database, catalog_check_interval=60) for _ in range(4)]
+    workers[0].create_tables_from_schema("items", {"a": "integer"})
+    barrier = threading.Barrier(len(workers) * 3)
+
+    def upload(worker, field):
+        barrier.wait()
+        worker.create_tables_from_schema("items", {field: "integer"})
+
+    with ThreadPoolExecutor(max_workers=len(workers) * 3) as pool:
+        futures = [
+            pool.submit(upload, worker, f"f{i}_{j}")
+            for i, worker in enumerate(workers)
+            for j in range(3)
+        ]
+        for future in futures:
+            future.result()
+
+    schema = Repository(database).get_schema("items")
+    assert set(schema) == {"a"} | {f"f{i}_{j}" for i in range(4) for j in range(3)}
+
+
+@pytest.mark.asyncio
+async def test_uploads_to_different_collections_run_in_parallel(tmp_path):
+    app = create_app(database=Database(database_url=f"sqlite:///{tmp_path / 'u.db'}"))
+    repository = app.state.repository
+    register = repository.create_tables_from_schema
+    barrier = threading.Barrier(2, timeout=5)
+
+    def rendezvous(*args, **kwargs):
+        barrier.wait()  # Both uploads must be registering at the same time
+        return register(*args, **kwargs)
+
+    repository.create_tables_from_schema = rendezvous
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    "/upload", json={"collection": name, "documents": [{"n": 1}]}
+                )
+                for name in ("left", "right")
+            )
+        )
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert sorted(repository.collections()) == ["left", "right"]
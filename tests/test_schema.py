@@ -45,3 +45,48 @@ def test_infer_nested_object():
     assert isinstance(schema["user"], dict)
     assert schema["user"]["name"] == "string"
     assert schema["user"]["active"] == "boolean"
+
+
+def test_infer_rich_types():
+    inferer = SchemaInferer(rich_types=True)
+
+    documents = [
+        {
+            "id": 10**12,
+            "small": 1,
+            "uuid": "7c9e6679-7425-40de-944b-e07fc1f90ae7",
+            "at": "2024-05-01T10:00:00Z",
+            "day": "2024-05-01",
+            "when": "2024-05-01",
+            "text": "2024-99-01",
+            "maybe": None,
+        },
+        {"small": 2, "when": "2024-05-02 08:30:00", "maybe": 5},
+    ]
+
+    schema = inferer.infer(documents)
+
+    assert schema == {
+        "id": "bigint",
+        "small": "integer",
+        "uuid": "uuid",
+        "at": "datetime",
+        "day": "date",
+        "when": "datetime",
+        "text": "string",
+        "maybe": "integer",
+    }
+
+    # Opt-in: the default engine keeps these as strings
+    assert SchemaInferer().infer(documents[:1])["at"] == "string"
+
+
+def test_nulls_widen_to_string_outside_rich_uploads():
+    documents = [{"v": None}, {"v": 3}]
+
+    assert SchemaInferer().infer(documents) == {"v": "string"}
+    assert SchemaInferer(rich_types=True).infer(documents) == {"v": "integer"}
+
+    # A stored all-null column is text, so evolving it widens to string
+    for inferer in (SchemaInferer(), SchemaInferer(rich_types=True)):
+        assert inferer.merge({"v": "null"}, {"v": "integer"}) == {"v": "string"}
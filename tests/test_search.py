@@ -0,0 +1,62 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from autorestify.api.app_factory import create_app
+from autorestify.storage.base import Database
+
+
+@pytest.fixture
+def client():
+    database = Database(database_url="sqlite:///:memory:")
+    client = TestClient(create_app(database=database))
+
+    payload = {
+        "collection": "articles",
+        "search": ["title", "body"],
+        "documents": [
+            {"title": "Tuning SQLite", "body": "indexes and pragmas", "views": 3},
+            {"title": "Postgres notes", "body": "sqlite sqlite sqlite", "views": 5},
+            {"title": "Gardening", "body": "tomatoes", "views": 1},
+        ],
+    }
+    assert client.post("/upload", json=payload).status_code == 200
+    return client
+
+
+def test_search_ranks_matches_and_tracks_writes(client: TestClient):
+    response = client.get("/articles/_search", params={"q": "sqlite"})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["title"] for item in items] == ["Postgres notes", "Tuning SQLite"]
+    assert items[0]["_score"] <= items[1]["_score"]
+
+    response = client.get(
+        "/articles/_search", params={"q": "sqlite", "fields": "title"}
+    )
+    assert [item["title"] for item in response.json()["items"]] == ["Tuning SQLite"]
+
+    response = client.get("/articles/_search", params={"q": "sqlite", "limit": 1})
+    assert len(response.json()["items"]) == 1
+
+    item_id = items[0]["id"]
+    client.put(f"/articles/{item_id}", json={"body": "about tomatoes"})
+    response = client.get("/articles/_search", params={"q": "tomatoes"})
+    assert len(response.json()["items"]) == 2
+
+    client.delete(f"/articles/{item_id}")
+    response = client.get("/articles/_search", params={"q": "tomatoes"})
+    assert [item["title"] for item in response.json()["items"]] == ["Gardening"]
+
+
+def test_search_rejects_unindexed_fields_and_bad_queries(client: TestClient):
+    response = client.get("/articles/_search", params={"q": "x", "fields": "views"})
+    assert response.status_code == 400
+
+    response = client.get("/articles/_search", params={"q": '"unbalanced'})
+    assert response.status_code == 400
+
+    response = client.post(
+        "/upload",
+        json={"collection": "articles", "search": ["missing"], "documents": []},
+    )
+    assert response.status_code == 400
@@ -42,3 +42,195 @@ def test_crud_operations(tmp_path):
 
     user = repository.get("users", user_id)
     assert user is None
+
+
+def test_schema_evolution_adds_columns_in_place(tmp_path):
+    database = Database(database_url=f"sqlite:///{tmp_path / 'evolve.db'}")
+    repository = Repository(database)
+
+    repository.create_tables_from_schema("events", {"name": "string"})
+    first_id = repository.insert("events", {"name": "signup"})
+
+    repository.create_tables_from_schema(
+        "events",
+        {"name": "string", "value": "integer", "meta": {"source": "string"}},
+    )
+    second_id = repository.insert(
+        "events", {"name": "login", "value": 3, "meta": {"source": "web"}}
+    )
+
+    assert repository.get("events", first_id)["value"] is None
+    assert repository.get("events", second_id)["value"] == 3
+    assert repository.get("events", second_id)["meta"] == {"source": "web"}
+
+    # Conflicting types are widened
+    repository.create_tables_from_schema("events", {"value": "float"})
+    assert repository.model_factory.get_schema("events")["value"] == "float"
+    assert repository.catalog.get("events").version == 3
+
+    repository.update("events", second_id, {"value": 2.5})
+    assert repository.get("events", second_id)["value"] == 2.5
+
+
+def test_collections_reload_from_catalog(tmp_path):
+    url = f"sqlite:///{tmp_path / 'catalog.db'}"
+
+    repository = Repository(Database(database_url=url))
+    repository.create_tables_from_schema("notes", {"text": "string"})
+    note_id = repository.insert("notes", {"text": "hello"})
+
+    restarted = Repository(Database(database_url=url))
+
+    assert restarted.get("notes", note_id)["text"] == "hello"
+    assert restarted.load_catalog() == ["notes"]
+
+
+def test_schema_changes_propagate_between_processes(tmp_path):
+    url = f"sqlite:///{tmp_path / 'workers.db'}"
+
+    worker_a = Repository(Database(database_url=url))
+    worker_b = Repository(Database(database_url=url), catalog_check_interval=60)
+
+    worker_a.create_tables_from_schema("people", {"name": "string"})
+    assert worker_b.list("people") == []
+
+    worker_a.create_tables_from_schema("people", {"age": "integer"})
+    person_id = worker_a.insert("people", {"name": "Ana", "age": 30})
+
+    # Within the check interval the stale model is still used
+    assert "age" not in worker_b.get("people", person_id)
+
+    assert worker_b.refresh_catalog(force=True) == ["people"]
+    assert worker_b.get("people", person_id)["age"] == 30
+    assert worker_b.refresh_catalog(force=True) == []
+
+
+def test_rich_types_round_trip_and_widen(tmp_path):
+    from datetime import date, datetime, timezone
+    from uuid import UUID
+
+    from sqlalchemy import text
+
+    repository = Repository(Database(database_url=f"sqlite:///{tmp_path / 't.db'}"))
+    repository.create_tables_from_schema(
+        "events",
+        {"key": "uuid", "at": "datetime", "day": "date", "big": "bigint"},
+    )
+    document = repository.get_types("events").input.validate_python(
+        {
+            "key": "7c9e6679-7425-40de-944b-e07fc1f90ae7",
+            "at": "2024-05-01T10:00:00-03:00",
+            "day": "2024-05-01",
+            "big": 10**12,
+        }
+    )
+    item_id = repository.insert("events", document)
+
+    row = repository.get("events", item_id)
+    assert row["key"] == UUID("7c9e6679-7425-40de-944b-e07fc1f90ae7")
+    assert row["at"] == datetime(2024, 5, 1, 13, tzinfo=timezone.utc)
+    assert row["day"] == date(2024, 5, 1)
+    assert row["big"] == 10**12
+
+    with repository.database.engine.connect() as conn:
+        stored = conn.execute(text("SELECT length(key), typeof(at) FROM events"))
+        assert stored.one() == (16, "integer")
+
+    # Conflicting uploads widen to string and rewrite the compact values
+    repository.create_tables_from_schema(
+        "events", {"key": "string", "at": "string", "day": "datetime"}
+    )
+    row = repository.get("events", item_id)
+    assert row["key"] == "7c9e6679-7425-40de-944b-e07fc1f90ae7"
+    assert row["at"] == "2024-05-01T13:00:00.000Z"
+    assert row["day"] == datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+    # Widened date columns lose their integer affinity
+    repository.create_tables_from_schema("events", {"day": "string"})
+    assert repository.get("events", item_id)["day"] == "2024-05-01T00:00:00.000Z"
+    new_id = repository.insert("events", {"at": "007", "day": "008"})
+    row = repository.get("events", new_id)
+    assert (row["at"], row["day"]) == ("007", "008")
+
+
+def test_crud_statements_are_cached_per_schema_version():
+    repository = Repository(Database(database_url="sqlite:///:memory:"))
+    repository.create_tables_from_schema(
+        "people", {"name": "string", "address": {"city": "string"}}
+    )
+
+    item_id = repository.insert("people", {"name": "ann", "address": {"city": "a"}})
+    table = repository._get_model("people").__table__
+    statement = repository.statements.select_by_id(
+        table, repository._record_columns(table)
+    )
+    assert repository.get("people", item_id)["address"] == {"city": "a"}
+    assert repository.statements.select_by_id(
+        table, repository._record_columns(table)
+    ) is statement
+
+    assert repository.update("people", item_id, {"address": {"city": "b"}})
+    assert repository.update("people", item_id, {"name": "bo", "unknown": 1})
+    assert not repository.update("people", 99, {"name": "x"})
+    row = repository.get("people", item_id)
+    assert (row["name"], row["address"]) == ("bo", {"city": "b"})
+
+    # Schema evolution rebuilds the table, and with it the statements
+    repository.create_tables_from_schema("people", {"name": "string", "age": "integer"})
+    new_id = repository.insert("people", {"name": "cy", "age": 3})
+    assert repository.get("people", new_id)["age"] == 3
+    assert repository.get("people", item_id)["age"] is None
+    table = repository._get_model("people").__table__
+    assert repository.statements.select_by_id(
+        table, repository._record_columns(table)
+    ) is not statement
+
+    assert repository.delete("people", item_id)
+    assert not repository.delete("people", item_id)
+    assert [row["name"] for row in repository.list("people")] == ["cy"]
+
+
+def test_widening_to_string_converts_stored_values(tmp_path):
+    repository = Repository(Database(database_url=f"sqlite:///{tmp_path / 'w.db'}"))
+    repository.create_tables_from_schema(
+        "readings",
+        {"count": "integer", "ratio": "float", "ok": "boolean", "label": "integer"},
+        {"search": ["label"]},
+    )
+    first = repository.insert(
+        "readings", {"count": 1, "ratio": 0.5, "ok": True, "label": 7}
+    )
+
+    repository.create_tables_from_schema(
+        "readings",
+        {"count": "string", "ratio": "string", "ok": "string", "label": "string"},
+    )
+    second = repository.insert(
+        "readings", {"count": "007", "ratio": "abc", "ok": "no", "label": "seven"}
+    )
+
+    row = repository.get("readings", first)
+    values = [row[f] for f in ("count", "ratio", "ok", "label")]
+    assert values == ["1", "0.5", "true", "7"]
+    assert repository.get("readings", second)["count"] == "007"
+    assert [row["id"] for row in repository.search("readings", "seven")] == [second]
+
+
+def test_drop_all_drops_generated_tables(tmp_path):
+    from sqlalchemy import inspect
+
+    database = Database(database_url=f"sqlite:///{tmp_path / 'd.db'}")
+    repository = Repository(database)
+    repository.create_tables_from_schema("people", {"name": "string"})
+    repository.create_tables_from_schema(
+        "notes", {"text": "string", "meta": {"by": "string"}}
+    )
+
+    generated = {"people", "notes", "notes__meta"}
+    assert generated <= set(inspect(database.engine).get_table_names())
+
+    database.drop_all()
+    assert not generated & set(inspect(database.engine).get_table_names())
+
+    database.create_all()
+    assert generated <= set(inspect(database.engine).get_table_names())
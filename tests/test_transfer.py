@@ -0,0 +1,154 @@
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from autorestify.api.app_factory import create_app
+from autorestify.core.admission import AdmissionController
+from autorestify.storage.base import Database
+from autorestify.storage.transfer import MAX_PARSE_ERRORS, CSVParser, NDJSONParser
+
+
+@pytest.fixture
+def client():
+    database = Database(database_url="sqlite:///:memory:")
+    client = TestClient(create_app(database=database))
+
+    payload = {
+        "collection": "transfer_people",
+        "documents": [
+            {"name": "Ana", "age": 30, "tags": ["a"], "address": {"city": "Recife"}},
+        ],
+    }
+    assert client.post("/upload", json=payload).status_code == 200
+    return client
+
+
+def test_ndjson_import_and_export_round_trip(client: TestClient):
+    body = "\n".join(
+        [
+            json.dumps({"name": "Carlos", "age": 25, "address": {"city": "Natal"}}),
+            json.dumps({"name": "Bia", "age": "not a number"}),
+            "{broken",
+            json.dumps({"id": 99, "name": "Dani", "age": 41}),
+        ]
+    )
+
+    response = client.post(
+        "/transfer_people/_import?format=ndjson&batch_size=1", content=body
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["inserted"] == 2
+    assert result["failed"] == 2
+
+    response = client.get("/transfer_people/_export?format=ndjson&gzip=true")
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["name"] for r in rows] == ["Ana", "Carlos", "Dani"]
+    assert rows[1]["address"] == {"city": "Natal"}
+    assert rows[2]["id"] != 99
+
+
+def test_csv_import_and_export(client: TestClient):
+    body = 'name,age,tags\n"Silva, Jr",52,"[""x""]"\nEva,,\n'
+
+    response = client.post("/transfer_people/_import?format=csv", content=body)
+    assert response.json() == {"inserted": 2, "failed": 0, "errors": []}
+
+    response = client.get("/transfer_people/_export?format=csv")
+    assert response.headers["content-type"].startswith("text/csv")
+
+    lines = response.text.splitlines()
+    assert lines[0] == "id,created_at,name,age,tags,address"
+    assert lines[2].startswith('2,') and '"Silva, Jr",52,"[""x""]",' in lines[2]
+
+    assert client.get("/transfer_people/3").json()["age"] is None
+
+
+def test_csv_parser_handles_fields_split_across_chunks():
+    parser = CSVParser()
+
+    records = parser.feed(b'a,b\n1,"multi')
+    records += parser.feed(b'\nline"\n2,x')
+    records += parser.close()
+
+    assert records == [{"a": "1", "b": "multi\nline"}, {"a": "2", "b": "x"}]
+    assert parser.errors == []
+
+
+def test_parser_errors_are_capped():
+    parser = NDJSONParser()
+    parser.feed(b"{broken\n" * (MAX_PARSE_ERRORS + 50))
+
+    assert parser.failed == MAX_PARSE_ERRORS + 50
+    assert len(parser.errors) == MAX_PARSE_ERRORS
+
+
+@pytest.mark.asyncio
+async def test_export_releases_admission_when_client_leaves():
+    admission = AdmissionController(concurrency={"bulk": 1})
+    app = create_app(
+        database=Database(database_url="sqlite:///:memory:"), admission=admission
+    )
+    with TestClient(app) as client:
+        payload = {"collection": "gone", "documents": [{"n": 1}]}
+        assert client.post("/upload", json=payload).status_code == 200
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/gone/_export",
+        "raw_path": b"/gone/_export",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+
+    assert admission.limits["bulk"].active == 0
+
+
+@pytest.mark.asyncio
+async def test_import_does_not_block_other_requests(tmp_path):
+    app = create_app(database=Database(database_url=f"sqlite:///{tmp_path / 'i.db'}"))
+    repository = app.state.repository
+    repository.create_tables_from_schema("imported", {"n": "integer"})
+    insert_many = repository.insert_many
+    served = threading.Event()
+
+    def slow_insert(*args, **kwargs):
+        assert served.wait(5)  # Another request is answered meanwhile
+        return insert_many(*args, **kwargs)
+
+    repository.insert_many = slow_insert
+
+    async def read():
+        response = await client.get("/imported")
+        served.set()
+        return response
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        imported, listed = await asyncio.gather(
+            client.post("/imported/_import", content='{"n": 1}\n'), read()
+        )
+
+    assert listed.status_code == 200
+    assert imported.json() == {"inserted": 1, "failed": 0, "errors": []}
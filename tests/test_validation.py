@@ -0,0 +1,69 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from autorestify.api.app_factory import create_app
+from autorestify.storage.base import Database
+
+
+@pytest.fixture
+def client():
+    database = Database(database_url="sqlite:///:memory:")
+    return TestClient(create_app(database=database))
+
+
+def test_payloads_are_validated_before_storage(client: TestClient):
+    payload = {
+        "collection": "validated_people",
+        "documents": [{"name": "Ana", "age": 30}],
+    }
+    assert client.post("/upload", json=payload).status_code == 200
+
+    response = client.post("/validated_people", json={"name": "Joao", "age": "old"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "age"]
+
+    response = client.post("/validated_people", json={"nickname": "Jo"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "extra_forbidden"
+
+    response = client.put("/validated_people/1", json={"age": "41"})
+    assert response.status_code == 200
+    assert client.get("/validated_people/1").json()["age"] == 41
+
+    assert len(client.get("/validated_people").json()) == 1
+
+
+def test_nested_documents_round_trip(client: TestClient):
+    payload = {
+        "collection": "nested_people",
+        "documents": [
+            {"name": "Ana", "address": {"city": "Recife", "number": 10}},
+            {"name": "Carlos", "address": {"city": "Natal", "number": 20}},
+        ],
+    }
+    assert client.post("/upload", json=payload).status_code == 200
+
+    items = client.get("/nested_people").json()
+    assert items[0]["address"] == {"city": "Recife", "number": 10}
+    assert items[1]["address"]["city"] == "Natal"
+
+    response = client.put("/nested_people/1", json={"address": {"number": 11}})
+    assert response.status_code == 200
+    assert client.get("/nested_people/1").json()["address"]["number"] == 11
+
+    assert client.delete("/nested_people/1").status_code == 200
+
+
+def test_collection_schemas_published_in_openapi(client: TestClient):
+    payload = {
+        "collection": "openapi_people",
+        "documents": [{"name": "Ana", "address": {"city": "Recife"}}],
+    }
+    client.post("/upload", json=payload)
+
+    openapi = client.get("/openapi.json").json()
+    schemas = openapi["components"]["schemas"]
+
+    assert schemas["OpenapiPeopleInput"]["additionalProperties"] is False
+    assert "address" in schemas["OpenapiPeopleRecord"]["properties"]
+    assert "/openapi_people/{item_id}" in openapi["paths"]